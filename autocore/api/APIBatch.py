@@ -0,0 +1,45 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from robot.api import logger
+
+from autocore.api.APIRequest import APIRequest
+from autocore.api.APIResponse import APIResponse
+
+
+class APIBatch:
+    """Sends prepared requests concurrently, at most ``max_concurrency`` at a time.
+    Responses are returned in the order the requests were added. Combine with APIRequest(pooled=True) so the
+    requests also share connections. A request keeps its state while it is sent, so each can be added only once.
+
+    Example:
+        batch = APIBatch(max_concurrency=4) \n
+        batch.add(APIRequest().set_base_url(url).set_endpoint("/users/1")) \n
+        batch.add(APIRequest().set_method("post").set_base_url(url).set_endpoint("/users").set_json(body)) \n
+        responses = batch.send()
+    """
+
+    def __init__(self, max_concurrency: int = 8):
+        if max_concurrency < 1:
+            raise Exception(f"Max concurrency should be at least 1 but got {max_concurrency}.")
+        self.__max_concurrency = max_concurrency
+        self.__requests: list[APIRequest] = []
+        self.__added: set[int] = set()
+
+    def add(self, request: APIRequest):
+        if id(request) in self.__added:
+            raise Exception(f"Request already added to the batch, build a new APIRequest to send it again. {request}")
+        self.__added.add(id(request))
+        self.__requests.append(request)
+        return self
+
+    def add_all(self, requests: list[APIRequest]):
+        for request in requests:
+            self.add(request)
+        return self
+
+    def send(self) -> list[APIResponse]:
+        """Send all requests. Raises the error of the first failed request (in order) after all are done."""
+        logger.info(f"Sending {len(self.__requests)} request/s with max concurrency of {self.__max_concurrency}.")
+        with ThreadPoolExecutor(max_workers=self.__max_concurrency) as executor:
+            futures = [executor.submit(request.send_request) for request in self.__requests]
+        return [future.result() for future in futures]
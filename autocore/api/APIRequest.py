@@ -1,13 +1,20 @@
+import requests
 from RequestsLibrary.SessionKeywords import SessionKeywords
 from jsonpath_ng import parse
 from requests import Response
+from robot.api import logger
 
+from autocore.api import SessionPool
 from autocore.api.APIResponse import APIResponse
 
 
 class APIRequest:
+    """Builds and sends a request.
+    With ``pooled`` set, requests sharing a base url reuse one session and its connections, see SessionPool.
+    """
 
-    def __init__(self):
+    def __init__(self, pooled: bool = False):
+        self.__pooled = pooled
         self.__request = SessionKeywords()
         self.__request_args: dict = {}
         self.__headers: dict = {}
@@ -20,6 +27,20 @@ class APIRequest:
         self.__cookies: dict = {}
         self.__files: object = None
         self.__json: object = None
+        self.__method: str = "get"
+        self.__stream: bool = False
+
+    def set_method(self, method: str):
+        """Set the http method used by send_request. Used when the request is sent as part of an APIBatch."""
+        self.__method = method.lower()
+        return self
+
+    def set_stream(self, stream: bool = True):
+        """Stream the response body instead of downloading it at once, for large payloads.
+        The body is not logged. Query it with the ``stream`` options of APIResponse.
+        """
+        self.__stream = stream
+        return self
 
     def set_base_url(self, base_url: str):
         self.__base_url = base_url
@@ -107,62 +128,46 @@ class APIRequest:
         if len(self.__endpoint) == 0:
             raise Exception("Error in Request Specifications. Please provide the endpoint.")
 
-    def send_get_request(self) -> APIResponse:
-        self.__prepare_request_url()
-        self.__prepare_request_args()
-        self.__validate_request_spec()
+    def send_request(self) -> APIResponse:
+        return self.__send(self.__method)
 
-        response: Response
-        if len(self.__request_args) > 0:
-            response = self.__request.session_less_get(url=self.__url, **self.__request_args)
-        else:
-            response = self.__request.session_less_get(url=self.__url)
-        return APIResponse(response)
+    def send_get_request(self) -> APIResponse:
+        return self.__send("get")
 
     def send_post_request(self):
-        self.__prepare_request_url()
-        self.__prepare_request_args()
-        self.__validate_request_spec()
-
-        response: Response
-        if len(self.__request_args) > 0:
-            response = self.__request.session_less_post(url=self.__url, **self.__request_args)
-        else:
-            response = self.__request.session_less_post(url=self.__url)
-        return APIResponse(response)
+        return self.__send("post")
 
     def send_delete_request(self):
-        self.__prepare_request_url()
-        self.__prepare_request_args()
-        self.__validate_request_spec()
-
-        response: Response
-        if len(self.__request_args) > 0:
-            response = self.__request.session_less_delete(url=self.__url, **self.__request_args)
-        else:
-            response = self.__request.session_less_delete(url=self.__url)
-        return APIResponse(response)
+        return self.__send("delete")
 
     def send_patch_request(self):
-        self.__prepare_request_url()
-        self.__prepare_request_args()
-        self.__validate_request_spec()
-
-        response: Response
-        if len(self.__request_args) > 0:
-            response = self.__request.session_less_patch(url=self.__url, **self.__request_args)
-        else:
-            response = self.__request.session_less_patch(url=self.__url)
-        return APIResponse(response)
+        return self.__send("patch")
 
     def send_put_request(self):
+        return self.__send("put")
+
+    def __send(self, method: str) -> APIResponse:
         self.__prepare_request_url()
         self.__prepare_request_args()
         self.__validate_request_spec()
 
         response: Response
-        if len(self.__request_args) > 0:
-            response = self.__request.session_less_put(url=self.__url, **self.__request_args)
+        if self.__stream:
+            response = self.__send_streamed(method)
+        elif self.__pooled:
+            response = SessionPool.send(method, self.__base_url, self.__url, **self.__request_args)
+        elif len(self.__request_args) > 0:
+            response = getattr(self.__request, f"session_less_{method}")(url=self.__url, **self.__request_args)
         else:
-            response = self.__request.session_less_put(url=self.__url)
+            response = getattr(self.__request, f"session_less_{method}")(url=self.__url)
         return APIResponse(response)
+
+    def __send_streamed(self, method: str) -> Response:
+        # RequestsLibrary logs the whole body, which would download it, so streamed requests go through requests
+        sender = SessionPool.session(self.__base_url) if self.__pooled else requests
+        logger.info(f"{method.upper()} Request : url={self.__url} (streamed)")
+        response = sender.request(method, self.__url, stream=True, **self.__request_args)
+        logger.info(f"{method.upper()} Response : url={response.url} \n status={response.status_code}, "
+                    f"reason={response.reason} \n headers={response.headers} \n body=(streamed)")
+        response.raise_for_status()
+        return response
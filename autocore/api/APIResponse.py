@@ -1,20 +1,39 @@
+import io
+import json
 from typing import Any
 
-from jsonpath_ng.ext import parse
 from requests import Response
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from autocore.api import JsonStream
+from autocore.api.JsonPathCache import compile_json_path
 from autocore.asserts import *
 
+_UNPARSED = object()
+
 
 class APIResponse:
 
     def __init__(self, response: Response):
         self.__response = response
+        self.__json = _UNPARSED
+        self.__body: JsonStream.SpooledBody = None
 
     @property
     def response(self) -> Response:
         return self.__response
 
+    @property
+    def json(self) -> Any:
+        """The decoded body. Decoded once on first access, with orjson if it is installed."""
+        if self.__json is _UNPARSED:
+            self.__json = self.__decode()
+        return self.__json
+
     def status_code_should_be(self, exp: int):
         act = self.__response.status_code
         assert_equal(act, exp, msg=f"Expecting status code to be {exp} but got {act}")
@@ -43,7 +62,36 @@ class APIResponse:
             msg = f"Expecting  value of {json_path} to be {exp_value} but got {act_value}."
         assert_equal(act_value[0], exp_value, msg)
 
-    def list_of_should_contain(self, json_path: str, exp_value: Any, msg: str = None):
+    def values_of_should_be(self, expectations: dict[str, Any]):
+        """Verify the value of each json path in ``expectations`` ({json path: expected value}).
+        All paths are checked against the same decoded body and every failure is reported together.
+        """
+        # a path without a value raises Exception, report it with the failed values
+        sa = SoftAssert(catch=(Exception,))
+        for json_path, exp_value in expectations.items():
+            sa.handle(self.value_of_should_be, json_path, exp_value)
+        sa.assert_all()
+
+    def stream_values_of(self, json_path: str, limit: int = None) -> list:
+        """Returns the values of the json path, evaluated while reading the body instead of decoding it whole.
+        Stops reading once ``limit`` values are found. Supports a subset of JSONPath, see JsonStream.
+        """
+        try:
+            return list(JsonStream.find(self.__stream_reader(), json_path, limit=limit))
+        finally:
+            self.__close_stream()
+
+    def list_of_should_contain(self, json_path: str, exp_value: Any, msg: str = None, stream: bool = False):
+        """Verify that the values of the json path contain the exp value.
+        With ``stream`` the body is evaluated while it is read and reading stops once the value is found.
+        """
+        if stream:
+            try:
+                self.__streamed_list_of_should_contain(json_path, exp_value, msg)
+            finally:
+                self.__close_stream()
+            return
+
         act_value = self.__execute(json_path)
 
         if len(act_value) == 0:
@@ -66,5 +114,50 @@ class APIResponse:
         assert_that_list_does_not_contain(act_value, exp_value, msg)
 
     def __execute(self, query: str) -> Any:
-        query = parse(query)
-        return [match.value for match in query.find(self.__response.json())]
+        query = compile_json_path(query)
+        return [match.value for match in query.find(self.json)]
+
+    def __streamed_list_of_should_contain(self, json_path: str, exp_value: Any, msg: str = None):
+        scanned = 0
+        for value in JsonStream.find(self.__stream_reader(), json_path):
+            scanned += 1
+            if value == exp_value:
+                logger.info(f"Verified that: list of {json_path} contains {exp_value}. Found after {scanned} value/s.",
+                            also_console=True)
+                return
+
+        if scanned == 0:
+            raise Exception(f"No value found using Json path: {json_path}. Consider refining the json path.")
+
+        if msg is None:
+            msg = f"Jsonpath: {json_path}. Expecting list of {scanned} value/s to contain {exp_value}."
+        fail(msg)
+
+    def __stream_reader(self):
+        if self.__body is not None:
+            return self.__body.reader()
+        if self.__response._content_consumed:
+            return io.BytesIO(self.__response.content)
+
+        self.__response.raw.decode_content = True
+        self.__body = JsonStream.SpooledBody(self.__response.raw)
+        return self.__body.reader()
+
+    def __close_stream(self):
+        # the unread rest of a body that was only partly streamed holds the connection, close it
+        if self.__body is None or self.__body.exhausted:
+            return
+        self.__body.close()
+        if not self.__body.exhausted:
+            self.__response.close()
+
+    def __decode(self) -> Any:
+        # a partly streamed body can only be read back from its spool
+        content = self.__response.content if self.__body is None else self.__body.read_all()
+        if orjson is not None:
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # e.g. non utf-8 body, let requests detect the encoding
+                pass
+        return self.__response.json() if self.__body is None else json.loads(content)
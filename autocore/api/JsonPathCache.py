@@ -0,0 +1,83 @@
+"""
+Process wide LRU cache of compiled JSONPath expressions. Parsing a JSONPath with jsonpath_ng is costly compared to
+evaluating it, so each distinct path is parsed once.
+
+Libraries can compile the paths their suites use up front:
+    precompile_json_paths("$.data[*].id", "$.meta.total")
+"""
+import threading
+from collections import OrderedDict
+
+from jsonpath_ng import JSONPath
+from jsonpath_ng.ext import parse
+
+
+class JsonPathCache:
+
+    def __init__(self, max_size: int = 512):
+        self.__max_size = max_size
+        self.__compiled: OrderedDict[str, JSONPath] = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.__hits + self.__misses
+        return {"hits": self.__hits, "misses": self.__misses, "size": len(self.__compiled),
+                "max_size": self.__max_size, "hit_rate": self.__hits / lookups if lookups > 0 else 0.0}
+
+    def compile(self, query: str) -> JSONPath:
+        """Returns the compiled JSONPath of the query, parsing it only if it is not cached."""
+        with self.__lock:
+            compiled = self.__compiled.get(query)
+            if compiled is not None:
+                self.__hits += 1
+                self.__compiled.move_to_end(query)
+                return compiled
+            self.__misses += 1
+
+        compiled = parse(query)
+        self.__store(query, compiled)
+        return compiled
+
+    def precompile(self, *queries: str):
+        """Compile and cache the queries without counting them as lookups."""
+        for query in queries:
+            self.__store(query, parse(query))
+
+    def resize(self, max_size: int):
+        with self.__lock:
+            self.__max_size = max_size
+            self.__evict()
+
+    def clear(self):
+        with self.__lock:
+            self.__compiled.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def __store(self, query: str, compiled: JSONPath):
+        with self.__lock:
+            self.__compiled[query] = compiled
+            self.__evict()
+
+    def __evict(self):
+        while len(self.__compiled) > self.__max_size:
+            self.__compiled.popitem(last=False)
+
+
+_cache = JsonPathCache()
+
+
+def compile_json_path(query: str) -> JSONPath:
+    return _cache.compile(query)
+
+
+def precompile_json_paths(*queries: str):
+    _cache.precompile(*queries)
+
+
+def json_path_cache() -> JsonPathCache:
+    """Returns the process wide cache, e.g. to check its stats or resize it."""
+    return _cache
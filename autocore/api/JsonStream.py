@@ -0,0 +1,125 @@
+"""
+Incremental JSONPath evaluation over a response body stream, for payloads too large to decode into one tree.
+Requires ijson. Supports the child and wildcard-index subset of JSONPath: $.a.b, $['a'], $.a[*].b
+"""
+import re
+from tempfile import SpooledTemporaryFile
+from typing import Any, Iterator
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_CHUNK_SIZE = 64 * 1024
+_SPOOL_MAX_MEMORY = 1024 * 1024
+_STEP = re.compile(r"\.(?P<name>[A-Za-z_][\w-]*)|\[\s*'(?P<quoted>[^']*)'\s*]|\[\s*\"(?P<dquoted>[^\"]*)\"\s*]"
+                   r"|(?P<wildcard>\[\s*\*\s*])")
+
+
+def to_prefix(json_path: str) -> str:
+    """Translate the JSONPath to an ijson prefix, raises Exception if the path is outside the supported subset."""
+    path = json_path.strip()
+    if not path.startswith("$"):
+        raise Exception(f"Json path: {json_path} should start with '$'.")
+
+    steps = []
+    position = 1
+    while position < len(path):
+        match = _STEP.match(path, position)
+        if match is None:
+            raise Exception(f"Json path: {json_path} is not supported when streaming. Only child ($.a, $['a']) and "
+                            f"wildcard index ($.a[*]) steps are supported.")
+        if match.group("wildcard"):
+            steps.append("item")
+        else:
+            steps.append(match.group("name") or match.group("quoted") or match.group("dquoted"))
+        position = match.end()
+    return ".".join(steps)
+
+
+def find(reader, json_path: str, limit: int = None) -> Iterator[Any]:
+    """Yields the values matched by the json path while reading the ``reader``, stops after ``limit`` values."""
+    if ijson is None:
+        raise Exception("Streaming json path evaluation requires ijson. Install it with: pip install ijson")
+
+    prefix = to_prefix(json_path)
+    for count, value in enumerate(ijson.items(reader, prefix, use_float=True), start=1):
+        yield value
+        if limit is not None and count >= limit:
+            return
+
+
+class SpooledBody:
+    """Spools a raw response stream while it is read. Every reader replays what was already read and continues
+    from the network, so a query that stops early leaves the rest of the body unread. Bodies larger than 1 MB
+    are spooled to a temporary file instead of memory.
+    """
+
+    def __init__(self, raw):
+        self.__raw = raw
+        self.__spool = SpooledTemporaryFile(max_size=_SPOOL_MAX_MEMORY)
+        self.__exhausted = False
+        self.__closed = False
+
+    @property
+    def exhausted(self) -> bool:
+        return self.__exhausted
+
+    def close(self):
+        """Stop reading from the network, what was read so far can still be queried. A body that was already
+        received whole (nothing left of its Content-Length) is spooled to the end first.
+        """
+        if getattr(self.__raw, "length_remaining", None) == 0:
+            while self.read_at(self.__spool.seek(0, 2), _CHUNK_SIZE):
+                pass
+        self.__closed = True
+
+    def reader(self):
+        return _Reader(self)
+
+    def read_all(self) -> bytes:
+        reader = self.reader()
+        chunks = []
+        chunk = reader.read(_CHUNK_SIZE)
+        while chunk:
+            chunks.append(chunk)
+            chunk = reader.read(_CHUNK_SIZE)
+        return b"".join(chunks)
+
+    def read_at(self, position: int, size: int) -> bytes:
+        if size is None or size < 0:
+            size = _CHUNK_SIZE
+        if size == 0:
+            # ijson probes the reader type with read(0)
+            return b""
+
+        spooled = self.__spool.seek(0, 2)
+        if position < spooled:
+            self.__spool.seek(position)
+            return self.__spool.read(min(size, spooled - position))
+
+        if self.__exhausted:
+            return b""
+        if self.__closed:
+            raise Exception(f"The response was closed after reading {spooled} bytes of its body, only values in "
+                            f"that part can be queried. Stream the query that needs the whole body first.")
+
+        chunk = self.__raw.read(size)
+        if not chunk:
+            self.__exhausted = True
+            return b""
+        self.__spool.write(chunk)
+        return chunk
+
+
+class _Reader:
+
+    def __init__(self, body: SpooledBody):
+        self.__body = body
+        self.__position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.__body.read_at(self.__position, size)
+        self.__position += len(chunk)
+        return chunk
@@ -0,0 +1,96 @@
+"""
+Keeps one requests.Session per base url so requests to the same host reuse their TCP/TLS connections.
+Close the pooled sessions at the end of the run and clear their cookies after every test with the listener:
+    robot --listener autocore.api.SessionPool.SessionPoolListener tests
+
+Cookies set by a response are kept by the pooled session, so without the listener they are sent by later tests
+too. Call ``clear_cookies`` where the listener is not used.
+"""
+import atexit
+import threading
+
+from RequestsLibrary.RequestsOnSessionKeywords import RequestsOnSessionKeywords
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from robot.api import logger
+from urllib3 import Retry
+
+_DEFAULT_CONFIG = {"pool_size": 10, "keep_alive": True, "max_retries": 0, "backoff_factor": 0.1}
+
+_requests = RequestsOnSessionKeywords()
+_configs: dict[str, dict] = {}
+_sessions: dict[str, Session] = {}
+_lock = threading.Lock()
+
+
+def configure_pool(base_url: str, pool_size: int = 10, keep_alive: bool = True, max_retries: int = 0,
+                   backoff_factor: float = 0.1):
+    """Configure the pooled session of the ``base_url``. Takes effect on the next session created for it.
+
+    ``pool_size`` is the number of connections kept open to the host, ``keep_alive`` False closes the connection
+    after every request and ``max_retries`` is the retry budget for connection errors.
+    """
+    with _lock:
+        _configs[base_url] = {"pool_size": pool_size, "keep_alive": keep_alive, "max_retries": max_retries,
+                              "backoff_factor": backoff_factor}
+        if base_url in _sessions:
+            logger.warn(f"Pooled session of {base_url} already exists. Close the pools to apply the configuration.")
+
+
+def send(method: str, base_url: str, url: str, **kwargs) -> Response:
+    """Send the request through the pooled session of the ``base_url``."""
+    session(base_url)
+    return getattr(_requests, f"{method}_on_session")(base_url, url, **kwargs)
+
+
+def close_pools():
+    """Close all pooled sessions and their connections."""
+    with _lock:
+        if len(_sessions) > 0:
+            logger.info(f"Closing pooled sessions of {', '.join(_sessions)}.")
+            _requests.delete_all_sessions()
+            _sessions.clear()
+
+
+def clear_cookies():
+    """Clear the cookies of all pooled sessions, keeping their connections open."""
+    with _lock:
+        for pooled in _sessions.values():
+            pooled.cookies.clear()
+
+
+def session(base_url: str) -> Session:
+    """Returns the pooled session of the ``base_url``, creating it on first use."""
+    with _lock:
+        if base_url in _sessions:
+            return _sessions[base_url]
+
+        config = _configs.get(base_url, _DEFAULT_CONFIG)
+        logger.info(f"Creating pooled session for {base_url}. {config}")
+        pooled = _requests.create_session(alias=base_url, url=base_url, verify=True, max_retries=0)
+        adapter = HTTPAdapter(pool_connections=config["pool_size"], pool_maxsize=config["pool_size"],
+                              max_retries=Retry(total=config["max_retries"], backoff_factor=config["backoff_factor"],
+                                                read=False))
+        pooled.mount("http://", adapter)
+        pooled.mount("https://", adapter)
+        if not config["keep_alive"]:
+            pooled.headers["Connection"] = "close"
+        _sessions[base_url] = pooled
+        return pooled
+
+
+atexit.register(close_pools)
+
+
+class SessionPoolListener:
+    """Robot listener that clears the cookies of the pooled sessions after every test, so a test does not see the
+    cookies of the previous one, and closes the sessions when the top level suite ends.
+    """
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def end_test(self, data, result):
+        clear_cookies()
+
+    def end_suite(self, data, result):
+        if data.parent is None:
+            close_pools()
@@ -1,26 +1,162 @@
 """
 Provides Hard and Soft Assertion capability. Wraps robot.api.logger
+
+Passed assertions are logged according to the assertion log mode, set with set_assertion_log_mode or the
+AUTOCORE_ASSERTION_LOG environment variable:
+    full -> every passed assertion is logged and written to the console (default) \n
+    buffered -> passed assertions are logged once per keyword, not on the console. Flushed by the listener:
+        robot --listener autocore.asserts.AssertionLogListener tests \n
+    off -> passed assertions are not logged
+Messages are only formatted when they are emitted. Failed assertions are always reported. Buffered assertions keep a
+short repr of their list, tuple, dict and set values taken when they pass, later changes to these are not logged.
+Other mutable objects are formatted at flush and are logged with their state at that time.
+An invalid AUTOCORE_ASSERTION_LOG fails the import.
 """
+import os
+import reprlib
+import threading
+from collections import Counter
 from datetime import datetime
+from typing import Callable
 
 from robot.api import logger
-from robot.utils import asserts
+
+LOG_FULL = "full"
+LOG_BUFFERED = "buffered"
+LOG_OFF = "off"
+_LOG_MODES = (LOG_FULL, LOG_BUFFERED, LOG_OFF)
+_BUFFER_LIMIT = 1000
+_SNAPSHOT_TYPES = (list, tuple, dict, set)
+_snapshot_repr = reprlib.Repr()
+_snapshot_repr.maxlist = _snapshot_repr.maxtuple = _snapshot_repr.maxdict = _snapshot_repr.maxset = 20
+_snapshot_repr.maxstring = 100
+_snapshot_repr.maxother = 100
+
+_log_mode = LOG_FULL
+_buffer: list[tuple] = []
+_not_buffered = 0
+_buffer_lock = threading.Lock()
+
+
+def set_assertion_log_mode(mode: str) -> str:
+    """Set how passed assertions are logged: full, buffered or off. Returns the previous mode."""
+    global _log_mode
+    mode = mode.lower()
+    if mode not in _LOG_MODES:
+        raise Exception(f"Invalid assertion log mode: {mode}. Use one of {', '.join(_LOG_MODES)}.")
+    if _log_mode == LOG_BUFFERED and mode != LOG_BUFFERED:
+        flush_assertion_logs()
+    previous, _log_mode = _log_mode, mode
+    return previous
+
+
+def flush_assertion_logs():
+    """Log the buffered passed assertions as a single message."""
+    global _not_buffered
+    with _buffer_lock:
+        buffered = _buffer.copy()
+        _buffer.clear()
+        not_buffered, _not_buffered = _not_buffered, 0
+
+    if len(buffered) == 0:
+        return
+    lines = [s_msg if s_msg is not None else template.format(*args) for s_msg, template, args in buffered]
+    if not_buffered > 0:
+        lines.append(f"... and {not_buffered} more passed assertion/s.")
+    logger.info("\n".join(lines))
+
+
+def _snapshot(arg):
+    # a bounded repr is cheap for any size and keeps the logged content from changing before the flush
+    return _snapshot_repr.repr(arg) if isinstance(arg, _SNAPSHOT_TYPES) else arg
+
+
+def _passed(s_msg: str | None, template: str, *args, console: bool = True):
+    global _not_buffered
+    if _log_mode == LOG_OFF:
+        return
+    if _log_mode == LOG_BUFFERED:
+        with _buffer_lock:
+            if len(_buffer) < _BUFFER_LIMIT:
+                _buffer.append((s_msg, template, tuple(_snapshot(arg) for arg in args) if s_msg is None else ()))
+            else:
+                _not_buffered += 1
+        return
+
+    if s_msg is not None:
+        logger.info(msg=s_msg)
+    else:
+        logger.info(template.format(*args), also_console=console)
+
+
+set_assertion_log_mode(os.environ.get("AUTOCORE_ASSERTION_LOG", LOG_FULL))
+
+
+class AssertionLogListener:
+    """Robot listener that flushes the buffered assertion logs when a keyword or test ends."""
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def end_keyword(self, name, attrs):
+        flush_assertion_logs()
+
+    def end_test(self, name, attrs):
+        flush_assertion_logs()
+
+
+class _Membership:
+    """Membership test over a list. Hashable items are looked up in a set index, unhashable ones with a scan of the
+    unhashable items of the list only, since equal objects have equal hashes.
+    """
+
+    def __init__(self, lst):
+        self.__hashable = set()
+        self.__unhashable = []
+        for item in lst:
+            try:
+                self.__hashable.add(item)
+            except TypeError:
+                self.__unhashable.append(item)
+
+    def __contains__(self, item) -> bool:
+        try:
+            if item in self.__hashable:
+                return True
+        except TypeError:
+            pass
+        return item in self.__unhashable
+
+
+def _missing(lst, contents) -> list[tuple[int, object]]:
+    """Returns the index and item of the contents not in the list."""
+    if len(contents) > 1 and not isinstance(lst, (set, frozenset, dict)):
+        lst = _Membership(lst)
+    return [(index, item) for index, item in enumerate(contents) if item not in lst]
+
+
+def _first_unsorted(lst, key: Callable = None, reverse: bool = False, strict: bool = False) -> int | None:
+    """Returns the index of the first item out of order compared to its predecessor, None if the list is sorted."""
+    values = iter(lst) if key is None else map(key, lst)
+    previous = next(values, None)
+    for index, value in enumerate(values, start=1):
+        if reverse:
+            out_of_order = value > previous or (strict and value == previous)
+        else:
+            out_of_order = value < previous or (strict and value == previous)
+        if out_of_order:
+            return index
+        previous = value
+    return None
 
 
 def assert_that_date_format_is(date: str, exp_format: str, msg: str = None, s_msg: str = None):
     """Fail the test if the ``date`` provided does not match the ``exp_format``."""
-    err_msg = f"Expecting format of {date} to match format {exp_format} but it did not."
-    if msg is not None:
-        err_msg = msg
-
     try:
         datetime.strptime(date, exp_format)
-        if s_msg is not None:
-            logger.info(msg=s_msg)
-        else:
-            logger.info(msg=f"Verified that date string {date} match the format {exp_format}.")
     except Exception:
-        raise AssertionError(err_msg)
+        if msg is None:
+            msg = f"Expecting format of {date} to match format {exp_format} but it did not."
+        raise AssertionError(msg)
+    _passed(s_msg, "Verified that date string {0} match the format {1}.", date, exp_format, console=False)
 
 
 def assert_equal(actual, exp, msg: str = None, s_msg: str = None):
@@ -35,17 +171,9 @@ def assert_equal(actual, exp, msg: str = None, s_msg: str = None):
         assert_equal(1,1) -> pass \n
         assert_equal("one","one", "error message if this keyword fails") -> pass
     """
-    if msg is None:
-        msg = "{0} is not equal to {1}.".format(actual, exp)
-    try:
-        asserts.assert_equal(actual, exp, msg)
-    except AssertionError:
-        raise AssertionError(msg)
-    else:
-        if s_msg is not None:
-            logger.info(msg=s_msg)
-        else:
-            logger.info("Verified that: {0} is equal to {1}.".format(actual, exp), also_console=True)
+    if not actual == exp:
+        fail(msg if msg is not None else "{0} is not equal to {1}.".format(actual, exp))
+    _passed(s_msg, "Verified that: {0} is equal to {1}.", actual, exp)
 
 
 def fail(msg=None):
@@ -59,10 +187,7 @@ def fail(msg=None):
     """
     if msg is None:
         msg = "Fail Test."
-    try:
-        asserts.fail(msg)
-    except AssertionError:
-        raise AssertionError(msg)
+    raise AssertionError(msg)
 
 
 def assert_true(expr, msg=None, s_msg: str = None):
@@ -77,18 +202,9 @@ def assert_true(expr, msg=None, s_msg: str = None):
         assert_true(1,1) -> pass \n
         assert_true([1,2,3], "Custom error message") -> pass since list with contents are truth
     """
-    if msg is None:
-        msg = "The expression passed as 'expr' is not True."
-
-    try:
-        asserts.assert_true(expr, msg)
-    except AssertionError:
-        raise AssertionError(msg)
-    else:
-        if s_msg is not None:
-            logger.info(msg=s_msg)
-        else:
-            logger.info("Verified that expression passed as 'expr' is True.", also_console=True)
+    if not expr:
+        fail(msg if msg is not None else "The expression passed as 'expr' is not True.")
+    _passed(s_msg, "Verified that expression passed as 'expr' is True.")
 
 
 def assert_false(expr, msg=None, s_msg: str = None):
@@ -101,17 +217,9 @@ def assert_false(expr, msg=None, s_msg: str = None):
         assert_false(5 > 1, "Customer error message") -> fail \n
         assert_false(False) -> pass
     """
-    if msg is None:
-        msg = "The expression passed as 'expr' is not False."
-    try:
-        asserts.assert_false(expr, msg)
-    except AssertionError:
-        raise AssertionError(msg)
-    else:
-        if s_msg is not None:
-            logger.info(msg=s_msg)
-        else:
-            logger.info("Verified that the expression passed as 'expr' is False.", also_console=True)
+    if expr:
+        fail(msg if msg is not None else "The expression passed as 'expr' is not False.")
+    _passed(s_msg, "Verified that the expression passed as 'expr' is False.")
 
 
 def assert_that_text_is_not_empty(txt: str, msg: str = None, s_msg: str = None):
@@ -124,16 +232,9 @@ def assert_that_text_is_not_empty(txt: str, msg: str = None, s_msg: str = None):
         assert_that_text_is_not_empty(" ")  -> pass since string has space  \n
         assert_that_text_is_not_empty("text")  -> pass \n
     """
-    if msg is None:
-        msg = f"Provided text is empty."
-
     if (txt is None) or len(txt) == 0:
-        fail(msg)
-    else:
-        if s_msg is not None:
-            logger.info(msg=s_msg)
-        else:
-            logger.info(f"Verified that provided text: {txt} is not empty.", also_console=True)
+        fail(msg if msg is not None else "Provided text is empty.")
+    _passed(s_msg, "Verified that provided text: {0} is not empty.", txt)
 
 
 def assert_that_text_starts_with(txt: str, start: str, msg=None, s_msg: str = None):
@@ -147,16 +248,9 @@ def assert_that_text_starts_with(txt: str, start: str, msg=None, s_msg: str = No
         assert_that_text_starts_with("String", "str") -> fail since this is case-sensitive  \n
         assert_that_text_starts_with("String", "Str") -> pass
     """
-    if msg is None:
-        msg = "{0} does not start with {1}.".format(txt, start)
-
     if not txt.startswith(start):
-        fail(msg)
-    else:
-        if s_msg is not None:
-            logger.info(msg=s_msg)
-        else:
-            logger.info("Verified that: {0} starts with {1}.".format(txt, start), also_console=True)
+        fail(msg if msg is not None else "{0} does not start with {1}.".format(txt, start))
+    _passed(s_msg, "Verified that: {0} starts with {1}.", txt, start)
 
 
 def assert_that_text_ends_with(txt: str, end: str, msg=None, s_msg: str = None):
@@ -169,16 +263,9 @@ def assert_that_text_ends_with(txt: str, end: str, msg=None, s_msg: str = None):
         assert_that_text_ends_with("String","ING","Custom error message") -> fail \n
         assert_that_text_ends_with("String","ing") -> pass
     """
-    if msg is None:
-        msg = "{0} does not end with {1}.".format(txt, end)
-
     if not txt.endswith(end):
-        fail(msg)
-    else:
-        if s_msg is not None:
-            logger.info(msg=s_msg)
-        else:
-            logger.info("Verified that: {0} ends with {1}.".format(txt, end), also_console=True)
+        fail(msg if msg is not None else "{0} does not end with {1}.".format(txt, end))
+    _passed(s_msg, "Verified that: {0} ends with {1}.", txt, end)
 
 
 def assert_that_text_contains(txt: str, content: str, msg=None, s_msg: str = None):
@@ -192,16 +279,9 @@ def assert_that_text_contains(txt: str, content: str, msg=None, s_msg: str = Non
         assert_that_text_contains("String","Ing") -> fail since this is case-sensitive  \n
         assert_that_text_contains("String","tri") -> pass
     """
-    if msg is None:
-        msg = "{0} does not contain {1}.".format(txt, content)
-
     if not (content in txt):
-        fail(msg)
-    else:
-        if s_msg is not None:
-            logger.info(msg=s_msg)
-        else:
-            logger.info("Verified that: {0} contains {1}.".format(txt, content), also_console=True)
+        fail(msg if msg is not None else "{0} does not contain {1}.".format(txt, content))
+    _passed(s_msg, "Verified that: {0} contains {1}.", txt, content)
 
 
 def assert_that_list_is_empty(lst: list, msg=None, s_msg: str = None):
@@ -214,16 +294,9 @@ def assert_that_list_is_empty(lst: list, msg=None, s_msg: str = None):
         assert_that_list_is_empty(["one","two","three"], "Custom error message") -> fails \n
         assert_that_list_is_empty([]) -> pass
     """
-    if msg is None:
-        msg = "List {0} is not empty.".format(lst)
-
     if len(lst) > 0:
-        fail(msg)
-    else:
-        if s_msg is not None:
-            logger.info(msg=msg)
-        else:
-            logger.info("Verified that: list {0} is empty.".format(lst), also_console=True)
+        fail(msg if msg is not None else "List {0} is not empty.".format(lst))
+    _passed(s_msg, "Verified that: list {0} is empty.", lst)
 
 
 def assert_that_list_is_not_empty(lst: list, msg=None, s_msg: str = None):
@@ -237,16 +310,9 @@ def assert_that_list_is_not_empty(lst: list, msg=None, s_msg: str = None):
         assert_that_list_is_not_empty([1,2,3], "Custom error message") -> pass \n
         assert_that_list_is_not_empty(["One","Two","Three"]) -> pass
     """
-    if msg is None:
-        msg = "List {0} is empty.".format(lst)
-
     if len(lst) == 0:
-        fail(msg)
-    else:
-        if s_msg is not None:
-            logger.info(msg=s_msg)
-        else:
-            logger.info("Verified that: list {0} is not empty.".format(lst), also_console=True)
+        fail(msg if msg is not None else "List {0} is empty.".format(lst))
+    _passed(s_msg, "Verified that: list {0} is not empty.", lst)
 
 
 def assert_that_list_has_item(lst: list, content, msg=None, s_msg: str = None):
@@ -254,20 +320,16 @@ def assert_that_list_has_item(lst: list, content, msg=None, s_msg: str = None):
 
     If ``msg`` was provided, this will be the error message in case this keyword failed.
 
+    A single lookup scans the list once, pass a set for repeated lookups against the same items.
+
     Examples:
         assert_that_list_has_item([1,2,4], 3) -> fail since 3 is not in [1,2,4] \n
         assert_that_list_has_item([1,2,4], 3, "Custom Error Message") -> fail \n
         assert_that_list_has_item([1,2,4], 4) -> pass
     """
-    if msg is None:
-        msg = "List {0} does not contain {1}.".format(lst, content)
     if not (content in lst):
-        fail(msg)
-    else:
-        if s_msg is not None:
-            logger.info(msg=s_msg)
-        else:
-            logger.info("Verified that: list {0} contains {1}.".format(lst, content), also_console=True)
+        fail(msg if msg is not None else "List {0} does not contain {1}.".format(lst, content))
+    _passed(s_msg, "Verified that: list {0} contains {1}.", lst, content)
 
 
 def assert_that_list_does_not_contain(lst: list, item, msg=None, s_msg: str = None):
@@ -279,43 +341,141 @@ def assert_that_list_does_not_contain(lst: list, item, msg=None, s_msg: str = No
         assert_that_list_does_not_contain([1,2,3,4], 2) -> fail since 2 is in the list
         assert_that_list_does_not_contain([1,2,3,4], 10) -> pass since 10 is not in the list.
     """
-    if msg is None:
-        msg = f"List {lst} contains {item}."
-
     if item in lst:
-        fail(msg)
-    else:
-        if s_msg is not None:
-            logger.info(msg=s_msg)
-        else:
-            logger.info(f"Verified that list {lst} does not contain {item}.", also_console=True)
+        fail(msg if msg is not None else f"List {lst} contains {item}.")
+    _passed(s_msg, "Verified that list {0} does not contain {1}.", lst, item)
 
 
 def assert_that_list_contains_all(lst: list, contents: list, msg=None, s_msg: str = None):
     """Fail the test if the given ``lst`` does not contain all ``contents``.
 
-    If ``msg`` was provided, this will be the error message in case this keyword failed.
+    If ``msg`` was provided, this will be the error message in case this keyword failed. Otherwise the error message
+    lists every missing item with its index in ``contents``. Hashable items are looked up in a set index of ``lst``.
 
     Examples:
         assert_that_list_contains_all([1,2,3,4,5], [1,2,7]) -> fail since 7 is not in [1,2,3,4,5]   \n
         assert_that_list_contains_all([1,2,3,4,5],[6,7,8], "Custom error message") -> fail  \n
         assert_that_list_contains_all([1,2,3,4,5],[1,2,3]) -> pass
     """
-    missing_items = []
-
-    for i in contents:
-        if not (i in lst):
-            missing_items.append(i)
+    missing_items = _missing(lst, contents)
 
     if len(missing_items) > 0:
         if msg is None:
-            msg = "List {0} does not contain all of {1}. See missing item/s: {2}.".format(lst, contents, missing_items)
+            missing = ", ".join(f"{item} at index {index}" for index, item in missing_items)
+            msg = "List {0} does not contain all of {1}. See missing item/s: {2}.".format(lst, contents, missing)
         fail(msg)
-    else:
-        if s_msg is not None:
-            logger.info(msg=s_msg)
-        else:
-            logger.info("Verified that: list {0} contains all of {1}.".format(lst, contents), also_console=True)
+    _passed(s_msg, "Verified that: list {0} contains all of {1}.", lst, contents)
+
+
+def assert_that_list_is_sorted(lst: list, key: Callable = None, reverse: bool = False, strict: bool = False,
+                               msg=None, s_msg: str = None):
+    """Fail the test if the given ``lst`` is not sorted in ascending order, or descending if ``reverse``.
+    Items are compared by ``key`` if provided. With ``strict`` equal neighbours fail too, e.g. duplicate prices.
+    Checked in a single pass, the error message shows the first item out of order.
+
+    If ``msg`` was provided, this will be the error message in case this keyword failed.
+
+    Examples:
+        assert_that_list_is_sorted([1,3,2]) -> fail since 2 at index 2 comes after 3 \n
+        assert_that_list_is_sorted([1,2,2,3], strict=True) -> fail \n
+        assert_that_list_is_sorted(["$9.99", "$15.99"], key=lambda p: float(p.replace("$", ""))) -> pass \n
+        assert_that_list_is_sorted([3,2,1], reverse=True) -> pass
+    """
+    order = ("strictly " if strict else "") + ("descending" if reverse else "ascending")
+    index = _first_unsorted(lst, key=key, reverse=reverse, strict=strict)
+    if index is not None:
+        fail(msg if msg is not None else "List {0} is not sorted in {1} order. Item {2} at index {3} comes after {4}."
+             .format(lst, order, lst[index], index, lst[index - 1]))
+    _passed(s_msg, "Verified that: list {0} is sorted in {1} order.", lst, order)
+
+
+def assert_that_list_is_monotonic(lst: list, strict: bool = False, msg=None, s_msg: str = None):
+    """Fail the test if the given ``lst`` is neither increasing nor decreasing. With ``strict`` equal neighbours
+    fail too. Checked in a single pass, the error message shows the first item breaking the direction.
+
+    If ``msg`` was provided, this will be the error message in case this keyword failed.
+
+    Examples:
+        assert_that_list_is_monotonic([1,3,2]) -> fail \n
+        assert_that_list_is_monotonic([5,5,1]) -> pass \n
+        assert_that_list_is_monotonic([5,5,1], strict=True) -> fail
+    """
+    increasing = _first_unsorted(lst, strict=strict)
+    if increasing is not None:
+        decreasing = _first_unsorted(lst, reverse=True, strict=strict)
+        if decreasing is not None:
+            # report where the direction set by the first items breaks
+            index = max(increasing, decreasing)
+            fail(msg if msg is not None else "List {0} is not monotonic. Item {1} at index {2} breaks the order."
+                 .format(lst, lst[index], index))
+    _passed(s_msg, "Verified that: list {0} is monotonic.", lst)
+
+
+def assert_that_all_within_tolerance(actual: list, exp: list, tolerance: float, relative: bool = False, msg=None,
+                                     s_msg: str = None):
+    """Fail the test unless every item of ``actual`` is within ``tolerance`` of the item of ``exp`` at the same
+    index. The ``tolerance`` is absolute, or a fraction of the expected item if ``relative``.
+
+    If ``msg`` was provided, this will be the error message in case this keyword failed.
+
+    Examples:
+        assert_that_all_within_tolerance([1.0, 2.1], [1, 2], 0.05) -> fail \n
+        assert_that_all_within_tolerance([100, 201], [100, 200], 0.01, relative=True) -> pass
+    """
+    _assert_same_length(actual, exp, msg)
+    for index, (act_item, exp_item) in enumerate(zip(actual, exp)):
+        allowed = tolerance * abs(exp_item) if relative else tolerance
+        if not abs(act_item - exp_item) <= allowed:
+            fail(msg if msg is not None else "List {0} is not within {1} of {2}. Item {3} at index {4} differs from "
+                 "{5} by {6}.".format(actual, tolerance, exp, act_item, index, exp_item, abs(act_item - exp_item)))
+    _passed(s_msg, "Verified that: list {0} is within {1} of {2}.", actual, tolerance, exp)
+
+
+def assert_that_lists_are_equal(actual: list, exp: list, msg=None, s_msg: str = None):
+    """Fail the test if ``actual`` and ``exp`` differ in length or in any item at the same index.
+    The error message shows the first differing index.
+
+    If ``msg`` was provided, this will be the error message in case this keyword failed.
+
+    Examples:
+        assert_that_lists_are_equal([1,2,3], [1,2,4]) -> fail at index 2 \n
+        assert_that_lists_are_equal([1,2], [1,2,3]) -> fail \n
+        assert_that_lists_are_equal(["a","b"], ["a","b"]) -> pass
+    """
+    _assert_same_length(actual, exp, msg)
+    for index, (act_item, exp_item) in enumerate(zip(actual, exp)):
+        if not act_item == exp_item:
+            fail(msg if msg is not None else "List {0} is not equal to {1}. First difference at index {2}: {3} != {4}."
+                 .format(actual, exp, index, act_item, exp_item))
+    _passed(s_msg, "Verified that: list {0} is equal to {1}.", actual, exp)
+
+
+def _assert_same_length(actual: list, exp: list, msg: str = None):
+    if len(actual) != len(exp):
+        fail(msg if msg is not None else "List {0} has {1} item/s but expecting {2} item/s like {3}."
+             .format(actual, len(actual), len(exp), exp))
+
+
+_args_repr = reprlib.Repr()
+_args_repr.maxstring = 60
+_args_repr.maxother = 60
+_REPORT_MESSAGE_LENGTH = 300
+
+
+class SoftAssertFailure:
+    """A failed soft assertion. ``locator`` is the locator the assertion was made on, if it was passed as such."""
+    __slots__ = ("assertion", "message", "args", "locator", "timestamp", "thread")
+
+    def __init__(self, assertion: str, message: str, args: str, locator=None):
+        self.assertion = assertion
+        self.message = message
+        self.args = args
+        self.locator = locator
+        self.timestamp = datetime.now()
+        self.thread = threading.current_thread().name
+
+    def __repr__(self):
+        return f"SoftAssertFailure({self.assertion}, {self.message!r}, args={self.args})"
 
 
 class SoftAssert:
@@ -324,6 +484,9 @@ class SoftAssert:
     NOTE: Always call assert_all() at the end, otherwise failures (if there are) will not be reported resulting
     to a passed test even if it's not.
 
+    The instance can be shared by keywords running in parallel threads. Up to ``max_failures`` failures are kept as
+    SoftAssertFailure records, further failures are only counted. ``catch`` are the exceptions handled as failures.
+
     Example:
         sa = SoftAssert()   \n
         sa.assert_equal(1,2) -> fail but next assertion will still be executed \n
@@ -331,16 +494,51 @@ class SoftAssert:
         sa.assert_all()
     """
 
-    def __init__(self):
-        self.__errors: list[str] = []
+    def __init__(self, max_failures: int = 100, catch: tuple[type[Exception], ...] = (AssertionError,)):
+        self.__max_failures = max_failures
+        self.__catch = catch
+        self.__failures: list[SoftAssertFailure] = []
+        self.__overflow = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def failures(self) -> list[SoftAssertFailure]:
+        with self.__lock:
+            return self.__failures.copy()
+
+    @property
+    def failed_count(self) -> int:
+        """Number of failed assertions, including the ones over ``max_failures``."""
+        with self.__lock:
+            return len(self.__failures) + self.__overflow
 
     def handle(self, func, *args, **kwargs):
         """Use this to convert hard asserts to soft asserts."""
+        self.__run(func, *args, **kwargs)
+
+    def __run(self, func, *args, **kwargs):
         try:
             func(*args, **kwargs)
-        # except AssertionError as e:
-        except Exception as e:
-            self.__errors.append(str(e))
+        except self.__catch as e:
+            self.__record(func, e, args, kwargs)
+
+    def __record(self, func, error: Exception, args: tuple, kwargs: dict):
+        with self.__lock:
+            if len(self.__failures) >= self.__max_failures:
+                self.__overflow += 1
+                return
+
+        # summarised outside the lock, the arguments can be large
+        summary = ", ".join([_args_repr.repr(arg) for arg in args] +
+                            [f"{name}={_args_repr.repr(value)}" for name, value in kwargs.items()
+                             if name not in ("msg", "s_msg") and value is not None])
+        failure = SoftAssertFailure(assertion=getattr(func, "__name__", str(func)), message=str(error), args=summary,
+                                    locator=kwargs.get("locator", getattr(error, "locator", None)))
+        with self.__lock:
+            if len(self.__failures) < self.__max_failures:
+                self.__failures.append(failure)
+            else:
+                self.__overflow += 1
 
     def assert_equal(self, actual, exp, msg: str = None, s_msg: str = None):
         """Fail if ``actual`` and ``exp`` are unequal as determined by the '==' operator.
@@ -356,12 +554,7 @@ class SoftAssert:
             sa.assert_equal("one","one", "error message if this keyword fails") -> pass \n
             sa.assert_all()
         """
-        try:
-            assert_equal(actual, exp, msg=msg, s_msg=s_msg)
-        except AssertionError as e:
-            if msg is None:
-                msg = str(e)
-            self.__errors.append(msg)
+        self.__run(assert_equal, actual, exp, msg=msg, s_msg=s_msg)
 
     def assert_true(self, expr, msg=None, s_msg: str = None):
         """Fail the test unless the provided ``expr`` is True.
@@ -377,12 +570,7 @@ class SoftAssert:
             sa.assert_true([1,2,3], "Custom error message") -> pass since list with contents are truth \n
             sa.assert_all()
         """
-        try:
-            assert_true(expr, msg, s_msg=s_msg)
-        except AssertionError as e:
-            if msg is None:
-                msg = str(e)
-            self.__errors.append(msg)
+        self.__run(assert_true, expr, msg, s_msg=s_msg)
 
     def assert_false(self, expr, msg=None, s_msg: str = None):
         """Fail the test unless the provided ``expr`` is False.
@@ -396,12 +584,7 @@ class SoftAssert:
             sa.assert_false(False) -> pass \n
             sa.assert_all()
         """
-        try:
-            assert_false(expr, msg, s_msg=s_msg)
-        except AssertionError as e:
-            if msg is None:
-                msg = str(e)
-            self.__errors.append(msg)
+        self.__run(assert_false, expr, msg, s_msg=s_msg)
 
     def assert_that_text_is_not_empty(self, txt: str, msg: str = None, s_msg: str = None):
         """Fail the test if the given ``txt`` is empty. len(txt) == 0 .
@@ -415,12 +598,7 @@ class SoftAssert:
             sa.assert_that_text_is_not_empty("text")  -> pass \n
             sa.assert_all()
         """
-        try:
-            assert_that_text_is_not_empty(txt, msg, s_msg=s_msg)
-        except AssertionError as e:
-            if msg is None:
-                msg = str(e)
-            self.__errors.append(msg)
+        self.__run(assert_that_text_is_not_empty, txt, msg, s_msg=s_msg)
 
     def assert_that_text_starts_with(self, txt: str, start: str, msg=None, s_msg: str = None):
         """Fail the test if the given ``txt`` does not start with ``start``. This is case-sensitive.
@@ -435,12 +613,7 @@ class SoftAssert:
             sa.assert_that_text_starts_with("String", "Str") -> pass   \n
             sa.assert_all()
         """
-        try:
-            assert_that_text_starts_with(txt, start, msg, s_msg=s_msg)
-        except AssertionError as e:
-            if msg is None:
-                msg = str(e)
-            self.__errors.append(msg)
+        self.__run(assert_that_text_starts_with, txt, start, msg, s_msg=s_msg)
 
     def assert_that_text_ends_with(self, txt: str, end: str, msg=None, s_msg: str = None):
         """Fail the test if the given ``txt`` does not end with ``end``. This is case-sensitive.
@@ -454,12 +627,7 @@ class SoftAssert:
             sa.assert_that_text_ends_with("String","ing") -> pass \n
             sa.assert_all()
         """
-        try:
-            assert_that_text_ends_with(txt, end, msg, s_msg=s_msg)
-        except AssertionError as e:
-            if msg is None:
-                msg = str(e)
-            self.__errors.append(msg)
+        self.__run(assert_that_text_ends_with, txt, end, msg, s_msg=s_msg)
 
     def assert_that_text_contains(self, txt: str, content: str, msg=None, s_msg: str = None):
         """Fail the test if the given ``txt`` does not contain ``content``. This is case-sensitive.
@@ -474,12 +642,7 @@ class SoftAssert:
             sa.assert_that_text_contains("String","tri") -> pass    \n
             sa.assert_all()
         """
-        try:
-            assert_that_text_contains(txt, content, msg, s_msg=s_msg)
-        except AssertionError as e:
-            if msg is None:
-                msg = str(e)
-            self.__errors.append(msg)
+        self.__run(assert_that_text_contains, txt, content, msg, s_msg=s_msg)
 
     def assert_that_list_is_empty(self, lst: list, msg=None, s_msg: str = None):
         """Fail the test if the given ``lst`` is not empty. This accepts list of Any type.
@@ -493,12 +656,7 @@ class SoftAssert:
             sa.assert_that_list_is_empty([]) -> pass    \n
             sa.assert_all()
         """
-        try:
-            assert_that_list_is_empty(lst, msg, s_msg=s_msg)
-        except AssertionError as e:
-            if msg is None:
-                msg = str(e)
-            self.__errors.append(msg)
+        self.__run(assert_that_list_is_empty, lst, msg, s_msg=s_msg)
 
     def assert_that_list_is_not_empty(self, lst: list, msg=None, s_msg: str = None):
         """Fail the test if the given ``lst`` is empty. This accepts list of Any type.
@@ -513,12 +671,7 @@ class SoftAssert:
             sa.assert_that_list_is_not_empty(["One","Two","Three"]) -> pass \n
             sa.assert_all()
         """
-        try:
-            assert_that_list_is_not_empty(lst, msg, s_msg=s_msg)
-        except AssertionError as e:
-            if msg is None:
-                msg = str(e)
-            self.__errors.append(msg)
+        self.__run(assert_that_list_is_not_empty, lst, msg, s_msg=s_msg)
 
     def assert_that_list_has_item(self, lst: list, content, msg=None, s_msg: str = None):
         """Fail the test if the given ``lst`` does not contain the provided ``content``.
@@ -532,12 +685,7 @@ class SoftAssert:
             sa.assert_that_list_has_item([1,2,4], 4) -> pass    \n
             sa.assert_all()
         """
-        try:
-            assert_that_list_has_item(lst, content, msg, s_msg=s_msg)
-        except AssertionError as e:
-            if msg is None:
-                msg = str(e)
-            self.__errors.append(msg)
+        self.__run(assert_that_list_has_item, lst, content, msg, s_msg=s_msg)
 
     def assert_that_list_does_not_contain(self, lst: list, item, msg=None, s_msg: str = None):
         """Fail the test if the given ``lst`` contains the provided ``item``.
@@ -550,12 +698,7 @@ class SoftAssert:
             sa.assert_that_list_does_not_contain([1,2,3,4], 10) -> pass since 10 is not in the list.
             sa.assert_all()
         """
-        try:
-            assert_that_list_does_not_contain(lst, item, msg, s_msg=s_msg)
-        except AssertionError as e:
-            if msg is None:
-                msg = str(e)
-            self.__errors.append(msg)
+        self.__run(assert_that_list_does_not_contain, lst, item, msg, s_msg=s_msg)
 
     def assert_that_list_contains_all(self, lst: list, contents: list, msg=None, s_msg: str = None):
         """Fail the test if the given ``lst`` does not contain all ``contents``.
@@ -569,24 +712,46 @@ class SoftAssert:
             sa.assert_that_list_contains_all([1,2,3,4,5],[1,2,3]) -> pass  \n
             sa.assert_all()
         """
-        try:
-            assert_that_list_contains_all(lst, contents, msg, s_msg=s_msg)
-        except AssertionError as e:
-            if msg is None:
-                msg = str(e)
-            self.__errors.append(msg)
+        self.__run(assert_that_list_contains_all, lst, contents, msg, s_msg=s_msg)
 
     def assert_that_date_format_is(self, date: str, exp_format: str, msg=None, s_msg: str = None):
         """Fail the test if the ``date`` provided does not match the ``exp_format``."""
-        try:
-            assert_that_date_format_is(date=date, exp_format=exp_format, msg=msg, s_msg=s_msg)
-        except AssertionError as e:
-            if msg is None:
-                msg = str(e)
-            self.__errors.append(msg)
+        self.__run(assert_that_date_format_is, date=date, exp_format=exp_format, msg=msg, s_msg=s_msg)
+
+    def assert_that_list_is_sorted(self, lst: list, key: Callable = None, reverse: bool = False, strict: bool = False,
+                                   msg=None, s_msg: str = None):
+        """Fail the test if the given ``lst`` is not sorted. See assert_that_list_is_sorted."""
+        self.__run(assert_that_list_is_sorted, lst, key=key, reverse=reverse, strict=strict, msg=msg, s_msg=s_msg)
+
+    def assert_that_list_is_monotonic(self, lst: list, strict: bool = False, msg=None, s_msg: str = None):
+        """Fail the test if the given ``lst`` is not increasing nor decreasing. See assert_that_list_is_monotonic."""
+        self.__run(assert_that_list_is_monotonic, lst, strict=strict, msg=msg, s_msg=s_msg)
+
+    def assert_that_all_within_tolerance(self, actual: list, exp: list, tolerance: float, relative: bool = False,
+                                         msg=None, s_msg: str = None):
+        """Fail the test unless every item is within tolerance. See assert_that_all_within_tolerance."""
+        self.__run(assert_that_all_within_tolerance, actual, exp, tolerance, relative=relative, msg=msg, s_msg=s_msg)
+
+    def assert_that_lists_are_equal(self, actual: list, exp: list, msg=None, s_msg: str = None):
+        """Fail the test if the lists differ at any index. See assert_that_lists_are_equal."""
+        self.__run(assert_that_lists_are_equal, actual, exp, msg=msg, s_msg=s_msg)
 
     def assert_all(self):
-        """Will fail test if at least one of the prior assertions has failed."""
-        if len(self.__errors) > 0:
-            err_msg = "\n" + "\n".join(self.__errors)
-            raise AssertionError(err_msg)
+        """Will fail test if at least one of the prior assertions has failed.
+        The error message numbers the distinct failures, repeated ones are counted instead of listed again.
+        """
+        with self.__lock:
+            failures = self.__failures.copy()
+            overflow = self.__overflow
+        if len(failures) + overflow == 0:
+            return
+
+        counts = Counter(failure.message for failure in failures)
+        lines = [f"{len(failures) + overflow} soft assertion/s failed:"]
+        for number, (message, count) in enumerate(counts.items(), start=1):
+            if len(message) > _REPORT_MESSAGE_LENGTH:
+                message = message[:_REPORT_MESSAGE_LENGTH] + "..."
+            lines.append(f"{number}) {message}" + (f" (x{count})" if count > 1 else ""))
+        if overflow > 0:
+            lines.append(f"... and {overflow} more failure/s over the limit of {self.__max_failures}.")
+        raise AssertionError("\n" + "\n".join(lines))
@@ -0,0 +1,160 @@
+"""
+Local Sauce Demo like web app for offline benchmarks. Serves a login page and an inventory page with the locators of
+the sauce_demo_ui page objects from an in process HTTP server:
+    with FixtureApp(items=50) as app:
+        se.open_browser(url=app.url, browser="chrome")
+
+The inventory page sorts the items on select like the real app. The reveal button sets the text of #revealed after
+``?delay=<ms>``, to measure waits on elements that change after an action. StubServer serves any static routes,
+e.g. JSON payloads for API benchmarks.
+"""
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>Swag Labs</title></head>
+<body>
+<div class="login_logo">Swag Labs</div>
+<form onsubmit="return login();">
+    <input id="user-name" data-test="username" type="text" placeholder="Username">
+    <input id="password" data-test="password" type="password" placeholder="Password">
+    <div class="error-message-container"></div>
+    <input id="login-button" data-test="login-button" class="btn_action" type="submit" value="Login">
+</form>
+<script>
+function login() {
+    var user = document.getElementById('user-name').value, password = document.getElementById('password').value;
+    var message = null;
+    if (user === '') { message = 'Epic sadface: Username is required'; }
+    else if (password === '') { message = 'Epic sadface: Password is required'; }
+    else if (user === 'locked_out_user') { message = 'Epic sadface: Sorry, this user has been locked out.'; }
+    if (message === null) { window.location.href = '/inventory.html'; return false; }
+    document.querySelector('.error-message-container').innerHTML = '<h3 data-test="error">' + message + '</h3>';
+    return false;
+}
+</script>
+</body></html>
+"""
+
+_INVENTORY_PAGE = """<!DOCTYPE html>
+<html><head><title>Swag Labs</title></head>
+<body>
+<div class="app_logo">Swag Labs</div>
+<span class="title">Products</span>
+<select class="product_sort_container" onchange="sortItems(this.value)">
+    <option value="az">Name (A to Z)</option>
+    <option value="za">Name (Z to A)</option>
+    <option value="lohi">Price (low to high)</option>
+    <option value="hilo">Price (high to low)</option>
+</select>
+<button id="reveal" onclick="reveal()">Reveal</button>
+<div id="revealed"></div>
+<div class="inventory_list">{items}</div>
+<script>
+function reveal() {
+    var revealed = document.getElementById('revealed');
+    var delay = Number(new URLSearchParams(window.location.search).get('delay') || 50);
+    revealed.textContent = '';
+    setTimeout(function () { revealed.textContent = 'Revealed'; }, delay);
+}
+function sortItems(order) {
+    var list = document.querySelector('.inventory_list');
+    var items = Array.prototype.slice.call(list.children);
+    var name = function (el) { return el.querySelector('.inventory_item_name').textContent; };
+    var price = function (el) { return Number(el.querySelector('.inventory_item_price').textContent.slice(1)); };
+    var compare = {
+        az: function (a, b) { return name(a).localeCompare(name(b)); },
+        za: function (a, b) { return name(b).localeCompare(name(a)); },
+        lohi: function (a, b) { return price(a) - price(b); },
+        hilo: function (a, b) { return price(b) - price(a); }
+    }[order];
+    items.sort(compare).forEach(function (el) { list.appendChild(el); });
+}
+</script>
+</body></html>
+"""
+
+_ITEM = """
+<div class="inventory_item">
+    <div class="inventory_item_label">
+        <a href="#"><div class="inventory_item_name">{name}</div></a>
+        <div class="inventory_item_desc">Description of {name}.</div>
+    </div>
+    <div class="pricebar">
+        <div class="inventory_item_price">${price:.2f}</div>
+        <button class="btn_inventory">Add to cart</button>
+    </div>
+</div>"""
+
+
+def _inventory(items: int) -> str:
+    # deterministic names and prices in A to Z order, like the default sort of the real app
+    rows = "".join(_ITEM.format(name=f"Sauce Labs Item {i:04d}", price=(i * 37) % 100 + 0.99) for i in range(items))
+    return _INVENTORY_PAGE.replace("{items}", rows)
+
+
+class _Server(ThreadingHTTPServer):
+
+    def handle_error(self, request, client_address):
+        # clients close streamed responses they stopped reading
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StubServer:
+    """Serves ``routes``, a dict of path to (content type, body), on a free local port until stopped."""
+
+    def __init__(self, routes: dict[str, tuple[str, bytes]], host: str = "127.0.0.1"):
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-alive, so clients with a connection pool reuse the connection like with a real server.
+            # Headers and body are separate writes, without TCP_NODELAY the body waits for the delayed ACK.
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                content_type, body = routes.get(path, ("text/plain", b""))
+                self.send_response(200 if path in routes else 404)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.__server = _Server((host, 0), Handler)
+        self.__thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self.__thread = threading.Thread(target=self.__server.serve_forever, name="stub-server", daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        self.__server.shutdown()
+        self.__server.server_close()
+        if self.__thread is not None:
+            self.__thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+class FixtureApp(StubServer):
+    """Serves the fixture app on a free local port until stopped, ``items`` is the number of inventory items."""
+
+    def __init__(self, items: int = 6, host: str = "127.0.0.1"):
+        html = "text/html; charset=utf-8"
+        super().__init__({"/": (html, _LOGIN_PAGE.encode()), "/index.html": (html, _LOGIN_PAGE.encode()),
+                          "/inventory.html": (html, _inventory(items).encode())}, host=host)
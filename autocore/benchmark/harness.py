@@ -0,0 +1,137 @@
+"""
+Shared benchmark harness. A benchmark is a callable measured over a number of rounds after a warmup, the result
+holds ops/sec and latency percentiles. Results are appended with the git commit to a JSON lines history file, so a
+run shows how the numbers moved since the last measured commit.
+
+A baseline file pins the expected results, ``check`` reports the benchmarks whose p50 got slower than the baseline
+by more than the threshold. Baselines depend on the machine, save them on the machine that checks them.
+"""
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+from typing import Callable
+
+from autocore.stats import percentile
+
+# run history is output, kept in the working directory instead of the package
+HISTORY_DIR = "benchmark_history"
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+# p50 below this is timer noise, a baseline under it is checked as this
+_MIN_CHECKED_MS = 0.005
+
+
+def measure(func: Callable, rounds: int = 50, warmup: int = 5) -> dict:
+    """Call ``func`` ``warmup`` times untimed and then ``rounds`` times timed. Returns the statistics in ms."""
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    total = sum(timings)
+    timings.sort()
+    return {"rounds": rounds, "ops_per_sec": round(rounds / total, 2) if total > 0 else float("inf"),
+            "mean_ms": round(total / rounds * 1000, 4), "min_ms": round(timings[0] * 1000, 4),
+            "p50_ms": round(percentile(timings, 0.5) * 1000, 4), "p95_ms": round(percentile(timings, 0.95) * 1000, 4),
+            "p99_ms": round(percentile(timings, 0.99) * 1000, 4), "max_ms": round(timings[-1] * 1000, 4)}
+
+
+def run(benchmarks: dict[str, Callable], rounds: int = 50, warmup: int = 5, select: str = None) -> dict:
+    """Measure the benchmarks, only those with ``select`` in their name if given."""
+    results = {}
+    for name, func in benchmarks.items():
+        if select is not None and select not in name:
+            continue
+        results[name] = measure(func, rounds=rounds, warmup=warmup)
+        print(f"{name}: {results[name]['ops_per_sec']} ops/s, p50 {results[name]['p50_ms']} ms")
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def record(path: str, results: dict) -> dict | None:
+    """Append the results of this commit to the history file. Returns the latest entry of another commit, None if
+    there is none.
+    """
+    commit = git_commit()
+    previous = None
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip() == "":
+                    continue
+                entry = json.loads(line)
+                if entry["commit"] != commit:
+                    previous = entry
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    entry = {"commit": commit, "timestamp": datetime.now().isoformat(timespec="seconds"),
+             "python": platform.python_version(), "machine": platform.node(), "results": results}
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(json.dumps(entry) + "\n")
+    return previous
+
+
+def report(results: dict, previous: dict = None) -> str:
+    """Returns a table of the results, with the change of p50 and ops/sec against the previous entry if given."""
+    before = previous["results"] if previous is not None else {}
+    header = f"{'benchmark':40} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    if previous is not None:
+        header += f"  vs {previous['commit']} (p50)"
+    lines = [header]
+    for name, stats in results.items():
+        line = (f"{name:40} {stats['ops_per_sec']:>10} {stats['p50_ms']:>9} {stats['p95_ms']:>9} "
+                f"{stats['p99_ms']:>9}")
+        if name in before and before[name]["p50_ms"] > 0:
+            line += f"  {(stats['p50_ms'] / before[name]['p50_ms'] - 1) * 100:+.1f}%"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def save_baseline(path: str, results: dict):
+    """Write the results as the baseline, keeping the baselines of benchmarks that were not run."""
+    baseline = load_baseline(path)
+    baseline.update(results)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"commit": git_commit(), "python": platform.python_version(), "machine": platform.node(),
+                   "results": dict(sorted(baseline.items()))}, file, indent=2)
+        file.write("\n")
+
+
+def load_baseline(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)["results"]
+
+
+def check(results: dict, baseline: dict, threshold: float = 0.5, remeasure: Callable[[str], dict] = None) -> list[str]:
+    """Returns the regressions, the benchmarks with a p50 more than ``threshold`` (0.5 -> 50%) above the baseline.
+    Benchmarks without a baseline are not checked. With ``remeasure`` a benchmark over the threshold is measured
+    again and only reported if it is still over, so a noisy run does not fail the check.
+    """
+    regressions = []
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        change = stats["p50_ms"] / max(baseline[name]["p50_ms"], _MIN_CHECKED_MS) - 1
+        if change > threshold and remeasure is not None:
+            stats = remeasure(name)
+            change = stats["p50_ms"] / max(baseline[name]["p50_ms"], _MIN_CHECKED_MS) - 1
+        if change > threshold:
+            regressions.append(f"{name}: p50 {stats['p50_ms']} ms, baseline {baseline[name]['p50_ms']} ms "
+                               f"(+{change * 100:.0f}%, threshold +{threshold * 100:.0f}%)")
+    return regressions
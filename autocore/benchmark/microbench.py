@@ -0,0 +1,189 @@
+"""
+Micro benchmarks of the hot paths that do not need a browser, in three groups:
+    asserts -> every autocore.asserts assertion and its SoftAssert twin at varied input sizes \n
+    api -> APIRequest and APIResponse JSONPath queries against a local stub HTTP server \n
+    db -> Database.execute and stream against a temporary SQLite database
+
+Compare a run against the baseline and fail on regressions, or save the run as the new baseline:
+    python -m autocore.benchmark.microbench --check --threshold 1.0 \n
+    python -m autocore.benchmark.microbench --group db --save-baseline
+"""
+import argparse
+import json
+import os
+import sys
+from contextlib import ExitStack
+from functools import partial
+
+from autocore import asserts
+from autocore.api.APIRequest import APIRequest
+from autocore.api.APIResponse import APIResponse
+from autocore.benchmark import harness
+from autocore.benchmark.fixtureapp import StubServer
+from autocore.db.Backend import SqliteBackend
+from autocore.db.Database import Database
+
+GROUPS = ("asserts", "api", "db")
+SIZES = (10, 1000, 10000)
+
+
+def _raises(func, *args):
+    def run():
+        try:
+            func(*args)
+        except AssertionError:
+            pass
+    return run
+
+
+def _soft_failures(size: int):
+    def run():
+        sa = asserts.SoftAssert()
+        for i in range(size):
+            sa.assert_equal(i, -1)
+        try:
+            sa.assert_all()
+        except AssertionError:
+            pass
+    return run
+
+
+def assert_benchmarks(sizes: tuple = SIZES) -> dict:
+    """Passing assertions, plus failing ones where building the failure is the cost."""
+    soft = asserts.SoftAssert()
+    benchmarks = {
+        "asserts.assert_true": partial(asserts.assert_true, True),
+        "asserts.assert_false": partial(asserts.assert_false, False),
+        "asserts.assert_that_date_format_is": partial(asserts.assert_that_date_format_is, "2023-01-31", "%Y-%m-%d"),
+        "asserts.assert_that_list_is_empty": partial(asserts.assert_that_list_is_empty, []),
+        "asserts.fail": _raises(asserts.fail, "Failed."),
+        "soft_assert.assert_true": partial(soft.assert_true, True),
+        "soft_assert.assert_equal.failed": _soft_failures(1),
+    }
+    for size in sizes:
+        lst = list(range(size))
+        text = "a" * size
+        floats = [float(i) for i in lst]
+        cases = {
+            "assert_equal": (lst, list(lst)),
+            "assert_that_text_is_not_empty": (text,),
+            "assert_that_text_starts_with": (text, text[:size // 2]),
+            "assert_that_text_ends_with": (text, text[size // 2:]),
+            "assert_that_text_contains": (text, text[:size // 2]),
+            "assert_that_list_is_not_empty": (lst,),
+            "assert_that_list_has_item": (lst, size - 1),
+            "assert_that_list_does_not_contain": (lst, -1),
+            "assert_that_list_contains_all": (lst, lst[::-1]),
+            "assert_that_list_is_sorted": (lst,),
+            "assert_that_list_is_monotonic": (lst,),
+            "assert_that_all_within_tolerance": (floats, [value + 0.001 for value in floats], 0.01),
+            "assert_that_lists_are_equal": (lst, list(lst)),
+        }
+        for name, args in cases.items():
+            benchmarks[f"asserts.{name}.{size}"] = partial(getattr(asserts, name), *args)
+            benchmarks[f"soft_assert.{name}.{size}"] = partial(getattr(soft, name), *args)
+        benchmarks[f"asserts.assert_equal.failed.{size}"] = _raises(asserts.assert_equal, lst, lst[::-1])
+        benchmarks[f"soft_assert.assert_all.failures.{size}"] = _soft_failures(size)
+    return benchmarks
+
+
+def _payload(size: int) -> bytes:
+    return json.dumps({"total": size, "items": [{"id": i, "name": f"item {i}", "price": i * 1.5,
+                                                 "tags": ["sale", f"tag {i % 10}"]} for i in range(size)]}).encode()
+
+
+def api_benchmarks(url: str, sizes: tuple = SIZES) -> dict:
+    """A request per size, and the JSONPath queries on a fresh APIResponse so the body is decoded every round."""
+    benchmarks = {}
+    for size in sizes:
+        request = APIRequest(pooled=True).set_base_url(url).set_endpoint(f"/items/{size}.json")
+        response = request.send_get_request().response
+        last = f"item {size - 1}"
+        benchmarks[f"api.send_get_request.{size}"] = request.send_get_request
+        benchmarks[f"api.get_value_of.{size}"] = lambda r=response: APIResponse(r).get_value_of("$.items[*].price")
+        benchmarks[f"api.value_of_should_be.{size}"] = \
+            lambda r=response, size=size: APIResponse(r).value_of_should_be("$.total", size)
+        benchmarks[f"api.values_of_should_be.{size}"] = \
+            lambda r=response, size=size: APIResponse(r).values_of_should_be({"$.total": size,
+                                                                             "$.items[0].name": "item 0"})
+        benchmarks[f"api.list_of_should_contain.{size}"] = \
+            lambda r=response, last=last: APIResponse(r).list_of_should_contain("$.items[*].name", last)
+
+        streamed = APIRequest(pooled=True).set_base_url(url).set_endpoint(f"/items/{size}.json").set_stream()
+        benchmarks[f"api.list_of_should_contain.stream.{size}"] = \
+            lambda s=streamed: s.send_get_request().list_of_should_contain("$.items[*].name", "item 0", stream=True)
+    return benchmarks
+
+
+def db_benchmarks(db: Database, cached: Database, sizes: tuple = SIZES) -> dict:
+    """Queries on a table of max(sizes) rows, ``cached`` has a result cache."""
+    db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, price REAL)")
+    db.bulk_insert("items", ({"id": i, "name": f"item {i}", "price": i * 1.5} for i in range(max(sizes))))
+    benchmarks = {
+        "db.execute.by_id": partial(db.execute, "SELECT * FROM items WHERE id = %s", (1,)),
+        "db.execute.by_id.cached": partial(cached.execute, "SELECT * FROM items WHERE id = %s", (1,)),
+    }
+    for size in sizes:
+        query = f"SELECT * FROM items WHERE id < {size}"
+        benchmarks[f"db.execute.rows.{size}"] = partial(db.execute, query)
+        benchmarks[f"db.execute.rows.cached.{size}"] = partial(cached.execute, query)
+        benchmarks[f"db.stream.rows.{size}"] = lambda query=query: sum(1 for _ in db.stream(query))
+    return benchmarks
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro benchmarks of asserts, APIResponse and Database.")
+    parser.add_argument("--group", choices=GROUPS, action="append", help="groups to run, all by default")
+    parser.add_argument("--select", help="only run the benchmarks with this in their name")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--log-mode", default=asserts.LOG_OFF,
+                        choices=(asserts.LOG_FULL, asserts.LOG_BUFFERED, asserts.LOG_OFF),
+                        help="assertion log mode during the run, APIResponse asserts its values too")
+    parser.add_argument("--baseline", default=os.path.join(harness.BASELINE_DIR, "micro.json"))
+    parser.add_argument("--history", default=os.path.join(harness.HISTORY_DIR, "micro.jsonl"))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="exit with 1 if a benchmark regressed")
+    parser.add_argument("--threshold", type=float, default=1.0, help="allowed p50 slowdown, 1.0 -> 2x")
+    args = parser.parse_args(argv)
+    groups = args.group or GROUPS
+    sizes = tuple(args.sizes)
+    run = partial(harness.run, rounds=args.rounds, warmup=args.warmup, select=args.select)
+
+    with ExitStack() as stack:
+        log_mode = asserts.set_assertion_log_mode(args.log_mode)
+        stack.callback(asserts.set_assertion_log_mode, log_mode)
+        benchmarks = {}
+        if "asserts" in groups:
+            benchmarks.update(assert_benchmarks(sizes))
+        if "api" in groups:
+            routes = {f"/items/{size}.json": ("application/json", _payload(size)) for size in sizes}
+            server = stack.enter_context(StubServer(routes))
+            benchmarks.update(api_benchmarks(server.url.rstrip("/"), sizes))
+        if "db" in groups:
+            backend = SqliteBackend()
+            db = Database(backend=backend)
+            cached = Database(backend=backend, result_cache_ttl=3600)
+            stack.callback(db.close_connections)
+            stack.callback(cached.close_connections)
+            benchmarks.update(db_benchmarks(db, cached, sizes))
+
+        results = run(benchmarks)
+        previous = harness.record(args.history, results)
+        print(harness.report(results, previous))
+        if args.save_baseline:
+            harness.save_baseline(args.baseline, results)
+            print(f"Saved the baseline: {args.baseline}")
+        if not args.check:
+            return 0
+
+        remeasure = lambda name: harness.measure(benchmarks[name], rounds=args.rounds, warmup=args.warmup)
+        regressions = harness.check(results, harness.load_baseline(args.baseline), args.threshold, remeasure)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Offline benchmark of WebActions and _WebElement operations against the local fixture app under headless Chrome.
+Reports ops/sec and latency percentiles per operation, appends the results to the history of the commit and shows
+the change since the last measured commit:
+    python -m autocore.benchmark.webbench --rounds 50 --items 100
+"""
+import argparse
+import itertools
+import os
+from datetime import timedelta
+
+from SeleniumLibrary import SeleniumLibrary
+
+from autocore.benchmark import harness
+from autocore.benchmark.fixtureapp import FixtureApp
+from autocore.web.BroswerConfig import chrome_options
+from autocore.web.element import WebElementFactory
+from autocore.web.profiler import profiler
+from autocore.web.webactions import WebActions
+
+USERNAME_FLD: str = 'id:user-name'
+LOGIN_BTN: str = 'id:login-button'
+ERROR_DISPLAY: str = 'xpath://h3[@data-test="error"]'
+SELECT_PRODUCT_SORT: str = 'xpath://select[@class="product_sort_container"]'
+LIST_OF_ITEM_NAMES: str = 'xpath://div[@class="inventory_item_name"]'
+PAGE_TITLE: str = 'xpath://span[contains(text(),"Products")]'
+REVEAL_BTN: str = 'id:reveal'
+REVEALED: str = 'id:revealed'
+
+TIMEOUT = timedelta(seconds=5)
+
+
+def login_benchmarks(wa: WebActions, element: WebElementFactory) -> dict:
+    """Benchmarks on the login page, the login button shows the error message when the username is empty."""
+    error = element.with_locator(locator=ERROR_DISPLAY)
+    return {
+        "webactions.click": lambda: wa.click(locator=LOGIN_BTN),
+        "webactions.get_text": lambda: wa.get_text(locator=ERROR_DISPLAY),
+        "webactions.input_text": lambda: wa.input_text(locator=USERNAME_FLD, text="standard_user"),
+        "element.text_should_be": lambda: error.text_should_be("Epic sadface: Username is required"),
+    }
+
+
+def inventory_benchmarks(wa: WebActions, element: WebElementFactory, cached: WebElementFactory) -> dict:
+    names = element.with_locator(locator=LIST_OF_ITEM_NAMES)
+    title = element.with_locator(locator=PAGE_TITLE)
+    cached_title = cached.with_locator(locator=PAGE_TITLE)
+    revealed = element.with_locator(locator=REVEALED)
+    orders = itertools.cycle(["za", "az"])
+
+    def select():
+        wa.select_by_value(locator=SELECT_PRODUCT_SORT, value=next(orders))
+
+    def reveal_and_wait():
+        wa.click(locator=REVEAL_BTN)
+        revealed.wait_until_text_is("Revealed", timeout=TIMEOUT)
+
+    return {
+        "element.get_texts": names.get_texts,
+        "element.get_text": title.get_text,
+        "element.get_text.cached": cached_title.get_text,
+        "element.read_elements": names.read_elements,
+        "webactions.select_by_value": select,
+        "element.wait_until_visible.present": lambda: title.wait_until_visible(timeout=TIMEOUT),
+        "element.wait_until_text_is.after_reveal": reveal_and_wait,
+    }
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Benchmark WebActions against the local fixture app.")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--items", type=int, default=100, help="number of inventory items")
+    parser.add_argument("--delay", type=int, default=50, help="ms until the revealed text is set")
+    parser.add_argument("--select", help="only run the benchmarks with this in their name")
+    parser.add_argument("--history", default=os.path.join(harness.HISTORY_DIR, "web.jsonl"))
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args(argv)
+
+    se = SeleniumLibrary()
+    wa = WebActions(ctx=se, timeout=TIMEOUT)
+    element = WebElementFactory(ctx=se, timeout=TIMEOUT)
+    cached = WebElementFactory(ctx=se, timeout=TIMEOUT, cache=True)
+    prof = profiler()
+    with FixtureApp(items=args.items) as app:
+        wa.open_browser(url=app.url, browser="chrome", options=chrome_options(is_headless=not args.headed),
+                        alias=None)
+        prof.reset()
+        prof.enabled = True
+        try:
+            results = harness.run(login_benchmarks(wa, element), rounds=args.rounds, warmup=args.warmup,
+                                  select=args.select)
+            wa.go_to(url=f"{app.url}inventory.html?delay={args.delay}")
+            results.update(harness.run(inventory_benchmarks(wa, element, cached), rounds=args.rounds,
+                                       warmup=args.warmup, select=args.select))
+        finally:
+            prof.enabled = False
+            wa.close_all_browsers()
+
+    previous = harness.record(args.history, results)
+    print(harness.report(results, previous))
+    print("\nWebDriver commands and waits:")
+    print(prof.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Database backends used by autocore.db.Database. A backend opens and validates connections and returns cursors
+that fetch rows as dicts, so Database keeps the same execute, pooling and streaming semantics on every backend.
+
+SqliteBackend runs in process without a server, e.g. to exercise or benchmark DB keywords on any CI box:
+    db = Database(backend=SqliteBackend())
+"""
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Any
+
+import mysql.connector
+
+# quoted literals and identifiers are matched first so the placeholders inside them are kept as they are
+_SQL_TOKEN = re.compile(r"""'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|`[^`]*`|%%|%\((\w+)\)s|%s""")
+
+
+class Backend(ABC):
+    """Interface of a database backend. Queries are written with the mysql connector placeholders (%s, %(name)s),
+    backends with another paramstyle translate them in ``sql``.
+    """
+
+    @abstractmethod
+    def connect(self) -> Any:
+        pass
+
+    @abstractmethod
+    def ping(self, conn: Any):
+        """Raises if the connection was dropped."""
+
+    @abstractmethod
+    def cursor(self, conn: Any, prepared: bool = False, stream: bool = False) -> Any:
+        """Returns a cursor fetching rows as dicts. A ``stream`` cursor fetches rows from the server as they are
+        read instead of at execute.
+        """
+
+    @abstractmethod
+    def begin(self, conn: Any):
+        pass
+
+    def sql(self, query: str, params: Any = None) -> str:
+        """Returns the query in the paramstyle of the backend. Like the mysql connector the placeholders are only
+        substituted when ``params`` are given, a query without them is run as written.
+        """
+        return query
+
+    def close(self):
+        pass
+
+
+class MySqlBackend(Backend):
+
+    def __init__(self, host: str, user: str, password: str, port: str, database: str):
+        self.__host = host
+        self.__user = user
+        self.__password = password
+        self.__port = port
+        self.__database = database
+
+    def connect(self) -> Any:
+        conn = mysql.connector.connect(host=self.__host, user=self.__user, password=self.__password,
+                                       port=self.__port, database=self.__database)
+        conn.autocommit = True
+        return conn
+
+    def ping(self, conn: Any):
+        conn.ping(reconnect=False)
+
+    def cursor(self, conn: Any, prepared: bool = False, stream: bool = False) -> Any:
+        if prepared:
+            return conn.cursor(prepared=True, dictionary=True)
+        if stream:
+            return conn.cursor(dictionary=True, buffered=False)
+        return conn.cursor(dictionary=True)
+
+    def begin(self, conn: Any):
+        conn.start_transaction()
+
+    def __str__(self):
+        return f"mysql://{self.__host}:{self.__port}/{self.__database}"
+
+
+class SqliteBackend(Backend):
+    """SQLite database at ``path``. The default :memory: database is a temporary file shared by the connections of
+    the backend and deleted when the backend is closed. A shared cache in memory database locks whole tables, so
+    concurrent pooled connections would fail instead of waiting, the temporary file is in WAL mode where readers
+    do not block the writer. Writers wait up to ``timeout`` seconds for each other.
+    """
+
+    def __init__(self, path: str = ":memory:", timeout: float = 5):
+        self.__path = path
+        self.__timeout = timeout
+        self.__directory = None
+        if path == ":memory:":
+            self.__directory = tempfile.mkdtemp(prefix="autocore_sqlite_")
+            self.__path = os.path.join(self.__directory, "db.sqlite")
+            conn = self.connect()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.close()
+
+    def connect(self) -> Any:
+        # autocommit like the mysql backend, pooled connections are used by one thread at a time
+        conn = sqlite3.connect(self.__path, timeout=self.__timeout, isolation_level=None, check_same_thread=False)
+        conn.row_factory = _dict_row
+        if self.__directory is not None:
+            # the temporary database does not need to survive a crash
+            conn.execute("PRAGMA synchronous=OFF")
+        return conn
+
+    def ping(self, conn: Any):
+        conn.execute("SELECT 1")
+
+    def cursor(self, conn: Any, prepared: bool = False, stream: bool = False) -> Any:
+        # sqlite cursors step through the rows as they are fetched and statements are cached by the connection
+        return conn.cursor()
+
+    def begin(self, conn: Any):
+        # take the write lock up front, a read transaction that has to upgrade to a write one fails without waiting
+        conn.execute("BEGIN IMMEDIATE")
+
+    def sql(self, query: str, params: Any = None) -> str:
+        if params is None:
+            return query
+        return _SQL_TOKEN.sub(_sqlite_token, query)
+
+    def close(self):
+        if self.__directory is not None:
+            shutil.rmtree(self.__directory, ignore_errors=True)
+            self.__directory = None
+
+    def __str__(self):
+        return f"sqlite://{self.__path}"
+
+
+def positional(query: str, params: dict) -> tuple[str, tuple]:
+    """Returns the query with its named placeholders (%(name)s) replaced by %s and the parameters in their order."""
+    names = []
+
+    def token(match: re.Match) -> str:
+        if match.group(1) is None:
+            return match.group(0)
+        names.append(match.group(1))
+        return "%s"
+
+    query = _SQL_TOKEN.sub(token, query)
+    missing = [name for name in names if name not in params]
+    if len(missing) > 0:
+        raise Exception(f"Query parameters are missing: {', '.join(missing)}")
+    return query, tuple(params[name] for name in names)
+
+
+def _sqlite_token(match: re.Match) -> str:
+    token = match.group(0)
+    if token == "%s":
+        return "?"
+    if token == "%%":
+        return "%"
+    if match.group(1) is not None:
+        return f":{match.group(1)}"
+    return token
+
+
+def _dict_row(cursor: sqlite3.Cursor, row: tuple) -> dict:
+    return {column[0]: value for column, value in zip(cursor.description, row)}
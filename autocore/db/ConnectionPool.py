@@ -0,0 +1,172 @@
+"""
+Thread safe pool of database connections with lease/return semantics. Connections are validated before they are
+leased so a dropped connection is replaced instead of failing the query.
+"""
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable
+
+from robot.api import logger
+
+
+class ConnectionPool:
+    """Keeps between ``min_size`` and ``max_size`` open connections.
+
+    Leasing takes an idle connection, or opens a new one while less than ``max_size`` are open, otherwise waits up to
+    ``lease_timeout`` seconds for a connection to be returned. Idle connections are pinged before they are leased
+    when ``pre_ping`` is set, and closed after ``idle_timeout`` seconds unless the pool would drop below ``min_size``.
+    ``on_close`` is called with every connection the pool closes, e.g. to drop state kept for it.
+
+    Example:
+        pool = ConnectionPool(connect=lambda: mysql.connector.connect(...), ping=lambda conn: conn.ping()) \n
+        with pool.connection() as conn:
+            ...
+    """
+
+    def __init__(self, connect: Callable[[], Any], ping: Callable[[Any], None] = None, min_size: int = 0,
+                 max_size: int = 5, idle_timeout: float = 300, pre_ping: bool = True, lease_timeout: float = 30,
+                 on_close: Callable[[Any], None] = None):
+        if max_size < 1 or min_size > max_size:
+            raise Exception(f"Invalid connection pool size. min_size: {min_size}, max_size: {max_size}.")
+
+        self.__connect = connect
+        self.__ping = ping
+        self.__min_size = min_size
+        self.__max_size = max_size
+        self.__idle_timeout = idle_timeout
+        self.__pre_ping = pre_ping
+        self.__lease_timeout = lease_timeout
+        self.__on_close = on_close
+        self.__idle: deque = deque()
+        self.__open = 0
+        self.__available = threading.Condition()
+        self.__closed = False
+
+        for _ in range(min_size):
+            self.__idle.append((self.__new_connection(), time.monotonic()))
+            self.__open += 1
+
+    @property
+    def stats(self) -> dict:
+        with self.__available:
+            return {"open": self.__open, "idle": len(self.__idle), "leased": self.__open - len(self.__idle),
+                    "max_size": self.__max_size}
+
+    def lease(self) -> Any:
+        """Returns a validated connection, waits for one to be returned if ``max_size`` are leased."""
+        deadline = time.monotonic() + self.__lease_timeout
+        while True:
+            conn, is_new = self.__take(deadline)
+            if is_new or self.__is_alive(conn):
+                return conn
+            logger.info(f"Discarding dropped connection {str(conn)}.")
+            self.__discard(conn)
+
+    def release(self, conn: Any, discard: bool = False):
+        """Return the leased connection. A ``discard`` ed connection is closed instead, e.g. after an error."""
+        if discard or self.__closed:
+            self.__discard(conn)
+            return
+
+        with self.__available:
+            self.__idle.append((conn, time.monotonic()))
+            self.__available.notify()
+
+    @contextmanager
+    def connection(self):
+        """Leases a connection for the ``with`` block. It is discarded if it is dropped when the block raises."""
+        conn = self.lease()
+        try:
+            yield conn
+        except Exception:
+            self.release(conn, discard=not self.__is_alive(conn))
+            raise
+        else:
+            self.release(conn)
+
+    def close(self):
+        """Close the idle connections. Leased connections are closed when they are returned."""
+        with self.__available:
+            self.__closed = True
+            idle = [conn for conn, _ in self.__idle]
+            self.__idle.clear()
+            self.__open -= len(idle)
+            self.__available.notify_all()
+
+        for conn in idle:
+            self.__close(conn)
+
+    def __take(self, deadline: float) -> tuple[Any, bool]:
+        expired = []
+        try:
+            with self.__available:
+                while True:
+                    if self.__closed:
+                        raise Exception("Connection pool is already closed.")
+
+                    expired.extend(self.__expire_idle())
+                    if len(self.__idle) > 0:
+                        conn, _ = self.__idle.pop()
+                        return conn, False
+                    if self.__open < self.__max_size:
+                        self.__open += 1
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self.__available.wait(timeout=remaining):
+                        raise Exception(f"No database connection returned within {self.__lease_timeout} seconds. "
+                                        f"All {self.__max_size} connections are leased.")
+        finally:
+            for conn in expired:
+                self.__close(conn)
+
+        try:
+            return self.__new_connection(), True
+        except Exception:
+            with self.__available:
+                self.__open -= 1
+                self.__available.notify()
+            raise
+
+    def __expire_idle(self) -> list:
+        # oldest connections are at the left, the most recently returned are leased first from the right
+        expired = []
+        now = time.monotonic()
+        while len(self.__idle) > 0 and self.__open > self.__min_size \
+                and now - self.__idle[0][1] > self.__idle_timeout:
+            conn, _ = self.__idle.popleft()
+            self.__open -= 1
+            expired.append(conn)
+        return expired
+
+    def __new_connection(self) -> Any:
+        logger.info("Creating a new connection.")
+        return self.__connect()
+
+    def __is_alive(self, conn: Any) -> bool:
+        if not self.__pre_ping or self.__ping is None:
+            return True
+        try:
+            self.__ping(conn)
+            return True
+        except Exception:
+            logger.debug(traceback.format_exc())
+            return False
+
+    def __discard(self, conn: Any):
+        with self.__available:
+            self.__open -= 1
+            self.__available.notify()
+        self.__close(conn)
+
+    def __close(self, conn: Any):
+        try:
+            logger.info(f"Closing {str(conn)}.")
+            if self.__on_close is not None:
+                self.__on_close(conn)
+            conn.close()
+        except Exception:
+            logger.debug(traceback.format_exc())
@@ -1,43 +1,237 @@
-import mysql.connector
+import csv
+import json
+import re
+import time
+from itertools import islice
+from typing import Iterable, Iterator
+
 from robot.api import logger
 
+from autocore.db.Backend import Backend, MySqlBackend, positional
+from autocore.db.ConnectionPool import ConnectionPool
+from autocore.db.ResultCache import ResultCache
+from autocore.db.StatementCache import StatementCache
+
+_PREVIEW_ROWS = 10
+_IDENTIFIER = re.compile(r"[A-Za-z_][\w$]*(\.[A-Za-z_][\w$]*)?")
+
 
 class Database:
-    """Closing the created connection will the users' responsibility.
+    """Closing the created connections will the users' responsibility.
     Suggested usage is to create single instance during the initialization of a global library.
     Then pass the instance only to library components that needs db connection.
+
+    Connects to the MySQL database of ``host``, or to the given ``backend`` e.g. an in process SqliteBackend.
+
+    Queries lease a connection from a pool of up to ``max_connections``, so the instance can be shared by
+    concurrent keyword threads. Connections are pinged before use and replaced if they were dropped.
+
+    With ``prepared`` the queries of execute are run as prepared statements, cached per connection up to
+    ``statement_cache_size``. Named parameters (%(name)s) are then turned into positional ones before the query is
+    prepared.
+
+    With a ``result_cache_ttl`` the rows of read queries are cached in memory for that many seconds, up to
+    ``result_cache_max_bytes``. Write statements run through the instance drop the cached results of the table
+    they write, writes made by other clients are only seen once the results expire.
     """
 
-    def __init__(self, host: str, user: str, password: str, port: str, database: str):
-        self.__connections = []
-        self.__host = host
-        self.__user = user
-        self.__password = password
-        self.__port = port
-        self.__database = database
+    def __init__(self, host: str = None, user: str = None, password: str = None, port: str = None,
+                 database: str = None, min_connections: int = 0, max_connections: int = 5, idle_timeout: float = 300,
+                 pre_ping: bool = True, prepared: bool = False, statement_cache_size: int = 100,
+                 result_cache_ttl: float = 0, result_cache_max_bytes: int = 16 * 1024 * 1024, backend: Backend = None):
+        if backend is None:
+            backend = MySqlBackend(host=host, user=user, password=password, port=port, database=database)
+        self.__backend = backend
+        self.__prepared = prepared
+        self.__statements = StatementCache(prepare=lambda conn: backend.cursor(conn, prepared=True),
+                                           max_size=statement_cache_size)
+        self.__pool = ConnectionPool(connect=backend.connect, ping=backend.ping,
+                                     min_size=min_connections, max_size=max_connections, idle_timeout=idle_timeout,
+                                     pre_ping=pre_ping, on_close=self.__statements.invalidate)
+        self.__results: ResultCache = None
+        if result_cache_ttl > 0:
+            self.__results = ResultCache(ttl=result_cache_ttl, max_bytes=result_cache_max_bytes)
+
+    @property
+    def backend(self) -> Backend:
+        return self.__backend
+
+    @property
+    def pool(self) -> ConnectionPool:
+        return self.__pool
+
+    @property
+    def statement_cache(self) -> StatementCache:
+        return self.__statements
+
+    @property
+    def result_cache(self) -> ResultCache | None:
+        return self.__results
 
     def execute(self, *args, **kwargs):
-        self.__create_connection()
-
-        logger.info(f"Executing query. {args[0]}")
-        cursor = self.__connections[0].cursor(dictionary=True)
-        cursor.execute(*args, **kwargs)
-        result = cursor.fetchall()
-        cursor.close()
-        logger.info(f"Query Result: {result}")
+        if self.__results is None:
+            return self.__execute(*args, **kwargs)
+
+        query = args[0]
+        if not ResultCache.is_read(query):
+            self.__results.invalidate(ResultCache.written_table(query))
+            return self.__execute(*args, **kwargs)
+
+        key = ResultCache.key(query, args[1] if len(args) > 1 else kwargs.get("params"))
+        result = self.__results.get(key)
+        if result is not None:
+            logger.info(f"Query result served from cache. {query}")
+            logger.info(_result_log(result[:_PREVIEW_ROWS], len(result)))
+            return result
+
+        result = self.__execute(*args, **kwargs)
+        self.__results.put(key, result)
         return result
 
-    def __create_connection(self):
-        if len(self.__connections) == 0:
-            logger.info("Creating a new connection.")
-            conn = mysql.connector.connect(host=self.__host, user=self.__user, password=self.__password,
-                                           port=self.__port, database=self.__database)
-            conn.autocommit = True
-            self.__connections.append(conn)
-        else:
-            logger.info(f"Using an existing connection {str(self.__connections[0])}.")
+    def __execute(self, query: str, *args, **kwargs):
+        logger.info(f"Executing query. {query}")
+        params = args[0] if len(args) > 0 else kwargs.get("params")
+        if self.__prepared and isinstance(params, dict):
+            # the mysql connector rewrites named placeholders on every execute, which prepares the statement again
+            query, params = positional(query, params)
+            if len(args) > 0:
+                args = (params,) + args[1:]
+            else:
+                kwargs["params"] = params
+        query = self.__backend.sql(query, params)
+        with self.__pool.connection() as conn:
+            if self.__prepared:
+                # cached cursors stay open to keep their prepared statement, executing them with the SQL object they
+                # were prepared with keeps the connector from preparing it again
+                cursor, query = self.__statements.cursor(conn, query)
+                cursor.execute(query, *args, **kwargs)
+                result = cursor.fetchall()
+            else:
+                cursor = self.__backend.cursor(conn)
+                try:
+                    cursor.execute(query, *args, **kwargs)
+                    result = cursor.fetchall()
+                finally:
+                    cursor.close()
+        logger.info(_result_log(result[:_PREVIEW_ROWS], len(result)))
+        return result
+
+    def stream(self, query: str, params=None, batch_size: int = 1000) -> Iterator[dict]:
+        """Yields the rows of the query fetched ``batch_size`` at a time from an unbuffered cursor, so the whole
+        result is never held in memory. Only a preview of the rows is logged.
+
+        Example:
+            for row in db.stream("SELECT * FROM orders"):
+                ...
+        """
+        logger.info(f"Streaming query. {query}")
+        conn = self.__pool.lease()
+        preview = []
+        count = 0
+        completed = False
+        try:
+            cursor = self.__backend.cursor(conn, stream=True)
+            cursor.execute(self.__backend.sql(query, params), params if params is not None else ())
+            rows = cursor.fetchmany(batch_size)
+            while len(rows) > 0:
+                for row in rows:
+                    if count < _PREVIEW_ROWS:
+                        preview.append(row)
+                    count += 1
+                    yield row
+                rows = cursor.fetchmany(batch_size)
+            cursor.close()
+            completed = True
+        finally:
+            # the unread rows of an abandoned stream block the connection, close it instead of draining them
+            self.__pool.release(conn, discard=not completed)
+            logger.info(_result_log(preview, count, completed))
+
+    def bulk_insert(self, table: str, rows: Iterable[dict] | str, batch_size: int = 1000) -> dict:
+        """Insert the rows in batches of ``batch_size`` with executemany, in a single transaction that is rolled
+        back if any batch fails. ``rows`` is an iterable of dicts, or the path of a .csv, .json or .jsonl file.
+        The columns are the keys of the first row. Returns the throughput of the load.
+
+        Example:
+            db.bulk_insert("users", "fixtures/users.csv", batch_size=500)
+        """
+        if _IDENTIFIER.fullmatch(table) is None:
+            raise Exception(f"Invalid table name: {table}")
+        if isinstance(rows, str):
+            rows = _read_rows(rows)
+
+        rows = iter(rows)
+        batch = list(islice(rows, batch_size))
+        if len(batch) == 0:
+            logger.info(f"No rows to insert into {table}.")
+            return {"rows": 0, "batches": 0, "seconds": 0.0, "rows_per_second": 0.0}
+
+        columns = list(batch[0])
+        for column in columns:
+            if _IDENTIFIER.fullmatch(column) is None:
+                raise Exception(f"Invalid column name: {column}")
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+        if self.__results is not None:
+            self.__results.invalidate(table)
+        logger.info(f"Bulk inserting into {table}. {query}")
+        query = self.__backend.sql(query, batch)
+
+        inserted = 0
+        batches = 0
+        start = time.perf_counter()
+        with self.__pool.connection() as conn:
+            cursor = conn.cursor()
+            self.__backend.begin(conn)
+            try:
+                while len(batch) > 0:
+                    # mysql connector rewrites executemany of an INSERT into a single multi row INSERT
+                    cursor.executemany(query, [_values(row, columns) for row in batch])
+                    inserted += len(batch)
+                    batches += 1
+                    batch = list(islice(rows, batch_size))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+        seconds = time.perf_counter() - start
+        stats = {"rows": inserted, "batches": batches, "seconds": seconds,
+                 "rows_per_second": inserted / seconds if seconds > 0 else float(inserted)}
+        logger.info(f"Inserted {inserted} row/s into {table} in {batches} batch/es, {seconds:.3f} s "
+                    f"({stats['rows_per_second']:.0f} rows/s).")
+        return stats
 
     def close_connections(self):
-        for connection in self.__connections:
-            logger.info(f"Closing {str(self.__connections[0])}.")
-            connection.close()
+        self.__pool.close()
+        self.__backend.close()
+
+
+def _result_log(preview: list, count: int, completed: bool = True) -> str:
+    rows = f"{count} row/s" if completed else f"{count} row/s read before the stream was closed"
+    if count > len(preview):
+        return f"Query Result: {rows}, showing the first {len(preview)}. {preview}"
+    return f"Query Result: {rows}. {preview}"
+
+
+def _values(row: dict, columns: list) -> tuple:
+    if len(row) != len(columns):
+        raise Exception(f"Row {row} does not match the columns {columns}.")
+    return tuple(row[column] for column in columns)
+
+
+def _read_rows(path: str) -> Iterator[dict]:
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as file:
+            yield from csv.DictReader(file)
+    elif path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    elif path.endswith(".json"):
+        with open(path, encoding="utf-8") as file:
+            yield from json.load(file)
+    else:
+        raise Exception(f"Unsupported fixture file: {path}. Use a .csv, .json or .jsonl file.")
@@ -0,0 +1,139 @@
+"""
+In memory cache of read only query results, for reference data queried by every test. Entries expire after a TTL,
+the least recently used are evicted above a byte budget and writes to a table drop the results that read it.
+"""
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from robot.api import logger
+
+# literals, quoted identifiers and comments, so keywords are only looked for in the statement itself
+_NOT_CODE = re.compile(r"""'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|`[^`]*`|--[^\n]*|#[^\n]*|/\*.*?\*/""", re.DOTALL)
+_PARENTHESES = re.compile(r"\([^()]*\)")
+_READ_STATEMENT = re.compile(r"\s*\(?\s*(SELECT|SHOW|DESCRIBE|DESC|EXPLAIN|WITH)\b", re.IGNORECASE)
+_NOT_READ = re.compile(r"\bFOR\s+(?:UPDATE|SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b|\bINTO\b", re.IGNORECASE)
+_WRITE = re.compile(r"\b(?:INSERT|UPDATE|DELETE|REPLACE|MERGE)\b", re.IGNORECASE)
+_IDENTIFIER = r"(?:`[^`]+`|\"[^\"]+\"|[\w$]+)"
+_WRITTEN_TABLE = re.compile(r"\s*(?:INSERT\s+(?:(?:LOW_PRIORITY|DELAYED|HIGH_PRIORITY|IGNORE)\s+)*INTO"
+                            r"|REPLACE\s+(?:(?:LOW_PRIORITY|DELAYED)\s+)*INTO"
+                            r"|UPDATE\s+(?:(?:LOW_PRIORITY|IGNORE)\s+)*"
+                            r"|DELETE\s+(?:(?:LOW_PRIORITY|QUICK|IGNORE)\s+)*FROM"
+                            rf"|TRUNCATE(?:\s+TABLE)?)\s*({_IDENTIFIER}(?:\s*\.\s*{_IDENTIFIER})*)\s*(.*)",
+                            re.IGNORECASE | re.DOTALL)
+_MULTI_TABLE = re.compile(r"^,|\bJOIN\b|\bUSING\b", re.IGNORECASE)
+_SEGMENT = re.compile(_IDENTIFIER)
+
+
+def _code(sql: str) -> str:
+    return _NOT_CODE.sub(" ", sql)
+
+
+def _size_of(rows: list) -> int:
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for value in row.values():
+            size += sys.getsizeof(value)
+    return size
+
+
+class ResultCache:
+    """Caches the rows of read queries for ``ttl`` seconds, keyed by the normalized SQL and its parameters.
+    Holds at most ``max_bytes`` of rows, evicting the least recently used results first.
+    """
+
+    def __init__(self, ttl: float = 60, max_bytes: int = 16 * 1024 * 1024):
+        self.__ttl = ttl
+        self.__max_bytes = max_bytes
+        self.__results: OrderedDict[tuple, tuple[list, float, int]] = OrderedDict()
+        self.__bytes = 0
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def stats(self) -> dict:
+        with self.__lock:
+            lookups = self.__hits + self.__misses
+            return {"hits": self.__hits, "misses": self.__misses, "size": len(self.__results), "bytes": self.__bytes,
+                    "max_bytes": self.__max_bytes, "hit_rate": self.__hits / lookups if lookups > 0 else 0.0}
+
+    @staticmethod
+    def key(sql: str, params: Any = None) -> tuple:
+        return " ".join(sql.split()).rstrip(";").strip(), repr(params)
+
+    @staticmethod
+    def is_read(sql: str) -> bool:
+        """A query that only reads, locking reads and SELECT ... INTO are not. A WITH query is a read when its main
+        statement is a SELECT.
+        """
+        code = _code(sql)
+        match = _READ_STATEMENT.match(code)
+        if match is None or _NOT_READ.search(code) is not None:
+            return False
+        if match.group(1).upper() != "WITH":
+            return True
+
+        # drop the common table expressions and subqueries, what is left is the main statement
+        previous = None
+        while previous != code:
+            previous, code = code, _PARENTHESES.sub(" ", code)
+        return _WRITE.search(code) is None
+
+    @staticmethod
+    def written_table(sql: str) -> str | None:
+        """Returns the table written by the statement without its schema, None if it is not a single table write
+        (e.g. DDL, multi table UPDATE or DELETE, WITH ... DELETE) or the table can not be told.
+        """
+        match = _WRITTEN_TABLE.match(sql)
+        if match is None or _MULTI_TABLE.search(_code(match.group(2))) is not None:
+            return None
+        table = _SEGMENT.findall(match.group(1))[-1]
+        return table[1:-1] if table[0] in "`\"" else table
+
+    def get(self, key: tuple) -> list | None:
+        """Returns a copy of the cached rows, None if they are not cached or expired."""
+        with self.__lock:
+            cached = self.__results.get(key)
+            if cached is None or time.monotonic() > cached[1]:
+                if cached is not None:
+                    self.__remove(key)
+                self.__misses += 1
+                return None
+            self.__hits += 1
+            self.__results.move_to_end(key)
+        return [dict(row) for row in cached[0]]
+
+    def put(self, key: tuple, rows: list):
+        size = _size_of(rows)
+        if size > self.__max_bytes:
+            logger.info(f"Query result of {size} bytes is larger than the result cache, not caching it.")
+            return
+
+        rows = [dict(row) for row in rows]
+        with self.__lock:
+            if key in self.__results:
+                self.__remove(key)
+            self.__results[key] = (rows, time.monotonic() + self.__ttl, size)
+            self.__bytes += size
+            while self.__bytes > self.__max_bytes:
+                self.__remove(next(iter(self.__results)))
+
+    def invalidate(self, table: str = None):
+        """Drop the results of the queries that mention the table, all results if no table is given."""
+        with self.__lock:
+            if table is None:
+                self.__results.clear()
+                self.__bytes = 0
+                return
+
+            name = re.compile(rf"\b{re.escape(table.split('.')[-1])}\b", re.IGNORECASE)
+            for key in [key for key in self.__results if name.search(key[0])]:
+                self.__remove(key)
+
+    def __remove(self, key: tuple):
+        self.__bytes -= self.__results.pop(key)[2]
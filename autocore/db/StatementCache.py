@@ -0,0 +1,73 @@
+"""
+Per connection LRU of prepared cursors keyed by SQL text. A prepared cursor keeps its server side statement, so
+executing the same SQL again only sends the parameters instead of having the server parse it again.
+"""
+import threading
+import traceback
+from collections import OrderedDict
+from typing import Any, Callable
+
+from robot.api import logger
+
+
+class StatementCache:
+    """Keeps up to ``max_size`` prepared cursors for each connection. Invalidate a connection when it is closed
+    or recycled, its cursors are closed and their statements deallocated.
+    """
+
+    def __init__(self, prepare: Callable[[Any], Any], max_size: int = 100):
+        self.__prepare = prepare
+        self.__max_size = max_size
+        self.__statements: dict[int, OrderedDict[str, tuple[Any, str]]] = {}
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def stats(self) -> dict:
+        with self.__lock:
+            lookups = self.__hits + self.__misses
+            return {"hits": self.__hits, "misses": self.__misses, "connections": len(self.__statements),
+                    "size": sum(len(cursors) for cursors in self.__statements.values()),
+                    "hit_rate": self.__hits / lookups if lookups > 0 else 0.0}
+
+    def cursor(self, conn: Any, sql: str) -> tuple[Any, str]:
+        """Returns the prepared cursor of the SQL on the connection and the SQL it was first executed with,
+        preparing a new one if it is not cached. Execute the cursor with the returned SQL, the mysql connector
+        prepares the statement again when it is given another string object even if the text is the same.
+        The connection should be leased by the caller, its cursors are not shared between threads.
+        """
+        with self.__lock:
+            cursors = self.__statements.setdefault(id(conn), OrderedDict())
+            cached = cursors.get(sql)
+            if cached is not None:
+                self.__hits += 1
+                cursors.move_to_end(sql)
+                return cached
+            self.__misses += 1
+
+        cached = (self.__prepare(conn), sql)
+        evicted = []
+        with self.__lock:
+            cursors[sql] = cached
+            while len(cursors) > self.__max_size:
+                evicted.append(cursors.popitem(last=False)[1][0])
+        for stale in evicted:
+            self.__close(stale)
+        return cached
+
+    def invalidate(self, conn: Any):
+        """Drop the cursors of the connection, e.g. when the pool closes it."""
+        with self.__lock:
+            cursors = self.__statements.pop(id(conn), None)
+        if cursors is not None:
+            logger.info(f"Invalidating {len(cursors)} prepared statement/s of {str(conn)}.")
+            for cursor, _ in cursors.values():
+                self.__close(cursor)
+
+    @staticmethod
+    def __close(cursor: Any):
+        try:
+            cursor.close()
+        except Exception:
+            logger.debug(traceback.format_exc())
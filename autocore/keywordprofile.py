@@ -0,0 +1,130 @@
+"""
+Keyword level performance profile of robot runs. The listener records the duration of every keyword and the time
+spent in each keyword call stack. Every process writes its own profile to a shared directory, so runs, suites and
+pabot workers are aggregated by merging the directory:
+    robot --listener autocore.keywordprofile.KeywordProfileListener:/tmp/keyword_profile tests \n
+    pabot --listener autocore.keywordprofile.KeywordProfileListener:/tmp/keyword_profile tests
+
+The merged profile is written next to the per process profiles when a listener closes, or on demand with:
+    python -m autocore.keywordprofile /tmp/keyword_profile
+    keyword_profile.json / keyword_profile.csv -> count, total, mean, p50, p95, p99 and max per keyword \n
+    keywords.collapsed -> self time in ms per call stack, for flamegraph.pl or speedscope
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import socket
+import tempfile
+import time
+
+from robot.api import logger
+
+from autocore.stats import percentile
+
+_PROFILE_PATTERN = "profile-*.json"
+_KEYWORD_TYPES = ("KEYWORD", "SETUP", "TEARDOWN")
+
+
+def merge(directory: str) -> dict:
+    """Merge the profiles of the directory and write the merged profile files. Returns the keyword statistics."""
+    durations: dict[str, list] = {}
+    stacks: dict[str, int] = {}
+    for path in glob.glob(os.path.join(directory, _PROFILE_PATTERN)):
+        with open(path, encoding="utf-8") as file:
+            profile = json.load(file)
+        for keyword, values in profile["durations"].items():
+            durations.setdefault(keyword, []).extend(values)
+        for stack, self_time in profile["stacks"].items():
+            stacks[stack] = stacks.get(stack, 0) + self_time
+
+    keywords = []
+    for keyword, values in durations.items():
+        values.sort()
+        keywords.append({"keyword": keyword, "count": len(values), "total_ms": sum(values),
+                         "mean_ms": round(sum(values) / len(values), 3), "p50_ms": percentile(values, 0.5),
+                         "p95_ms": percentile(values, 0.95), "p99_ms": percentile(values, 0.99),
+                         "max_ms": values[-1]})
+    keywords.sort(key=lambda item: item["total_ms"], reverse=True)
+
+    _write(os.path.join(directory, "keyword_profile.json"), lambda file: json.dump(keywords, file, indent=2))
+    _write(os.path.join(directory, "keyword_profile.csv"), lambda file: _write_csv(file, keywords))
+    _write(os.path.join(directory, "keywords.collapsed"),
+           lambda file: file.writelines(f"{stack} {self_time}\n" for stack, self_time in sorted(stacks.items())))
+    return {"keywords": keywords, "stacks": len(stacks)}
+
+
+def _write_csv(file, keywords: list):
+    writer = csv.DictWriter(file, fieldnames=["keyword", "count", "total_ms", "mean_ms", "p50_ms", "p95_ms", "p99_ms",
+                                              "max_ms"])
+    writer.writeheader()
+    writer.writerows(keywords)
+
+
+def _write(path: str, write):
+    # listeners of parallel workers can merge at the same time, replace the file atomically
+    fd, temp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", newline="", encoding="utf-8") as file:
+        write(file)
+    os.replace(temp, path)
+
+
+def _frame(name: str, attrs: dict) -> str:
+    # ; separates the frames of a collapsed stack and the last space separates the value
+    label = name if attrs["type"] in _KEYWORD_TYPES else attrs["type"]
+    return label.replace(";", ":").replace("\n", " ")
+
+
+class KeywordProfileListener:
+    """Robot listener that profiles keyword durations. Writes the profile of this process to ``directory`` and
+    merges all profiles of the directory when the run ends.
+    """
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, directory: str = "keyword_profile"):
+        self.__directory = os.path.abspath(directory)
+        self.__stack: list[list] = []
+        self.__durations: dict[str, list] = {}
+        self.__stacks: dict[str, int] = {}
+
+    def start_keyword(self, name, attrs):
+        # frame label and the time spent in child keywords
+        self.__stack.append([_frame(name, attrs), 0])
+
+    def end_keyword(self, name, attrs):
+        if len(self.__stack) == 0:
+            return
+        elapsed = attrs["elapsedtime"]
+        stack = ";".join(frame for frame, _ in self.__stack)
+        _, children = self.__stack.pop()
+
+        if attrs["type"] in _KEYWORD_TYPES:
+            self.__durations.setdefault(name, []).append(elapsed)
+        self.__stacks[stack] = self.__stacks.get(stack, 0) + max(elapsed - children, 0)
+        if len(self.__stack) > 0:
+            self.__stack[-1][1] += elapsed
+
+    def close(self):
+        if len(self.__durations) == 0:
+            return
+
+        os.makedirs(self.__directory, exist_ok=True)
+        name = f"profile-{socket.gethostname()}-{os.getpid()}-{time.time_ns()}.json"
+        # written atomically, a worker merging at the same time must not read a partial profile
+        _write(os.path.join(self.__directory, name),
+               lambda file: json.dump({"durations": self.__durations, "stacks": self.__stacks}, file))
+        merge(self.__directory)
+        logger.console(f"Keyword profile: {self.__directory}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge keyword profiles and show the slowest keywords.")
+    parser.add_argument("directory")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+    merged = merge(args.directory)
+    print(f"{'keyword':60} {'count':>7} {'total ms':>10} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for item in merged["keywords"][:args.top]:
+        print(f"{item['keyword'][:60]:60} {item['count']:>7} {item['total_ms']:>10} {item['p50_ms']:>8} "
+              f"{item['p95_ms']:>8} {item['p99_ms']:>8}")
@@ -0,0 +1,11 @@
+"""
+Statistics shared by the profilers, benchmarks and wait scheduler.
+"""
+import math
+
+
+def percentile(values: list, q: float) -> float:
+    """Nearest rank percentile of the sorted ``values``."""
+    if len(values) == 0:
+        return 0
+    return values[max(math.ceil(q * len(values)) - 1, 0)]
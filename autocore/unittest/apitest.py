@@ -0,0 +1,257 @@
+import io
+import json
+import threading
+import time
+import unittest
+
+from ddt import ddt, data
+from requests import Response
+
+from autocore.api import JsonStream, SessionPool
+from autocore.api.APIBatch import APIBatch
+from autocore.api.APIResponse import APIResponse
+from autocore.api.JsonPathCache import JsonPathCache
+
+BODY = {"data": [{"id": 1, "name": "one"}, {"id": 2, "name": "two"}], "meta": {"total": 2}}
+
+
+def _response(body) -> Response:
+    response = Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode()
+    return response
+
+
+class _Raw(io.BytesIO):
+    """Raw body that counts the bytes read."""
+
+    def __init__(self, body: bytes):
+        super().__init__(body)
+        self.size = len(body)
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def _streamed_response(body) -> Response:
+    response = Response()
+    response.status_code = 200
+    response.raw = _Raw(json.dumps(body).encode())
+    return response
+
+
+@ddt
+class JsonPathCacheTests(unittest.TestCase):
+
+    def test_compile_is_cached(self):
+        cache = JsonPathCache()
+        first = cache.compile("$.data[*].id")
+        second = cache.compile("$.data[*].id")
+        self.assertIs(first, second)
+        self.assertEqual({"hits": 1, "misses": 1, "size": 1, "max_size": 512, "hit_rate": 0.5}, cache.stats)
+
+    def test_least_recently_used_is_evicted(self):
+        cache = JsonPathCache(max_size=2)
+        first = cache.compile("$.a")
+        cache.compile("$.b")
+        cache.compile("$.a")
+        cache.compile("$.c")
+        self.assertIs(first, cache.compile("$.a"))
+        cache.compile("$.b")
+        self.assertEqual(4, cache.stats["misses"])
+
+    def test_precompile_is_not_a_lookup(self):
+        cache = JsonPathCache()
+        cache.precompile("$.a", "$.b")
+        cache.compile("$.a")
+        self.assertEqual(1, cache.stats["hits"])
+        self.assertEqual(0, cache.stats["misses"])
+
+    def test_resize_evicts(self):
+        cache = JsonPathCache()
+        cache.precompile("$.a", "$.b", "$.c")
+        cache.resize(1)
+        self.assertEqual(1, cache.stats["size"])
+
+
+@ddt
+class APIResponseTests(unittest.TestCase):
+
+    @data(("$.data[*].id", [1, 2]), ("$.meta.total", [2]), ("$.data[?(@.id == 2)].name", ["two"]), ("$.none", []))
+    def test_get_value_of(self, test_data):
+        json_path, exp = test_data
+        self.assertEqual(exp, APIResponse(_response(BODY)).get_value_of(json_path))
+
+    def test_value_of_should_be(self):
+        APIResponse(_response(BODY)).value_of_should_be("$.meta.total", 2)
+
+    def test_failed_value_of_should_be(self):
+        with self.assertRaises(AssertionError):
+            APIResponse(_response(BODY)).value_of_should_be("$.meta.total", 3)
+
+    def test_body_is_decoded_once(self):
+        response = _response(BODY)
+        api_response = APIResponse(response)
+        api_response.get_value_of("$.meta.total")
+        response._content = b"{}"
+        self.assertEqual([2], api_response.get_value_of("$.meta.total"))
+
+    def test_values_of_should_be(self):
+        APIResponse(_response(BODY)).values_of_should_be({"$.meta.total": 2, "$.data[0].name": "one"})
+
+    def test_failed_values_of_should_be_reports_all(self):
+        with self.assertRaises(AssertionError) as e:
+            APIResponse(_response(BODY)).values_of_should_be({"$.meta.total": 3, "$.data[0].name": "one",
+                                                             "$.data[1].name": "one"})
+        self.assertEqual(2, str(e.exception).count("Expecting  value of"))
+
+    def test_list_of_should_contain(self):
+        APIResponse(_response(BODY)).list_of_should_contain("$.data[*].name", "two")
+
+    def test_failed_list_of_should_contain(self):
+        with self.assertRaises(AssertionError):
+            APIResponse(_response(BODY)).list_of_should_contain("$.data[*].name", "three")
+
+
+@ddt
+class JsonStreamTests(unittest.TestCase):
+
+    @data(("$.data[*].id", "data.item.id"), ("$['meta'].total", "meta.total"), ('$["a b"][*]', "a b.item"), ("$", ""))
+    def test_to_prefix(self, test_data):
+        json_path, exp = test_data
+        self.assertEqual(exp, JsonStream.to_prefix(json_path))
+
+    @data("$.data[0]", "$..id", "$.data[?(@.id == 2)]", "data.id")
+    def test_unsupported_path(self, json_path):
+        with self.assertRaises(Exception):
+            JsonStream.to_prefix(json_path)
+
+    def test_stream_values_of_stops_at_limit(self):
+        response = _streamed_response({"data": [{"id": i} for i in range(20000)]})
+        self.assertEqual([0, 1, 2], APIResponse(response).stream_values_of("$.data[*].id", limit=3))
+        self.assertLess(response.raw.bytes_read, response.raw.size)
+        self.assertTrue(response.raw.closed)
+
+    def test_streamed_body_can_be_queried_again(self):
+        response = _streamed_response(BODY)
+        api_response = APIResponse(response)
+        self.assertEqual([1, 2], api_response.stream_values_of("$.data[*].id"))
+        self.assertFalse(response.raw.closed)
+        self.assertEqual([1], api_response.stream_values_of("$.data[*].id", limit=1))
+        self.assertEqual([2], api_response.get_value_of("$.meta.total"))
+
+    def test_partly_streamed_body_is_closed(self):
+        response = _streamed_response({"data": [{"id": i} for i in range(20000)]})
+        api_response = APIResponse(response)
+        self.assertEqual([0], api_response.stream_values_of("$.data[*].id", limit=1))
+        self.assertTrue(response.raw.closed)
+        self.assertEqual([0, 1], api_response.stream_values_of("$.data[*].id", limit=2))
+        with self.assertRaises(Exception):
+            api_response.stream_values_of("$.data[*].id")
+
+    def test_streamed_list_of_should_contain(self):
+        response = _streamed_response({"data": [{"name": f"item {i}"} for i in range(20000)]})
+        APIResponse(response).list_of_should_contain("$.data[*].name", "item 1", stream=True)
+        self.assertTrue(response.raw.closed)
+
+    def test_failed_streamed_list_of_should_contain(self):
+        with self.assertRaises(AssertionError):
+            APIResponse(_streamed_response(BODY)).list_of_should_contain("$.data[*].name", "three", stream=True)
+
+
+class _Request:
+    """Stands in for an APIRequest, sleeps ``seconds`` and returns its name or raises ``error``."""
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def __init__(self, name: str, seconds: float = 0.0, error: Exception = None):
+        self.name = name
+        self.seconds = seconds
+        self.error = error
+        self.done = False
+
+    def send_request(self):
+        with _Request.lock:
+            _Request.running += 1
+            _Request.max_running = max(_Request.max_running, _Request.running)
+        time.sleep(self.seconds)
+        with _Request.lock:
+            _Request.running -= 1
+        self.done = True
+        if self.error is not None:
+            raise self.error
+        return self.name
+
+
+class APIBatchTests(unittest.TestCase):
+
+    def setUp(self):
+        _Request.max_running = 0
+
+    def test_responses_are_in_the_order_added(self):
+        requests = [_Request(f"request {i}", seconds=0.01 * (5 - i)) for i in range(5)]
+        self.assertEqual([f"request {i}" for i in range(5)], APIBatch().add_all(requests).send())
+
+    def test_at_most_max_concurrency_at_a_time(self):
+        batch = APIBatch(max_concurrency=2).add_all([_Request(f"request {i}", seconds=0.02) for i in range(6)])
+        self.assertEqual(6, len(batch.send()))
+        self.assertEqual(2, _Request.max_running)
+
+    def test_first_error_is_raised_after_all_are_done(self):
+        requests = [_Request("ok", seconds=0.05), _Request("first", error=ValueError("first")),
+                    _Request("second", error=KeyError("second"))]
+        with self.assertRaises(ValueError):
+            APIBatch().add_all(requests).send()
+        self.assertTrue(all(request.done for request in requests))
+
+    def test_request_can_be_added_once(self):
+        request = _Request("request")
+        batch = APIBatch().add(request)
+        with self.assertRaises(Exception):
+            batch.add(request)
+        with self.assertRaises(Exception):
+            APIBatch().add_all([_Request("other"), request, request])
+
+    def test_invalid_max_concurrency(self):
+        with self.assertRaises(Exception):
+            APIBatch(max_concurrency=0)
+
+
+class SessionPoolTests(unittest.TestCase):
+
+    def tearDown(self):
+        SessionPool.close_pools()
+
+    def test_session_is_reused_per_base_url(self):
+        first = SessionPool.session("http://pool-a.test")
+        self.assertIs(first, SessionPool.session("http://pool-a.test"))
+        self.assertIsNot(first, SessionPool.session("http://pool-b.test"))
+
+    def test_configure_pool(self):
+        SessionPool.configure_pool("http://pool-configured.test", pool_size=3, keep_alive=False, max_retries=2)
+        self.addCleanup(SessionPool._configs.pop, "http://pool-configured.test")
+        adapter = SessionPool.session("http://pool-configured.test").get_adapter("http://pool-configured.test")
+        self.assertEqual(3, adapter._pool_maxsize)
+        self.assertEqual(2, adapter.max_retries.total)
+        self.assertEqual("close", SessionPool.session("http://pool-configured.test").headers["Connection"])
+        self.assertEqual("keep-alive", SessionPool.session("http://pool-default.test").headers["Connection"])
+
+    def test_close_pools(self):
+        first = SessionPool.session("http://pool-a.test")
+        SessionPool.close_pools()
+        self.assertIsNot(first, SessionPool.session("http://pool-a.test"))
+
+    def test_cookies_are_cleared_after_each_test(self):
+        pooled = SessionPool.session("http://pool-a.test")
+        pooled.cookies.set("session", "first test")
+        SessionPool.SessionPoolListener().end_test(None, None)
+        self.assertEqual(0, len(pooled.cookies))
+        self.assertIs(pooled, SessionPool.session("http://pool-a.test"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,9 @@
+import os
+import subprocess
+import sys
+import threading
 import unittest
+from unittest import mock
 
 from ddt import ddt, data
 
@@ -262,7 +267,7 @@ class AssertsTests(unittest.TestCase):
         self.assertEqual(exp_err_msg, str(e.exception))
 
     @data(([1, 2, 3, 4, 5, 6], [1, 3, 5, 6]), (["one", "two"], ["one", "two"]), ([1, 2, "three"], ["three"]),
-          ([1, 2, 3], [2, 2]))
+          ([1, 2, 3], [2, 2]), ([[1], {"a": 1}, 2.0], [{"a": 1}, [1], 2]))
     def test_passed_assert_that_list_contains_all(self, test_data):
         lst, contents = test_data
         exp_log = AssertsTests.robot_info_log_prefix + "Verified that: list {0} contains all of {1}.".format(lst,
@@ -271,7 +276,8 @@ class AssertsTests(unittest.TestCase):
             asserts.assert_that_list_contains_all(lst, contents)
         self.assertEqual([exp_log], log.output)
 
-    @data(([1, 2, 3, 4, 5], [1, 2, 4, 6, 7], [6, 7]))
+    @data(([1, 2, 3, 4, 5], [1, 2, 4, 6, 7], "6 at index 3, 7 at index 4"),
+          ([[1], {"a": 1}, 2], [{"a": 1}, [2], 2, 3], "[2] at index 1, 3 at index 3"))
     def test_failed_assert_that_list_contains_all_without_msg(self, test_data):
         lst, contents, missing_items = test_data
         exp_err_msg = "List {0} does not contain all of {1}. See missing item/s: {2}.".format(lst, contents,
@@ -340,16 +346,13 @@ class AssertsTests(unittest.TestCase):
         lst = [1, 24, 65]
 
         err_msgs = [
-            f"{str1} is not equal to {str2}.",
-            "The expression passed as 'expr' is not True.",
-            "The expression passed as 'expr' is not False.",
-            custom_err_msg,
-            f"{str1} does not end with {end}.",
-            f"{str1} does not contain {content}.",
-            custom_err_msg,
-            custom_err_msg,
-            custom_err_msg,
-            custom_err_msg
+            "10 soft assertion/s failed:",
+            f"1) {str1} is not equal to {str2}.",
+            "2) The expression passed as 'expr' is not True.",
+            "3) The expression passed as 'expr' is not False.",
+            f"4) {custom_err_msg} (x5)",
+            f"5) {str1} does not end with {end}.",
+            f"6) {str1} does not contain {content}."
         ]
         exp_err_msg = "\n" + "\n".join(err_msgs)
 
@@ -380,6 +383,48 @@ class AssertsTests(unittest.TestCase):
             sa.handle(func=asserts.assert_equal, actual=2, exp=5, msg="custom message 2")
             sa.assert_all()
 
+    def test_failures_are_recorded(self):
+        def text_should_be(locator, exp):
+            asserts.assert_equal("x" * 200, exp)
+
+        sa = SoftAssert()
+        sa.handle(text_should_be, exp="y" * 200, locator="//h1")
+        failure = sa.failures[0]
+        self.assertEqual("text_should_be", failure.assertion)
+        self.assertEqual("//h1", failure.locator)
+        self.assertLess(len(failure.args), 200)
+        self.assertIn("locator='//h1'", failure.args)
+
+    def test_failures_are_bounded(self):
+        sa = SoftAssert(max_failures=2)
+        for i in range(5):
+            sa.assert_equal(i, -1)
+        self.assertEqual(2, len(sa.failures))
+        self.assertEqual(5, sa.failed_count)
+        with self.assertRaises(AssertionError) as e:
+            sa.assert_all()
+        self.assertTrue(str(e.exception).endswith("... and 3 more failure/s over the limit of 2."))
+
+    def test_handle_only_catches_assertion_errors(self):
+        sa = SoftAssert()
+        with self.assertRaises(ValueError):
+            sa.handle(int, "not a number")
+        SoftAssert(catch=(Exception,)).handle(int, "not a number")
+
+    def test_shared_between_threads(self):
+        sa = SoftAssert(max_failures=1000)
+
+        def worker():
+            for i in range(100):
+                sa.assert_true(False)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(800, sa.failed_count)
+
     def test_asserts_handle_pass(self):
         sa = SoftAssert()
         sa.handle(asserts.assert_equal, 2, 2)
@@ -393,5 +438,152 @@ class AssertsTests(unittest.TestCase):
         assert_that_date_format_is(date=exp_date, exp_format=exp_format)
 
 
+@ddt
+class CollectionAssertsTests(unittest.TestCase):
+    robot_info_log_prefix = "INFO:RobotFramework:"
+
+    @data(([], {}), ([1], {}), ([1, 2, 2, 3], {}), ([3, 2, 2], {"reverse": True}), ([1, 2, 3], {"strict": True}),
+          (["$9.99", "$15.99"], {"key": lambda p: float(p.replace("$", ""))}))
+    def test_passed_assert_that_list_is_sorted(self, test_data):
+        lst, kwargs = test_data
+        asserts.assert_that_list_is_sorted(lst, **kwargs)
+
+    @data(([1, 3, 2], {}, "List [1, 3, 2] is not sorted in ascending order. Item 2 at index 2 comes after 3."),
+          ([1, 2, 2], {"strict": True},
+           "List [1, 2, 2] is not sorted in strictly ascending order. Item 2 at index 2 comes after 2."),
+          (["$15.99", "$9.99"], {"key": lambda p: float(p.replace("$", ""))},
+           "List ['$15.99', '$9.99'] is not sorted in ascending order. Item $9.99 at index 1 comes after $15.99."),
+          ([1, 2], {"reverse": True}, "List [1, 2] is not sorted in descending order. Item 2 at index 1 comes after 1."))
+    def test_failed_assert_that_list_is_sorted(self, test_data):
+        lst, kwargs, exp_err_msg = test_data
+        with self.assertRaises(AssertionError) as e:
+            asserts.assert_that_list_is_sorted(lst, **kwargs)
+        self.assertEqual(exp_err_msg, str(e.exception))
+
+    @data([1, 2, 2, 5], [5, 5, 1], [], [7])
+    def test_passed_assert_that_list_is_monotonic(self, lst):
+        with self.assertLogs(level="INFO") as log:
+            asserts.assert_that_list_is_monotonic(lst)
+        self.assertEqual([self.robot_info_log_prefix + f"Verified that: list {lst} is monotonic."], log.output)
+
+    @data(([1, 3, 2], 2), ([5, 5, 1, 2], 3), ([1, 1, 2, 1], 3))
+    def test_failed_assert_that_list_is_monotonic(self, test_data):
+        lst, index = test_data
+        with self.assertRaises(AssertionError) as e:
+            asserts.assert_that_list_is_monotonic(lst)
+        self.assertIn(f"at index {index} breaks the order", str(e.exception))
+
+    def test_strict_monotonic(self):
+        with self.assertRaises(AssertionError):
+            asserts.assert_that_list_is_monotonic([5, 5, 1], strict=True)
+
+    def test_all_within_tolerance(self):
+        asserts.assert_that_all_within_tolerance([1.0, 2.04], [1, 2], 0.05)
+        asserts.assert_that_all_within_tolerance([100, 201], [100, 200], 0.01, relative=True)
+        with self.assertRaises(AssertionError) as e:
+            asserts.assert_that_all_within_tolerance([1.0, 2.5, 9], [1, 2, 3], 0.1)
+        self.assertIn("Item 2.5 at index 1 differs from 2 by 0.5.", str(e.exception))
+
+    def test_lists_are_equal(self):
+        asserts.assert_that_lists_are_equal(["a", "b"], ["a", "b"])
+        with self.assertRaises(AssertionError) as e:
+            asserts.assert_that_lists_are_equal([1, 2, 3], [1, 2, 4])
+        self.assertEqual("List [1, 2, 3] is not equal to [1, 2, 4]. First difference at index 2: 3 != 4.",
+                         str(e.exception))
+        with self.assertRaises(AssertionError) as e:
+            asserts.assert_that_lists_are_equal([1, 2], [1, 2, 3])
+        self.assertEqual("List [1, 2] has 2 item/s but expecting 3 item/s like [1, 2, 3].", str(e.exception))
+
+    def test_soft_collection_asserts(self):
+        sa = SoftAssert()
+        sa.assert_that_list_is_sorted([2, 1])
+        sa.assert_that_list_is_monotonic([1, 3, 2])
+        sa.assert_that_all_within_tolerance([1], [2], 0.5)
+        sa.assert_that_lists_are_equal([1], [1], "not reported")
+        with self.assertRaises(AssertionError) as e:
+            sa.assert_all()
+        self.assertTrue(str(e.exception).startswith("\n3 soft assertion/s failed:\n1) List [2, 1] is not sorted"))
+
+
+class AssertionLogModeTests(unittest.TestCase):
+    robot_info_log_prefix = "INFO:RobotFramework:"
+
+    def tearDown(self):
+        asserts.set_assertion_log_mode(asserts.LOG_FULL)
+
+    def test_off_does_not_log_passed_asserts(self):
+        asserts.set_assertion_log_mode(asserts.LOG_OFF)
+        with self.assertNoLogs(level='INFO'):
+            asserts.assert_equal(1, 1)
+            asserts.assert_that_list_has_item([1, 2], 2)
+
+    def test_off_still_fails(self):
+        asserts.set_assertion_log_mode(asserts.LOG_OFF)
+        with self.assertRaises(AssertionError) as e:
+            asserts.assert_equal(1, 2)
+        self.assertEqual("1 is not equal to 2.", str(e.exception))
+
+    def test_buffered_logs_once_on_flush(self):
+        asserts.set_assertion_log_mode(asserts.LOG_BUFFERED)
+        with self.assertNoLogs(level='INFO'):
+            asserts.assert_equal(1, 1)
+            asserts.assert_true(True, s_msg="custom success")
+        with self.assertLogs(level='INFO') as log:
+            asserts.flush_assertion_logs()
+        exp_log = self.robot_info_log_prefix + "Verified that: 1 is equal to 1.\ncustom success"
+        self.assertEqual([exp_log], log.output)
+
+    def test_buffered_flush_is_not_written_to_the_console(self):
+        asserts.set_assertion_log_mode(asserts.LOG_BUFFERED)
+        asserts.assert_equal(1, 1)
+        with mock.patch("autocore.asserts.logger") as logger:
+            asserts.flush_assertion_logs()
+        logger.info.assert_called_once_with("Verified that: 1 is equal to 1.")
+
+    def test_buffered_is_bounded(self):
+        asserts.set_assertion_log_mode(asserts.LOG_BUFFERED)
+        for i in range(asserts._BUFFER_LIMIT + 5):
+            asserts.assert_equal(i, i)
+        with self.assertLogs(level='INFO') as log:
+            asserts.flush_assertion_logs()
+        self.assertTrue(log.output[0].endswith("... and 5 more passed assertion/s."))
+
+    def test_leaving_buffered_mode_flushes(self):
+        asserts.set_assertion_log_mode(asserts.LOG_BUFFERED)
+        asserts.assert_equal(1, 1)
+        with self.assertLogs(level='INFO'):
+            self.assertEqual(asserts.LOG_BUFFERED, asserts.set_assertion_log_mode(asserts.LOG_FULL))
+
+    def test_invalid_mode(self):
+        with self.assertRaises(Exception):
+            asserts.set_assertion_log_mode("verbose")
+
+    def test_buffered_values_are_taken_when_passed(self):
+        asserts.set_assertion_log_mode(asserts.LOG_BUFFERED)
+        items = [1, 2]
+        asserts.assert_that_list_has_item(items, 2)
+        items.append(3)
+        asserts.assert_equal(list(range(100)), list(range(100)))
+        with self.assertLogs(level='INFO') as log:
+            asserts.flush_assertion_logs()
+        lines = log.output[0][len(self.robot_info_log_prefix):].splitlines()
+        self.assertEqual("Verified that: list [1, 2] contains 2.", lines[0])
+        self.assertTrue(lines[1].startswith("Verified that: [0, 1, 2,"))
+        self.assertIn("...]", lines[1])
+
+    def test_invalid_mode_from_environment_fails_the_import(self):
+        env = dict(os.environ, AUTOCORE_ASSERTION_LOG="verbose")
+        result = subprocess.run([sys.executable, "-c", "import autocore.asserts"], env=env, capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+        self.assertNotEqual(0, result.returncode)
+        self.assertIn("Invalid assertion log mode: verbose", result.stderr)
+
+        env["AUTOCORE_ASSERTION_LOG"] = "Buffered"
+        result = subprocess.run([sys.executable, "-c", "from autocore import asserts; print(asserts._log_mode)"],
+                                env=env, capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+        self.assertEqual("buffered", result.stdout.strip())
+
+
 if __name__ == '__main__':
     unittest.main()
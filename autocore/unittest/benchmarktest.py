@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+import urllib.error
+import urllib.request
+
+from autocore import asserts
+from autocore.benchmark import harness, microbench
+from autocore.benchmark.fixtureapp import FixtureApp
+
+
+class FixtureAppTests(unittest.TestCase):
+
+    def test_serves_login_and_inventory_pages(self):
+        with FixtureApp(items=3) as app:
+            with urllib.request.urlopen(app.url) as response:
+                self.assertIn('id="login-button"', response.read().decode())
+            with urllib.request.urlopen(f"{app.url}inventory.html?delay=10") as response:
+                self.assertEqual(3, response.read().decode().count('class="inventory_item_name"'))
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"{app.url}missing.html")
+
+
+class HarnessTests(unittest.TestCase):
+
+    def test_measure(self):
+        calls = []
+        stats = harness.measure(lambda: calls.append(1), rounds=20, warmup=3)
+        self.assertEqual(23, len(calls))
+        self.assertEqual(20, stats["rounds"])
+        self.assertLessEqual(stats["min_ms"], stats["p50_ms"])
+        self.assertLessEqual(stats["p95_ms"], stats["max_ms"])
+
+    def test_record_returns_entry_of_another_commit(self):
+        path = os.path.join(tempfile.mkdtemp(), "history", "bench.jsonl")
+        self.assertIsNone(harness.record(path, {"noop": {"p50_ms": 1.0}}))
+        self.assertIsNone(harness.record(path, {"noop": {"p50_ms": 1.0}}))
+
+        with open(path, "a") as file:
+            file.write('{"commit": "0000000", "results": {"noop": {"p50_ms": 2.0}}}\n')
+        previous = harness.record(path, {"noop": {"p50_ms": 1.0}})
+        self.assertEqual("0000000", previous["commit"])
+
+        results = {"noop": {"ops_per_sec": 1000, "p50_ms": 1.0, "p95_ms": 1.0, "p99_ms": 1.0}}
+        self.assertIn("-50.0%", harness.report(results, previous))
+
+    def test_check_against_baseline(self):
+        baseline = {"fast": {"p50_ms": 1.0}, "slow": {"p50_ms": 1.0}, "noise": {"p50_ms": 0.0001}}
+        results = {"fast": {"p50_ms": 1.4}, "slow": {"p50_ms": 2.5}, "noise": {"p50_ms": 0.003}, "new": {"p50_ms": 9}}
+        regressions = harness.check(results, baseline, threshold=0.5)
+        self.assertEqual(1, len(regressions))
+        self.assertTrue(regressions[0].startswith("slow: p50 2.5 ms, baseline 1.0 ms (+150%"))
+
+        self.assertEqual([], harness.check(results, baseline, threshold=0.5, remeasure=lambda name: {"p50_ms": 1.1}))
+
+    def test_save_baseline_keeps_other_benchmarks(self):
+        path = os.path.join(tempfile.mkdtemp(), "baseline.json")
+        self.assertEqual({}, harness.load_baseline(path))
+        harness.save_baseline(path, {"a": {"p50_ms": 1.0}, "b": {"p50_ms": 1.0}})
+        harness.save_baseline(path, {"b": {"p50_ms": 2.0}})
+        self.assertEqual({"a": {"p50_ms": 1.0}, "b": {"p50_ms": 2.0}}, harness.load_baseline(path))
+
+
+class MicroBenchTests(unittest.TestCase):
+
+    def test_all_groups_run_and_check(self):
+        directory = tempfile.mkdtemp()
+        args = ["--sizes", "10", "--rounds", "2", "--warmup", "0", "--history", os.path.join(directory, "h.jsonl"),
+                "--baseline", os.path.join(directory, "baseline.json")]
+        self.assertEqual(0, microbench.main(args + ["--save-baseline", "--check", "--threshold", "1000"]))
+        baseline = harness.load_baseline(os.path.join(directory, "baseline.json"))
+        self.assertEqual({"asserts", "soft_assert", "api", "db"}, {name.split(".")[0] for name in baseline})
+        self.assertEqual(asserts.LOG_FULL, asserts.set_assertion_log_mode(asserts.LOG_FULL))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+import os
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from autocore.web.browserbroker import BROKER_AUTHKEY_ENV, BrowserBroker, BrowserBrokerClient
+from autocore.web.browserpool import BrowserPool
+
+
+class FakeDriver:
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.command_executor = SimpleNamespace(_url="http://127.0.0.1:9515")
+        self.caps = {"browserName": "chrome"}
+        self.quit = lambda: None
+
+
+class PooledDriver:
+    """Driver with the calls BrowserPool makes to health check, reset and quit it."""
+    launched = 0
+
+    def __init__(self):
+        PooledDriver.launched += 1
+        self.session_id = f"pooled-{PooledDriver.launched}"
+        self.current_url = "about:blank"
+        self.window_handles = ["main"]
+        self.switch_to = SimpleNamespace(window=lambda handle: None)
+        self.quits = 0
+
+    def execute_script(self, script, *args):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url: str):
+        self.current_url = url
+
+    def quit(self):
+        self.quits += 1
+
+
+class FakePool:
+    """Leases new fake drivers, ``gate`` blocks the leases until set."""
+
+    def __init__(self):
+        self.released: list[str] = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.__count = 0
+
+    def lease(self) -> FakeDriver:
+        self.gate.wait()
+        self.__count += 1
+        driver = FakeDriver(f"session-{self.__count}")
+        driver.quit = lambda: self.released.append(driver.session_id)
+        return driver
+
+    def close(self):
+        pass
+
+
+def _wait_for(condition, timeout: float = 2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class BrowserBrokerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = FakePool()
+        self.broker = BrowserBroker(size=1, authkey="test", pool=self.pool)
+        threading.Thread(target=self.broker.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.pool.gate.set()
+        self.broker.close()
+
+    def client(self, lease_timeout: float = 5) -> BrowserBrokerClient:
+        client = BrowserBrokerClient(address=self.broker.address, authkey="test", lease_timeout=lease_timeout)
+        self.addCleanup(client.close)
+        return client
+
+    def test_lease_and_release(self):
+        client = self.client()
+        driver = client.lease()
+        self.assertEqual("session-1", driver.session_id)
+        self.assertEqual({"browserName": "chrome"}, driver.caps)
+
+        driver.quit()
+        self.assertEqual(["session-1"], self.pool.released)
+        self.assertEqual("session-2", client.lease().session_id)
+
+    def test_lease_waits_for_release(self):
+        first = self.client().lease()
+        with self.assertRaises(Exception):
+            self.client(lease_timeout=0.1).lease()
+
+        leased = []
+        thread = threading.Thread(target=lambda: leased.append(self.client().lease()))
+        thread.start()
+        first.quit()
+        thread.join(timeout=2)
+        self.assertEqual(["session-2"], [driver.session_id for driver in leased])
+
+    def test_disconnect_releases_leased_browsers(self):
+        client = self.client()
+        client.lease()
+        client.close()
+        self.assertTrue(_wait_for(lambda: self.pool.released == ["session-1"]))
+
+    def test_release_is_not_blocked_by_a_lease_in_progress(self):
+        broker = BrowserBroker(size=2, authkey="test", pool=self.pool)
+        threading.Thread(target=broker.serve_forever, daemon=True).start()
+        self.addCleanup(broker.close)
+        first = BrowserBrokerClient(address=broker.address, authkey="test")
+        second = BrowserBrokerClient(address=broker.address, authkey="test")
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+        driver = first.lease()
+
+        self.pool.gate.clear()
+        threading.Thread(target=second.lease, daemon=True).start()
+        time.sleep(0.05)
+        released = threading.Thread(target=driver.quit)
+        released.start()
+        released.join(timeout=1)
+        self.assertFalse(released.is_alive())
+        self.assertEqual(["session-1"], self.pool.released)
+
+    def test_wrong_authkey_is_refused(self):
+        client = BrowserBrokerClient(address=self.broker.address, authkey="wrong")
+        with self.assertRaises(Exception):
+            client.lease()
+
+    @mock.patch.dict(os.environ, {}, clear=True)
+    def test_authkey_is_required(self):
+        with self.assertRaises(Exception):
+            BrowserBrokerClient(address=self.broker.address)
+        with self.assertRaises(Exception):
+            BrowserBroker(host="0.0.0.0", pool=self.pool)
+
+        broker = BrowserBroker(pool=self.pool)
+        self.addCleanup(broker.close)
+        self.assertEqual(32, len(broker.authkey))
+
+    @mock.patch.dict(os.environ, {BROKER_AUTHKEY_ENV: "from-env"})
+    def test_authkey_from_environment(self):
+        broker = BrowserBroker(pool=self.pool)
+        self.addCleanup(broker.close)
+        self.assertEqual("from-env", broker.authkey)
+
+
+class BrowserPoolTests(unittest.TestCase):
+
+    def pool(self, **kwargs) -> BrowserPool:
+        pool = BrowserPool(driver_factory=PooledDriver, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_released_driver_is_reused(self):
+        pool = self.pool(size=1)
+        driver = pool.lease()
+        driver.quit()
+        self.assertEqual(0, driver.quits)
+        self.assertEqual(1, pool.idle)
+        self.assertIs(driver, pool.lease())
+
+    def test_driver_is_replaced_after_max_reuse(self):
+        pool = self.pool(size=1, max_reuse=2)
+        first = pool.lease()
+        first.quit()
+        self.assertIs(first, pool.lease())
+        first.quit()
+        self.assertEqual(1, first.quits)
+
+        second = pool.lease()
+        self.assertIsNot(first, second)
+        self.assertEqual(0, second.quits)
+
+    def test_drivers_over_size_are_quit_on_release(self):
+        pool = self.pool(size=1)
+        first, second = pool.lease(), pool.lease()
+        self.assertIsNot(first, second)
+        first.quit()
+        second.quit()
+        self.assertEqual(1, first.quits + second.quits)
+        self.assertEqual(1, pool.idle)
+
+    def test_release_is_idempotent(self):
+        pool = self.pool(size=2)
+        driver = pool.lease()
+        driver.quit()
+        driver.quit()
+        pool.release(driver)
+        self.assertEqual(2, pool.idle)
+        self.assertIsNot(pool.lease(), pool.lease())
+
+    def test_close_quits_idle_drivers(self):
+        pool = self.pool(size=1)
+        driver = pool.lease()
+        driver.quit()
+        pool.close()
+        self.assertEqual(1, driver.quits)
+        with self.assertRaises(Exception):
+            pool.lease()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,463 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from autocore.db.Backend import SqliteBackend
+from autocore.db.ConnectionPool import ConnectionPool
+from autocore.db.Database import Database
+from autocore.db.ResultCache import ResultCache
+from autocore.db.StatementCache import StatementCache
+
+
+class _Connection:
+
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+
+    def ping(self):
+        if not self.alive:
+            raise Exception("Lost connection.")
+
+    def close(self):
+        self.closed = True
+
+
+class _Cursor:
+
+    def __init__(self, rows: int, conn=None):
+        self.rows = rows
+        self.conn = conn
+        self.executed = None
+        self.params = []
+        self.position = 0
+        self.fetches = 0
+        self.batches = []
+        self.closed = False
+
+    def execute(self, operation: str, params=None):
+        self.params.append(params)
+        # like the mysql connector a prepared cursor prepares again when given another SQL object
+        if self.conn is not None and operation is not self.executed:
+            self.executed = operation
+            self.conn.prepares += 1
+
+    def executemany(self, query: str, values: list):
+        self.batches.append((query, values))
+
+    def fetchmany(self, size: int):
+        self.fetches += 1
+        batch = [{"id": i} for i in range(self.position, min(self.position + size, self.rows))]
+        self.position += len(batch)
+        return batch
+
+    def fetchall(self):
+        self.position = 0
+        return self.fetchmany(self.rows)
+
+    def close(self):
+        self.closed = True
+
+
+class _MySqlConnection(_Connection):
+
+    def __init__(self, rows: int):
+        super().__init__()
+        self.cursors = []
+        self.rows = rows
+        self.transactions = []
+        self.prepares = 0
+
+    def start_transaction(self):
+        self.transactions.append("start")
+
+    def commit(self):
+        self.transactions.append("commit")
+
+    def rollback(self):
+        self.transactions.append("rollback")
+
+    def cursor(self, **kwargs):
+        self.cursors.append(_Cursor(self.rows, self if kwargs.get("prepared") else None))
+        return self.cursors[-1]
+
+    def ping(self, reconnect: bool = False):
+        super().ping()
+
+
+def _pool(**kwargs) -> tuple[ConnectionPool, list]:
+    created = []
+
+    def connect():
+        created.append(_Connection())
+        return created[-1]
+
+    return ConnectionPool(connect=connect, ping=lambda conn: conn.ping(), **kwargs), created
+
+
+class ConnectionPoolTests(unittest.TestCase):
+
+    def test_connection_is_reused(self):
+        pool, created = _pool()
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(1, len(created))
+
+    def test_min_size_is_opened_up_front(self):
+        pool, created = _pool(min_size=2)
+        self.assertEqual(2, len(created))
+        self.assertEqual({"open": 2, "idle": 2, "leased": 0, "max_size": 5}, pool.stats)
+
+    def test_dropped_connection_is_replaced(self):
+        pool, created = _pool()
+        conn = pool.lease()
+        pool.release(conn)
+        conn.alive = False
+        self.assertIsNot(conn, pool.lease())
+        self.assertTrue(conn.closed)
+        self.assertEqual(1, pool.stats["open"])
+
+    def test_lease_waits_for_a_return(self):
+        pool, created = _pool(max_size=1)
+        conn = pool.lease()
+        threading.Timer(0.1, pool.release, args=(conn,)).start()
+        self.assertIs(conn, pool.lease())
+
+    def test_lease_times_out(self):
+        pool, created = _pool(max_size=1, lease_timeout=0.1)
+        pool.lease()
+        with self.assertRaises(Exception):
+            pool.lease()
+
+    def test_idle_connection_expires(self):
+        pool, created = _pool(idle_timeout=0.05)
+        pool.release(pool.lease())
+        time.sleep(0.1)
+        self.assertIsNot(created[0], pool.lease())
+        self.assertTrue(created[0].closed)
+
+    def test_dropped_connection_is_discarded_on_error(self):
+        pool, created = _pool()
+        with self.assertRaises(ValueError):
+            with pool.connection() as conn:
+                conn.alive = False
+                raise ValueError()
+        self.assertTrue(conn.closed)
+        self.assertEqual(0, pool.stats["open"])
+
+    def test_concurrent_leases_stay_within_max_size(self):
+        pool, created = _pool(max_size=3)
+
+        def query():
+            for _ in range(20):
+                with pool.connection():
+                    time.sleep(0.001)
+
+        threads = [threading.Thread(target=query) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(len(created), 3)
+        self.assertEqual(0, pool.stats["leased"])
+
+
+class StatementCacheTests(unittest.TestCase):
+
+    def test_cursor_is_cached_per_connection(self):
+        cache = StatementCache(prepare=lambda conn: conn.cursor(prepared=True))
+        first, second = _MySqlConnection(rows=1), _MySqlConnection(rows=1)
+        cursor, sql = cache.cursor(first, "SELECT 1")
+        self.assertEqual((cursor, sql), cache.cursor(first, "".join(["SELECT ", "1"])))
+        self.assertIs(sql, cache.cursor(first, "".join(["SELECT ", "1"]))[1])
+        self.assertIsNot(cursor, cache.cursor(second, "SELECT 1")[0])
+        self.assertEqual({"hits": 2, "misses": 2, "connections": 2, "size": 2, "hit_rate": 0.5}, cache.stats)
+
+    def test_least_recently_used_is_closed(self):
+        cache = StatementCache(prepare=lambda conn: conn.cursor(prepared=True), max_size=1)
+        conn = _MySqlConnection(rows=1)
+        cursor, _ = cache.cursor(conn, "SELECT 1")
+        cache.cursor(conn, "SELECT 2")
+        self.assertTrue(cursor.closed)
+        self.assertEqual(1, cache.stats["size"])
+
+    def test_invalidate_closes_cursors(self):
+        cache = StatementCache(prepare=lambda conn: conn.cursor(prepared=True))
+        conn = _MySqlConnection(rows=1)
+        cursor, _ = cache.cursor(conn, "SELECT 1")
+        cache.invalidate(conn)
+        self.assertTrue(cursor.closed)
+        self.assertEqual(0, cache.stats["connections"])
+
+
+class ResultCacheTests(unittest.TestCase):
+
+    def test_key_is_normalized(self):
+        self.assertEqual(ResultCache.key("SELECT *\n  FROM t;", (1,)), ResultCache.key(" SELECT * FROM t", (1,)))
+        self.assertNotEqual(ResultCache.key("SELECT * FROM t", (1,)), ResultCache.key("SELECT * FROM t", (2,)))
+
+    def test_written_table(self):
+        self.assertEqual("users", ResultCache.written_table("INSERT INTO users (id) VALUES (1)"))
+        self.assertEqual("db.users", ResultCache.written_table("update `db.users` set name = 'a'"))
+        self.assertEqual("users", ResultCache.written_table("DELETE FROM users"))
+        self.assertEqual("t", ResultCache.written_table("INSERT INTO `main`.`t` (id) VALUES (1)"))
+        self.assertEqual("t", ResultCache.written_table('INSERT IGNORE INTO "main" . "t" VALUES (1)'))
+        self.assertEqual("t", ResultCache.written_table("DELETE LOW_PRIORITY FROM main.t WHERE a = 'x, y'"))
+        self.assertIsNone(ResultCache.written_table("DROP TABLE users"))
+        self.assertIsNone(ResultCache.written_table("UPDATE a JOIN b ON a.id = b.id SET a.x = 1"))
+        self.assertIsNone(ResultCache.written_table("UPDATE a, b SET a.x = b.x"))
+        self.assertIsNone(ResultCache.written_table("DELETE FROM a USING a JOIN b"))
+        self.assertIsNone(ResultCache.written_table("WITH x AS (SELECT 1) DELETE FROM t"))
+
+    def test_is_read(self):
+        self.assertTrue(ResultCache.is_read("SELECT * FROM t WHERE note = 'for update'"))
+        self.assertTrue(ResultCache.is_read("(SELECT 1)"))
+        self.assertTrue(ResultCache.is_read("WITH x AS (SELECT id FROM t) SELECT * FROM x WHERE id IN (SELECT 1)"))
+        self.assertTrue(ResultCache.is_read("WITH RECURSIVE n AS (SELECT 1 AS i UNION SELECT i + 1 FROM n LIMIT 3) "
+                                            "SELECT i FROM n"))
+        self.assertFalse(ResultCache.is_read("WITH x AS (SELECT 1) DELETE FROM t WHERE id IN (SELECT * FROM x)"))
+        self.assertFalse(ResultCache.is_read("WITH x AS (SELECT 1) UPDATE t SET a = 1"))
+        self.assertFalse(ResultCache.is_read("SELECT * FROM t WHERE id = 1 FOR UPDATE"))
+        self.assertFalse(ResultCache.is_read("SELECT * FROM t FOR SHARE"))
+        self.assertFalse(ResultCache.is_read("SELECT id INTO @id FROM t"))
+        self.assertFalse(ResultCache.is_read("SELECT * INTO OUTFILE '/tmp/t' FROM t"))
+        self.assertFalse(ResultCache.is_read("DELETE FROM t"))
+
+    def test_result_expires(self):
+        cache = ResultCache(ttl=0.05)
+        cache.put(("q", "None"), [{"id": 1}])
+        self.assertEqual([{"id": 1}], cache.get(("q", "None")))
+        time.sleep(0.1)
+        self.assertIsNone(cache.get(("q", "None")))
+        self.assertEqual(0, cache.stats["bytes"])
+
+    def test_least_recently_used_is_evicted_above_max_bytes(self):
+        rows = [{"id": i} for i in range(10)]
+        cache = ResultCache()
+        cache.put(("a", "None"), rows)
+        cache = ResultCache(max_bytes=cache.stats["bytes"] * 2)
+        cache.put(("a", "None"), rows)
+        cache.put(("b", "None"), rows)
+        cache.get(("a", "None"))
+        cache.put(("c", "None"), rows)
+        self.assertIsNotNone(cache.get(("a", "None")))
+        self.assertIsNone(cache.get(("b", "None")))
+
+    def test_invalidate_table(self):
+        cache = ResultCache()
+        cache.put(ResultCache.key("SELECT * FROM currency"), [])
+        cache.put(ResultCache.key("SELECT * FROM currency_rate"), [])
+        cache.invalidate("currency")
+        self.assertIsNone(cache.get(ResultCache.key("SELECT * FROM currency")))
+        self.assertIsNotNone(cache.get(ResultCache.key("SELECT * FROM currency_rate")))
+
+
+class DatabaseTests(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = _MySqlConnection(rows=25)
+        patcher = mock.patch("mysql.connector.connect", return_value=self.conn)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.db = Database(host="localhost", user="user", password="password", port="3306", database="db")
+
+    def test_stream_fetches_in_batches(self):
+        rows = list(self.db.stream("SELECT id FROM t", batch_size=10))
+        self.assertEqual(list(range(25)), [row["id"] for row in rows])
+        self.assertEqual(4, self.conn.cursors[0].fetches)
+        self.assertEqual(1, self.db.pool.stats["idle"])
+
+    def test_abandoned_stream_discards_connection(self):
+        stream = self.db.stream("SELECT id FROM t", batch_size=10)
+        next(stream)
+        stream.close()
+        self.assertTrue(self.conn.closed)
+        self.assertEqual(0, self.db.pool.stats["open"])
+
+    def test_execute_logs_a_preview(self):
+        with mock.patch("autocore.db.Database.logger") as logger:
+            self.assertEqual(25, len(self.db.execute("SELECT id FROM t")))
+        logged = logger.info.call_args_list[-1][0][0]
+        self.assertTrue(logged.startswith("Query Result: 25 row/s, showing the first 10."))
+
+    def test_bulk_insert_in_batches(self):
+        stats = self.db.bulk_insert("users", ({"id": i, "name": f"user{i}"} for i in range(25)), batch_size=10)
+        query, values = self.conn.cursors[0].batches[0]
+        self.assertEqual("INSERT INTO users (id, name) VALUES (%s, %s)", query)
+        self.assertEqual((0, "user0"), values[0])
+        self.assertEqual([10, 10, 5], [len(batch) for _, batch in self.conn.cursors[0].batches])
+        self.assertEqual(["start", "commit"], self.conn.transactions)
+        self.assertEqual(25, stats["rows"])
+        self.assertEqual(3, stats["batches"])
+
+    def test_bulk_insert_from_csv(self):
+        path = os.path.join(tempfile.mkdtemp(), "users.csv")
+        with open(path, "w", newline="") as file:
+            file.write("id,name\n1,one\n2,two\n")
+        self.db.bulk_insert("users", path)
+        self.assertEqual([("1", "one"), ("2", "two")], self.conn.cursors[0].batches[0][1])
+
+    def test_bulk_insert_rolls_back(self):
+        with self.assertRaises(Exception):
+            self.db.bulk_insert("users", [{"id": 1, "name": "one"}, {"id": 2}], batch_size=1)
+        self.assertEqual(["start", "rollback"], self.conn.transactions)
+
+    def test_bulk_insert_rejects_invalid_table(self):
+        with self.assertRaises(Exception):
+            self.db.bulk_insert("users; DROP TABLE users", [{"id": 1}])
+
+    def test_prepared_statements_are_reused(self):
+        db = Database(host="localhost", user="user", password="password", port="3306", database="db", prepared=True)
+        db.execute("SELECT id FROM t WHERE id > %s", (1,))
+        db.execute("SELECT id FROM t WHERE id > %s", (2,))
+        self.assertEqual(1, len(self.conn.cursors))
+        self.assertEqual(1, db.statement_cache.stats["hits"])
+
+    def test_equal_queries_are_prepared_once(self):
+        db = Database(host="localhost", user="user", password="password", port="3306", database="db", prepared=True)
+        for i in range(3):
+            # equal text in new string objects, like robot arguments
+            db.execute("".join(["SELECT id FROM t ", "WHERE id > %s"]), (i,))
+        for i in range(2):
+            db.execute("SELECT id FROM t WHERE id > %(id)s AND id < %(id)s + %(n)s", {"n": 10, "id": i})
+        self.assertEqual(2, self.conn.prepares)
+        self.assertEqual((1, 1, 10), self.conn.cursors[1].params[-1])
+
+    def test_recycled_connection_invalidates_statements(self):
+        db = Database(host="localhost", user="user", password="password", port="3306", database="db", prepared=True)
+        db.execute("SELECT id FROM t")
+        self.conn.alive = False
+        db.pool.release(db.pool.lease())
+        self.assertTrue(self.conn.cursors[0].closed)
+        self.assertEqual(0, db.statement_cache.stats["size"])
+
+    def test_read_queries_are_cached(self):
+        db = Database(host="localhost", user="user", password="password", port="3306", database="db",
+                      result_cache_ttl=60)
+        first = db.execute("SELECT id FROM t WHERE id > %s", (1,))
+        self.assertEqual(first, db.execute("SELECT id   FROM t WHERE id > %s", (1,)))
+        self.assertEqual(1, len(self.conn.cursors))
+
+    def test_write_invalidates_cached_results(self):
+        db = Database(host="localhost", user="user", password="password", port="3306", database="db",
+                      result_cache_ttl=60)
+        db.execute("SELECT id FROM t")
+        db.execute("DELETE FROM t WHERE id = 1")
+        db.execute("SELECT id FROM t")
+        self.assertEqual(3, len(self.conn.cursors))
+
+
+class SqliteDatabaseTests(unittest.TestCase):
+
+    def setUp(self):
+        self.db = Database(backend=SqliteBackend())
+        self.addCleanup(self.db.close_connections)
+        self.db.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+        self.db.bulk_insert("users", ({"id": i, "name": f"user{i}"} for i in range(50)), batch_size=20)
+
+    def test_execute(self):
+        self.assertEqual([{"id": 3, "name": "user3"}], self.db.execute("SELECT * FROM users WHERE id = %s", (3,)))
+        self.assertEqual([{"name": "user4"}],
+                         self.db.execute("SELECT name FROM users WHERE id = %(id)s", {"id": 4}))
+
+    def test_like_with_and_without_params(self):
+        self.assertEqual([{"name": "user1"}, {"name": "user10"}],
+                         self.db.execute("SELECT name FROM users WHERE name LIKE '%ser1%' AND id < 11"))
+        self.assertEqual([{"name": "user1"}, {"name": "user10"}],
+                         self.db.execute("SELECT name FROM users WHERE name LIKE '%ser1%' AND id < %s", (11,)))
+        self.assertEqual([{"name": "user1"}, {"name": "user10"}],
+                         self.db.execute("SELECT name FROM users WHERE name LIKE '%ser1%' AND id < %(id)s",
+                                         {"id": 11}))
+        self.assertEqual([{"name": "user49"}],
+                         self.db.execute("SELECT name FROM users WHERE name LIKE %s || '%' AND id > 40",
+                                         ("user49",)))
+
+    def test_placeholders_are_translated_outside_literals(self):
+        backend = self.db.backend
+        self.assertEqual("SELECT '%smith%' WHERE a = ? AND b = :b AND c LIKE 'x%%' AND d = 100%",
+                         backend.sql("SELECT '%smith%' WHERE a = %s AND b = %(b)s AND c LIKE 'x%%' AND d = 100%%",
+                                     (1,)))
+        self.assertEqual("SELECT 'it''s %s', \"%s\" FROM t WHERE a = ?",
+                         backend.sql("SELECT 'it''s %s', \"%s\" FROM t WHERE a = %s", (1,)))
+        self.assertEqual("SELECT * FROM t WHERE a LIKE '%smith%'",
+                         backend.sql("SELECT * FROM t WHERE a LIKE '%smith%'"))
+
+    def test_stream(self):
+        self.assertEqual(50, sum(1 for _ in self.db.stream("SELECT * FROM users", batch_size=7)))
+
+    def test_bulk_insert_rolls_back(self):
+        with self.assertRaises(Exception):
+            self.db.bulk_insert("users", [{"id": 100, "name": "new"}, {"id": 1, "name": "duplicate"}])
+        self.assertEqual([], self.db.execute("SELECT * FROM users WHERE id = 100"))
+
+    def test_connections_share_the_memory_database(self):
+        conns = [self.db.pool.lease() for _ in range(2)]
+        for conn in conns:
+            self.db.pool.release(conn)
+        threads = [threading.Thread(target=self.db.execute, args=("SELECT COUNT(*) AS n FROM users",))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([{"n": 50}], self.db.execute("SELECT COUNT(*) AS n FROM users"))
+        self.assertEqual(2, self.db.pool.stats["open"])
+
+    def test_concurrent_writes_and_reads(self):
+        errors = []
+        start = threading.Barrier(8)
+
+        def work(worker: int):
+            start.wait()
+            try:
+                for i in range(50):
+                    self.db.execute("INSERT INTO users (id, name) VALUES (%s, %s)", (1000 + worker * 100 + i, "w"))
+                    self.db.execute("SELECT COUNT(*) AS n FROM users WHERE name = %s", ("w",))
+                self.db.bulk_insert("users", [{"id": 5000 + worker * 100 + i, "name": "b"} for i in range(20)],
+                                    batch_size=1)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        self.assertEqual([{"n": 610}], self.db.execute("SELECT COUNT(*) AS n FROM users"))
+
+    def test_temporary_database_is_deleted_on_close(self):
+        backend = SqliteBackend()
+        path = str(backend)[len("sqlite://"):]
+        self.assertTrue(os.path.exists(path))
+        backend.close()
+        self.assertFalse(os.path.exists(path))
+
+    def test_prepared_and_cached(self):
+        db = Database(backend=SqliteBackend(), prepared=True, result_cache_ttl=60)
+        self.addCleanup(db.close_connections)
+        db.execute("CREATE TABLE t (id INTEGER)")
+        db.bulk_insert("t", [{"id": 1}])
+        self.assertEqual([{"id": 1}], db.execute("SELECT id FROM t"))
+        db.execute("INSERT INTO t (id) VALUES (%s)", (2,))
+        self.assertEqual([{"id": 1}, {"id": 2}], db.execute("SELECT id FROM t"))
+
+    def test_writes_invalidate_cached_results(self):
+        db = Database(backend=SqliteBackend(), result_cache_ttl=60)
+        self.addCleanup(db.close_connections)
+        db.execute("CREATE TABLE t (id INTEGER)")
+        self.assertEqual([], db.execute("SELECT * FROM t"))
+        db.execute("INSERT INTO `main`.`t` (id) VALUES (1)")
+        self.assertEqual([{"id": 1}], db.execute("SELECT * FROM t"))
+        db.execute("WITH x AS (SELECT 1 AS id) DELETE FROM t WHERE id IN (SELECT id FROM x)")
+        self.assertEqual([], db.execute("SELECT * FROM t"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import time
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from selenium.common import StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
+
+from autocore.web import webactions
+from autocore.web.element import WebElementFactory, _ElementCache
+
+
+class FakeWebActions:
+    """Stands in for WebActions. Resolved elements go stale after ``stale_after`` calls and every call takes
+    ``seconds``.
+    """
+    instances: list = []
+    stale_after = None
+    seconds = 0.0
+
+    def __init__(self, ctx=None, timeout: timedelta = timedelta(seconds=5), screenshot: bool = False):
+        self.timeout = timeout
+        self.calls = []
+        self.found = 0
+        FakeWebActions.instances.append(self)
+
+    def find_element(self, locator: str) -> WebElement:
+        self.found += 1
+        return WebElement(parent=None, id_=f"element-{self.found}")
+
+    def get_text(self, locator, **kwargs) -> str:
+        return self.__call("get_text", locator, kwargs)
+
+    def wait_until_text_is(self, locator, **kwargs) -> str:
+        return self.__call("wait_until_text_is", locator, kwargs)
+
+    def __call(self, name: str, locator, kwargs: dict) -> str:
+        time.sleep(FakeWebActions.seconds)
+        self.calls.append((name, locator, kwargs))
+        resolved = isinstance(locator, WebElement)
+        if resolved and FakeWebActions.stale_after is not None and len(self.calls) > FakeWebActions.stale_after:
+            raise StaleElementReferenceException("stale element reference")
+        return "resolved" if resolved else "located"
+
+
+class ElementCacheTests(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        cache = _ElementCache(locator="id:title", wa=FakeWebActions())
+        first = cache.resolve()
+        self.assertIs(first, cache.resolve())
+        self.assertEqual("id:title", str(first))
+        self.assertEqual({"hits": 1, "misses": 1, "invalidations": 0}, cache.info)
+
+    def test_navigation_invalidates(self):
+        wa = FakeWebActions()
+        cache = _ElementCache(locator="id:title", wa=wa)
+        first = cache.resolve()
+        webactions._navigated()
+        self.assertIsNot(first, cache.resolve())
+        self.assertEqual(2, wa.found)
+        self.assertEqual({"hits": 0, "misses": 2, "invalidations": 0}, cache.info)
+
+    def test_invalidate(self):
+        cache = _ElementCache(locator="id:title", wa=FakeWebActions())
+        cache.invalidate()
+        cache.resolve()
+        cache.invalidate()
+        cache.resolve()
+        self.assertEqual({"hits": 0, "misses": 2, "invalidations": 1}, cache.info)
+
+
+@mock.patch("autocore.web.element.WebActions", FakeWebActions)
+class CachedElementTests(unittest.TestCase):
+
+    def setUp(self):
+        FakeWebActions.instances = []
+        FakeWebActions.stale_after = None
+        FakeWebActions.seconds = 0.0
+
+    def test_cached_element_is_reused(self):
+        factory = WebElementFactory(ctx=None, cache=True)
+        element = factory.with_locator("id:title")
+        self.assertIs(element, factory.with_locator("id:title"))
+        self.assertEqual(["resolved", "resolved"], [element.get_text(), element.get_text()])
+        self.assertEqual({"hits": 1, "misses": 1, "invalidations": 0}, element.cache_info)
+
+    def test_stale_element_falls_back_to_the_locator(self):
+        FakeWebActions.stale_after = 1
+        element = WebElementFactory(ctx=None, cache=True).with_locator("id:title")
+        element.get_text()
+        self.assertEqual("located", element.get_text())
+        self.assertEqual(1, element.cache_info["invalidations"])
+        retry = FakeWebActions.instances[-1]
+        self.assertEqual([("get_text", "id:title", {})], retry.calls)
+
+    def test_stale_retry_gets_the_remaining_timeout(self):
+        FakeWebActions.stale_after = 0
+        FakeWebActions.seconds = 0.1
+        element = WebElementFactory(ctx=None, timeout=timedelta(seconds=5), cache=True).with_locator("id:title")
+
+        self.assertEqual("located", element.wait_until_text_is("Title", timeout=timedelta(seconds=1)))
+        _, locator, kwargs = FakeWebActions.instances[-1].calls[0]
+        self.assertEqual("id:title", locator)
+        self.assertLess(kwargs["timeout"], timedelta(seconds=0.95))
+        self.assertGreater(kwargs["timeout"], timedelta(seconds=0.5))
+
+        element.get_text()
+        self.assertLess(FakeWebActions.instances[-1].timeout, timedelta(seconds=4.95))
+
+    def test_without_cache_the_locator_is_used(self):
+        element = WebElementFactory(ctx=None).with_locator("id:title")
+        self.assertEqual("located", element.get_text())
+        self.assertIsNone(element.cache_info)
+
+
+if __name__ == '__main__':
+    unittest.main()
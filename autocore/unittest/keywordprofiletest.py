@@ -0,0 +1,58 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from ddt import ddt, data, unpack
+
+from autocore.keywordprofile import KeywordProfileListener, merge
+from autocore.stats import percentile
+
+
+def _run(listener: KeywordProfileListener, *calls):
+    # calls are (name, type, elapsed ms, child calls)
+    for name, kw_type, elapsed, children in calls:
+        listener.start_keyword(name, {"type": kw_type})
+        _run(listener, *children)
+        listener.end_keyword(name, {"type": kw_type, "elapsedtime": elapsed})
+
+
+@ddt
+class KeywordProfileTests(unittest.TestCase):
+
+    @data((0.5, 50), (0.95, 95), (0.99, 99), (1, 100))
+    @unpack
+    def test_percentile(self, q, expected):
+        self.assertEqual(expected, percentile(list(range(1, 101)), q))
+
+    def test_profiles_of_workers_are_merged(self):
+        directory = tempfile.mkdtemp()
+        for elapsed in (10, 30):
+            listener = KeywordProfileListener(directory)
+            _run(listener, ("App.Login", "KEYWORD", elapsed + 5, [
+                ("FOR", "FOR", elapsed, [("SeleniumLibrary.Click Element", "KEYWORD", elapsed, [])])]))
+            listener.close()
+
+        with open(os.path.join(directory, "keywords.collapsed")) as file:
+            self.assertEqual(["App.Login 10", "App.Login;FOR 0", "App.Login;FOR;SeleniumLibrary.Click Element 40"],
+                             file.read().splitlines())
+        with open(os.path.join(directory, "keyword_profile.json")) as file:
+            keywords = json.load(file)
+        self.assertEqual(["App.Login", "SeleniumLibrary.Click Element"], [item["keyword"] for item in keywords])
+        self.assertEqual({"count": 2, "total_ms": 50, "p50_ms": 15, "p99_ms": 35},
+                         {key: keywords[0][key] for key in ("count", "total_ms", "p50_ms", "p99_ms")})
+        with open(os.path.join(directory, "keyword_profile.csv"), newline="") as file:
+            self.assertEqual("40", list(csv.DictReader(file))[1]["total_ms"])
+        self.assertEqual([], [name for name in os.listdir(directory) if name.endswith(".tmp")])
+        self.assertEqual(2, len([name for name in os.listdir(directory) if name.startswith("profile-")]))
+
+    def test_nothing_is_written_without_keywords(self):
+        directory = os.path.join(tempfile.mkdtemp(), "profile")
+        KeywordProfileListener(directory).close()
+        self.assertFalse(os.path.exists(directory))
+        self.assertEqual([], merge(tempfile.mkdtemp())["keywords"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from autocore.web import waits
+from autocore.web.profiler import Profiler, profiler
+
+
+class ProfilerTests(unittest.TestCase):
+
+    def test_record_per_method_and_locator(self):
+        prof = Profiler(enabled=True)
+        prof.record("click_element", "id:login", 0.004)
+        prof.record("click_element", "id:login", 0.030)
+        prof.record("click_element", None, 0.001)
+        summary = prof.summary()
+        self.assertEqual(3, summary["methods"]["click_element"]["count"])
+        self.assertEqual({"<=1": 1, "<=5": 1, "<=50": 1}, summary["methods"]["click_element"]["buckets_ms"])
+        self.assertEqual(1, len(summary["locators"]))
+        self.assertEqual(2, summary["locators"][0]["count"])
+        self.assertEqual(30, summary["locators"][0]["p95_ms"])
+
+    def test_percentiles_are_interpolated_within_buckets(self):
+        prof = Profiler(enabled=True)
+        for ms in range(21, 51):
+            prof.record("get_text", None, ms / 1000)
+        stats = prof.summary()["methods"]["get_text"]
+        self.assertEqual({"<=50": 30}, stats["buckets_ms"])
+        self.assertEqual(35, stats["p50_ms"])
+        self.assertEqual(48.5, stats["p95_ms"])
+
+        prof.record("wait_until_visible", None, 11)
+        prof.record("wait_until_visible", None, 13)
+        # the unbounded bucket ends at the max
+        self.assertEqual(11500, prof.summary()["methods"]["wait_until_visible"]["p50_ms"])
+
+    def test_retries_are_counted(self):
+        prof = Profiler(enabled=True)
+        prof.retry("get_text", "id:title", "stale")
+        prof.retry("get_text", "id:title", "stale")
+        self.assertEqual([{"method": "get_text", "locator": "id:title", "reason": "stale", "count": 2}],
+                         prof.summary()["retries"])
+
+    def test_sleep_is_recorded_when_enabled(self):
+        prof = profiler()
+        prof.reset()
+        waits.sleep(0.01)
+        self.assertEqual(0, prof.summary()["sleep"]["count"])
+        prof.enabled = True
+        try:
+            waits.sleep(0.01)
+        finally:
+            prof.enabled = False
+        self.assertEqual({"count": 1, "total_s": 0.01}, prof.summary()["sleep"])
+
+    def test_write_json_and_csv(self):
+        prof = Profiler(enabled=True)
+        prof.record("get_text", "id:title", 0.002)
+        directory = tempfile.mkdtemp()
+
+        prof.write(os.path.join(directory, "profile.json"))
+        with open(os.path.join(directory, "profile.json")) as file:
+            self.assertEqual(1, json.load(file)["methods"]["get_text"]["count"])
+
+        prof.write(os.path.join(directory, "profile.csv"))
+        with open(os.path.join(directory, "profile.csv"), newline="") as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(["", "id:title"], [row["locator"] for row in rows])
+
+    def test_report(self):
+        prof = Profiler(enabled=True)
+        prof.record("get_text", "id:title", 0.002)
+        self.assertIn("get_text: 1 call/s", prof.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
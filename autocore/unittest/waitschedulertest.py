@@ -0,0 +1,133 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from itertools import islice
+
+from autocore.web.waits import WaitEngine
+from autocore.web.waitscheduler import LatencyHistory, WaitScheduler, wait_scheduler
+
+
+def _delays(scheduler: WaitScheduler, key: str, max_delay: float, count: int = 4) -> list[float]:
+    return [round(delay, 4) for delay in islice(scheduler.delays(key, max_delay), count)]
+
+
+class WaitSchedulerTests(unittest.TestCase):
+
+    def test_backoff_without_history(self):
+        scheduler = WaitScheduler()
+        self.assertEqual([0.05, 0.075, 0.1125, 0.12], _delays(scheduler, "text_equals id:title", max_delay=0.12))
+        self.assertEqual([0.05, 0.075, 0.1125, 0.1688], _delays(scheduler, None, max_delay=1))
+
+    def test_fast_condition_is_polled_early(self):
+        scheduler = WaitScheduler()
+        for seconds in (0.04, 0.05, 0.06, 0.05, 0.08):
+            scheduler.history.record("found id:title", seconds)
+        self.assertEqual([0.02, 0.01, 0.015, 0.0225], _delays(scheduler, "found id:title", max_delay=0.5))
+
+    def test_slow_condition_skips_early_polls(self):
+        scheduler = WaitScheduler()
+        for seconds in (4.0, 5.0, 6.0):
+            scheduler.history.record("found id:report", seconds)
+        self.assertEqual([2.0, 0.5, 0.75, 1.125], _delays(scheduler, "found id:report", max_delay=3))
+
+        scheduler.adaptive = False
+        self.assertEqual([0.05, 0.075, 0.1125, 0.1688], _delays(scheduler, "found id:report", max_delay=0.5))
+
+
+    def test_first_delay_does_not_exceed_max_delay(self):
+        scheduler = WaitScheduler()
+        for _ in range(5):
+            scheduler.history.record("found id:report", 5.0)
+        self.assertEqual([0.5, 0.01, 0.015, 0.0225], _delays(scheduler, "found id:report", max_delay=0.5))
+
+
+class LatencyHistoryTests(unittest.TestCase):
+
+    def test_keeps_the_last_samples(self):
+        history = LatencyHistory(max_samples=3)
+        for seconds in (1, 2, 3, 4):
+            history.record("found id:title", seconds)
+        self.assertEqual([2, 3, 4], history.samples("found id:title"))
+
+    def test_save_merges_samples_of_other_workers(self):
+        path = os.path.join(tempfile.mkdtemp(), "wait_history.json")
+        first, second = LatencyHistory(path), LatencyHistory(path)
+        first.record("found id:title", 0.1)
+        second.record("found id:title", 0.2)
+        second.record("found id:menu", 0.3)
+        first.save()
+        second.save()
+
+        self.assertEqual([0.1, 0.2], LatencyHistory(path).samples("found id:title"))
+        self.assertEqual([0.3], LatencyHistory(path).samples("found id:menu"))
+
+    def test_unreadable_file_starts_a_new_history(self):
+        path = os.path.join(tempfile.mkdtemp(), "wait_history.json")
+        with open(path, "w") as file:
+            file.write("{")
+        history = LatencyHistory(path)
+        history.record("found id:title", 0.1)
+        history.save()
+        with open(path) as file:
+            self.assertEqual({"found id:title": [0.1]}, json.load(file)["samples"])
+
+    def test_old_keys_are_dropped_on_save(self):
+        path = os.path.join(tempfile.mkdtemp(), "wait_history.json")
+        now = time.time()
+        with open(path, "w") as file:
+            json.dump({"samples": {"found id:old": [1], "found id:recent": [2], "found id:undated": [3]},
+                       "updated": {"found id:old": now - 40 * 24 * 3600, "found id:recent": now - 3600}}, file)
+        history = LatencyHistory(path)
+        history.record("found id:new", 0.1)
+        history.save()
+
+        saved = LatencyHistory(path)
+        self.assertEqual([], saved.samples("found id:old"))
+        self.assertEqual([2], saved.samples("found id:recent"))
+        self.assertEqual([3], saved.samples("found id:undated"))
+        self.assertEqual([0.1], saved.samples("found id:new"))
+
+    def test_keeps_the_most_recent_keys(self):
+        path = os.path.join(tempfile.mkdtemp(), "wait_history.json")
+        history = LatencyHistory(path, max_keys=2)
+        for key in ("found id:a", "found id:b", "found id:c"):
+            history.record(key, 0.1)
+            time.sleep(0.01)
+        history.save()
+        self.assertEqual([[], [0.1], [0.1]], [LatencyHistory(path).samples(key)
+                                              for key in ("found id:a", "found id:b", "found id:c")])
+
+    def test_concurrent_saves_keep_every_sample(self):
+        path = os.path.join(tempfile.mkdtemp(), "wait_history.json")
+        histories = [LatencyHistory(path, max_samples=1000) for _ in range(8)]
+        for i, history in enumerate(histories):
+            history.record("found id:title", i)
+        threads = [threading.Thread(target=history.save) for history in histories]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(list(range(8)), sorted(LatencyHistory(path).samples("found id:title")))
+
+
+class WaitEnginePollTests(unittest.TestCase):
+
+    def test_poll_records_time_to_condition(self):
+        key = "text_equals id:poll-test"
+        reads = iter(["", "", "done"])
+        try:
+            met, value = WaitEngine(ctx=None).poll(read=lambda: next(reads), check=lambda text: text == "done",
+                                                   deadline=time.monotonic() + 5, max_delay=0.01, key=key)
+            self.assertEqual((True, "done"), (met, value))
+            samples = wait_scheduler().history.samples(key)
+            self.assertEqual(1, len(samples))
+            self.assertLess(samples[0], 1)
+        finally:
+            wait_scheduler().history.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import time
+import unittest
+from datetime import timedelta
+from types import SimpleNamespace
+
+from ddt import ddt, data, unpack
+from selenium.common import WebDriverException
+
+from autocore.web.waits import ATTRIBUTE, EQUALS, TEXT, WaitEngine, _js_locator
+from autocore.web.waitscheduler import wait_scheduler
+
+
+class _Driver:
+    """Returns the given in-page results from execute_async_script, or raises them. The last one is repeated."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.scripts = 0
+
+    def execute_async_script(self, script, *args):
+        self.scripts += 1
+        result = self.results.pop(0) if len(self.results) > 1 else self.results[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _engine(driver: _Driver) -> WaitEngine:
+    return WaitEngine(ctx=SimpleNamespace(driver=driver, timeout=5))
+
+
+@ddt
+class JsLocatorTests(unittest.TestCase):
+
+    @data(("//div[@id='a']", ("xpath", "//div[@id='a']")),
+          ("(//div)[2]", ("xpath", "(//div)[2]")),
+          ("xpath://span", ("xpath", "//span")),
+          ("xpath=//span", ("xpath", "//span")),
+          ("css:div.item > a", ("css", "div.item > a")),
+          ("id:user-name", ("css", '[id="user-name"]')),
+          ("ID = user-name", ("css", '[id="user-name"]')),
+          ("name:password", ("css", '[name="password"]')),
+          ("class:inventory_item", ("css", '[class~="inventory_item"]')))
+    @unpack
+    def test_supported_locators(self, locator, expected):
+        self.assertEqual(expected, _js_locator(locator))
+
+    @data("link:Login", "partial link:Log", "tag:div", "user-name")
+    def test_unsupported_locators(self, locator):
+        self.assertIsNone(_js_locator(locator))
+
+
+class WaitEngineTests(unittest.TestCase):
+
+    def tearDown(self):
+        wait_scheduler().history.clear()
+
+    def test_poll_until_met(self):
+        reads = iter(["", "", "done"])
+        met, value = _engine(_Driver()).poll(read=lambda: next(reads), check=lambda text: text == "done",
+                                             deadline=time.monotonic() + 5, max_delay=0.01)
+        self.assertEqual((True, "done"), (met, value))
+
+    def test_poll_times_out_with_the_last_value(self):
+        reads = iter(range(1000))
+        start = time.monotonic()
+        met, value = _engine(_Driver()).poll(read=lambda: next(reads), check=lambda count: count < 0,
+                                             deadline=start + 0.1, max_delay=0.01, key="count_equals id:poll")
+        self.assertFalse(met)
+        self.assertGreater(value, 1)
+        self.assertLess(time.monotonic() - start, 0.5)
+        # a timeout says nothing about when the condition is met
+        self.assertEqual([], wait_scheduler().history.samples("count_equals id:poll"))
+
+    def test_met_in_page_returns_the_webdriver_value(self):
+        driver = _Driver({"met": True, "stale": False, "value": "Revealed"})
+        met, value = _engine(driver).until(TEXT, EQUALS, "Revealed", read=lambda: "Revealed ",
+                                           check=lambda text: text.strip() == "Revealed",
+                                           timeout=timedelta(seconds=5), max_delay=0.01, element=lambda: None,
+                                           locator="id:in-page")
+        self.assertEqual((True, "Revealed "), (met, value))
+        self.assertEqual(1, len(wait_scheduler().history.samples("text_equals 'Revealed' id:in-page")))
+
+    def test_webdriver_has_the_final_say(self):
+        reads = iter(["Loading", "Loaded"])
+        driver = _Driver({"met": True, "stale": False, "value": "Loaded"})
+        met, value = _engine(driver).until(TEXT, EQUALS, "Loaded", read=lambda: next(reads),
+                                           check=lambda text: text == "Loaded", timeout=timedelta(seconds=5),
+                                           max_delay=0.01, element=lambda: None, locator="id:final-say")
+        self.assertEqual((True, "Loaded"), (met, value))
+
+    def test_in_page_timeout_is_not_recorded(self):
+        driver = _Driver({"met": False, "stale": False, "value": "Loading"})
+        met, value = _engine(driver).until(TEXT, EQUALS, "Loaded", read=lambda: "Loading",
+                                           check=lambda text: text == "Loaded", timeout=timedelta(seconds=0.05),
+                                           max_delay=0.01, element=lambda: None, locator="id:timeout")
+        self.assertEqual((False, "Loading"), (met, value))
+        self.assertEqual([], wait_scheduler().history.samples("text_equals 'Loaded' id:timeout"))
+
+    def test_history_is_kept_per_expected_value(self):
+        for expected in ("Loaded", "Failed"):
+            driver = _Driver({"met": True, "stale": False, "value": expected})
+            _engine(driver).until(TEXT, EQUALS, expected, read=lambda: expected, check=lambda text: True,
+                                  timeout=timedelta(seconds=5), max_delay=0.01, element=lambda: None,
+                                  locator="id:status")
+        self.assertEqual(1, len(wait_scheduler().history.samples("text_equals 'Loaded' id:status")))
+        self.assertEqual(1, len(wait_scheduler().history.samples("text_equals 'Failed' id:status")))
+        self.assertEqual([], wait_scheduler().history.samples("text_equals id:status"))
+
+    def test_falls_back_to_polling(self):
+        reads = iter(["", "true"])
+        driver = _Driver(WebDriverException("javascript disabled"))
+        met, value = _engine(driver).until(ATTRIBUTE, EQUALS, "true", read=lambda: next(reads),
+                                           check=lambda v: v == "true", timeout=timedelta(seconds=5),
+                                           max_delay=0.01, element=lambda: None, locator="id:fallback",
+                                           name="checked")
+        self.assertEqual((True, "true"), (met, value))
+        self.assertEqual(1, driver.scripts)
+
+
+if __name__ == '__main__':
+    unittest.main()
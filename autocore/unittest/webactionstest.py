@@ -0,0 +1,132 @@
+import json
+import shutil
+import subprocess
+import unittest
+
+from autocore.web.webactions import WebActions, _READ_ELEMENTS_JS
+
+# runs the read elements script on plain objects standing in for the DOM elements, styles and layout
+_NODE_RUNNER = """
+const spec = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const elements = spec.elements.map(function (el) {
+    return Object.assign({}, el.properties, {
+        style: Object.assign({visibility: 'visible', opacity: '1'}, el.style),
+        getClientRects: function () { return new Array(el.rendered === false ? 0 : 1); },
+        getAttribute: function (name) { return name in (el.attributes || {}) ? el.attributes[name] : null; }
+    });
+});
+spec.elements.forEach(function (el, i) {
+    elements[i].parentElement = el.parent === undefined ? null : elements[el.parent];
+});
+global.window = {getComputedStyle: function (el) { return el.style; }};
+const read = new Function(spec.script);
+process.stdout.write(JSON.stringify(read(spec.read.map(function (i) { return elements[i]; }), spec.attributes)));
+"""
+
+
+class _Element:
+
+    def __init__(self, text: str, value: str = None, **attributes):
+        self.text = text
+        self.value = value
+        self.attributes = attributes
+
+
+class _Driver:
+    """Evaluates the read elements script in python, like the browser would."""
+
+    def __init__(self):
+        self.scripts = []
+
+    def execute_script(self, script: str, *args):
+        self.scripts.append((script, args))
+        elements, attributes = args
+        return [{"text": el.text, "value": el.value,
+                 "attributes": {name: el.attributes.get(name) for name in attributes}} for el in elements]
+
+
+class _Context:
+    """The SeleniumLibrary calls made by read_elements."""
+
+    def __init__(self, elements: list):
+        self.driver = _Driver()
+        self.elements = elements
+
+    def find_elements(self, locator: str) -> list:
+        return self.elements
+
+    def execute_javascript(self, code: str, *args):
+        # SeleniumLibrary passes what follows the ARGUMENTS marker to the script
+        marker = args.index("ARGUMENTS")
+        return self.driver.execute_script(code, *args[marker + 1:])
+
+
+class ReadElementsTests(unittest.TestCase):
+
+    def test_no_elements_found(self):
+        ctx = _Context([])
+        wa = WebActions(ctx=ctx)
+        self.assertEqual([], wa.read_elements(locator="css:.item", attributes=["class"]))
+        self.assertEqual([], wa.get_texts(locator="css:.item"))
+        self.assertEqual([], wa.get_values(locator="css:.item"))
+        self.assertEqual([], ctx.driver.scripts)
+
+    def test_all_elements_are_read_in_one_script(self):
+        elements = [_Element("Backpack", "1", **{"class": "item", "data-test": "backpack"}),
+                    _Element("Bike Light", "2", **{"class": "item sale"})]
+        ctx = _Context(elements)
+        read = WebActions(ctx=ctx).read_elements(locator="css:.item", attributes=["class", "data-test"])
+        self.assertEqual([{"text": "Backpack", "value": "1",
+                           "attributes": {"class": "item", "data-test": "backpack"}},
+                          {"text": "Bike Light", "value": "2",
+                           "attributes": {"class": "item sale", "data-test": None}}], read)
+        self.assertEqual([(_READ_ELEMENTS_JS, (elements, ["class", "data-test"]))], ctx.driver.scripts)
+
+    def test_without_attributes(self):
+        ctx = _Context([_Element("Backpack")])
+        self.assertEqual([{"text": "Backpack", "value": None, "attributes": {}}],
+                         WebActions(ctx=ctx).read_elements(locator="css:.item"))
+        self.assertEqual([], ctx.driver.scripts[0][1][1])
+
+    def test_get_texts_and_values(self):
+        wa = WebActions(ctx=_Context([_Element("Backpack", "1"), _Element("", None), _Element("Bike Light", "2")]))
+        self.assertEqual(["Backpack", "", "Bike Light"], wa.get_texts(locator="css:.item"))
+        self.assertEqual(["1", None, "2"], wa.get_values(locator="css:.item"))
+
+
+@unittest.skipIf(shutil.which("node") is None, "node is needed to run the read elements script")
+class ReadElementsScriptTests(unittest.TestCase):
+
+    @staticmethod
+    def _read(elements: list, attributes: list = None, read: list = None) -> list:
+        spec = {"script": _READ_ELEMENTS_JS, "elements": elements, "attributes": attributes or [],
+                "read": read if read is not None else list(range(len(elements)))}
+        result = subprocess.run(["node", "-e", _NODE_RUNNER], input=json.dumps(spec), capture_output=True,
+                                text=True, check=True)
+        return json.loads(result.stdout)
+
+    def test_visible_text_is_normalized_like_webdriver(self):
+        read = self._read([{"properties": {"innerText": "\n  Sauce   Labs\tBackpack \n  $29.99\u00a0 \n"}}])
+        self.assertEqual("Sauce Labs Backpack\n$29.99 ", read[0]["text"])
+
+    def test_hidden_elements_have_no_text(self):
+        read = self._read([{"properties": {"innerText": "not rendered"}, "rendered": False},
+                           {"properties": {"innerText": "invisible"}, "style": {"visibility": "hidden"}},
+                           {"properties": {"innerText": "transparent"}, "style": {"opacity": "0"}},
+                           {"properties": {"innerText": "in a transparent parent"}, "parent": 2},
+                           {"properties": {"innerText": "shown"}, "style": {"opacity": "0.5"}}])
+        self.assertEqual(["", "", "", "", "shown"], [item["text"] for item in read])
+
+    def test_values_and_attributes(self):
+        read = self._read([{"properties": {"innerText": "", "value": "typed", "checked": True},
+                            "attributes": {"value": "initial", "class": "field"}},
+                           {"properties": {"innerText": "Option"}, "attributes": {"value": "1"}}],
+                          attributes=["class", "checked", "data-test"])
+        self.assertEqual([{"text": "", "value": "typed",
+                           "attributes": {"class": "field", "checked": True, "data-test": None}},
+                          {"text": "Option", "value": "1",
+                           "attributes": {"class": None, "checked": None, "data-test": None}}], read)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,246 @@
+"""
+Shares warm browsers between processes, e.g. pabot workers. A single broker process owns a BrowserPool and leases
+its webdriver sessions to workers over a local socket, capping the browsers running on the host.
+
+Start the broker before pabot, then let the workers know where it is and the key it was started with. Messages
+are pickled, anyone with the key can run code in the broker: keep the key secret and the broker on loopback.
+    AUTOCORE_BROWSER_BROKER_KEY=$(openssl rand -hex 16) \n
+    python -m autocore.web.browserbroker --size 4 --port 6010 \n
+    AUTOCORE_BROWSER_BROKER=127.0.0.1:6010 pabot --processes 8 tests
+Without a key the broker generates one and prints it, to be exported to the workers.
+"""
+import argparse
+import ipaddress
+import os
+import secrets
+import socket
+import threading
+import traceback
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+
+from robot.api import logger
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from autocore.web.browserpool import BrowserPool
+
+BROKER_ADDRESS_ENV = "AUTOCORE_BROWSER_BROKER"
+BROKER_AUTHKEY_ENV = "AUTOCORE_BROWSER_BROKER_KEY"
+
+
+def _authkey(authkey: str = None) -> str | None:
+    if authkey is None:
+        authkey = os.environ.get(BROKER_AUTHKEY_ENV)
+    return authkey or None
+
+
+def _is_loopback(host: str) -> bool:
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def _parse_address(address: str) -> tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class _AttachedDriver(WebDriver):
+    """Remote driver that attaches to an existing session instead of creating a new one."""
+
+    def __init__(self, command_executor: str, session_id: str, capabilities: dict):
+        self.__attach_session_id = session_id
+        self.__attach_capabilities = capabilities
+        super().__init__(command_executor=command_executor, options=Options())
+
+    def start_session(self, capabilities: dict, browser_profile=None) -> None:
+        self.session_id = self.__attach_session_id
+        self.caps = self.__attach_capabilities
+
+
+class BrowserBroker:
+    """Leases the sessions of a BrowserPool to clients. At most ``size`` sessions are leased at once, further
+    leases wait for a release. Sessions of a client that disconnects are released automatically.
+
+    Clients authenticate with ``authkey``, by default the AUTOCORE_BROWSER_BROKER_KEY environment variable. Without
+    one a random key is generated (see ``authkey``), a broker on a non loopback host requires an explicit key.
+    """
+
+    def __init__(self, size: int = 2, max_reuse: int = 25, headless: bool = True, host: str = "127.0.0.1",
+                 port: int = 0, authkey: str = None, pool: BrowserPool = None):
+        authkey = _authkey(authkey)
+        self.__generated = authkey is None
+        if authkey is None:
+            if not _is_loopback(host):
+                raise Exception(f"Browser broker on non loopback host {host} requires an authkey, "
+                                f"set {BROKER_AUTHKEY_ENV}.")
+            authkey = secrets.token_hex(16)
+
+        self.__size = size
+        self.__authkey = authkey
+        self.__listener = Listener(address=(host, port), authkey=authkey.encode())
+        self.__pool = pool if pool is not None else BrowserPool(size=size, max_reuse=max_reuse, headless=headless)
+        self.__leased: dict[str, WebDriver] = {}
+        # slots taken by leases and releases in progress, the driver work is done outside the lock
+        self.__pending = 0
+        self.__available = threading.Condition()
+        self.__closed = False
+
+    @property
+    def authkey(self) -> str:
+        return self.__authkey
+
+    @property
+    def address(self) -> str:
+        host, port = self.__listener.address
+        return f"{host}:{port}"
+
+    def serve_forever(self):
+        logger.console(f"Browser broker listening on {self.address} with {self.__size} browser/s.")
+        if self.__generated:
+            logger.console(f"Export the generated key to the workers: {BROKER_AUTHKEY_ENV}={self.__authkey}")
+        try:
+            while True:
+                try:
+                    conn = self.__listener.accept()
+                except AuthenticationError:
+                    logger.warn("Browser broker refused a client with a wrong authkey.")
+                    continue
+                except OSError:
+                    if self.__closed:
+                        return
+                    raise
+                threading.Thread(target=self.__serve, args=(conn,), daemon=True).start()
+        finally:
+            self.close()
+
+    def close(self):
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__listener.close()
+        self.__pool.close()
+
+    def __serve(self, conn: Connection):
+        owned: set[str] = set()
+        try:
+            while True:
+                request = conn.recv()
+                if request[0] == "lease":
+                    driver = self.__lease(timeout=request[1])
+                    if driver is None:
+                        conn.send(("error", f"No browser released within {request[1]} seconds."))
+                        continue
+                    owned.add(driver.session_id)
+                    conn.send(("ok", driver.command_executor._url, driver.session_id, driver.caps))
+                elif request[0] == "release":
+                    owned.discard(request[1])
+                    self.__release(request[1])
+                    conn.send(("ok",))
+        except EOFError:
+            pass
+        except Exception:
+            logger.debug(traceback.format_exc())
+        finally:
+            for session_id in owned:
+                self.__release(session_id)
+            conn.close()
+
+    def __lease(self, timeout: float):
+        with self.__available:
+            if not self.__available.wait_for(lambda: len(self.__leased) + self.__pending < self.__size,
+                                             timeout=timeout):
+                return None
+            self.__pending += 1
+
+        driver = None
+        try:
+            driver = self.__pool.lease()
+            return driver
+        finally:
+            with self.__available:
+                self.__pending -= 1
+                if driver is not None:
+                    self.__leased[driver.session_id] = driver
+                self.__available.notify()
+
+    def __release(self, session_id: str):
+        with self.__available:
+            driver = self.__leased.pop(session_id, None)
+            if driver is None:
+                return
+            self.__pending += 1
+
+        try:
+            # routes back to the pool, see BrowserPool.lease
+            driver.quit()
+        finally:
+            with self.__available:
+                self.__pending -= 1
+                self.__available.notify()
+
+
+class BrowserBrokerClient:
+    """Leases browsers from a running BrowserBroker. Can be used wherever a BrowserPool is accepted.
+    ``address`` and ``authkey`` default to the AUTOCORE_BROWSER_BROKER and AUTOCORE_BROWSER_BROKER_KEY environment
+    variables.
+    """
+
+    def __init__(self, address: str = None, authkey: str = None, lease_timeout: float = 300):
+        if address is None:
+            address = os.environ.get(BROKER_ADDRESS_ENV)
+        if not address:
+            raise Exception(f"Browser broker address not provided and {BROKER_ADDRESS_ENV} is not set.")
+
+        authkey = _authkey(authkey)
+        if authkey is None:
+            raise Exception(f"Browser broker authkey not provided and {BROKER_AUTHKEY_ENV} is not set.")
+
+        self.__address = address
+        self.__authkey = authkey
+        self.__lease_timeout = lease_timeout
+        self.__conn: Connection = None
+        self.__lock = threading.Lock()
+
+    def lease(self) -> WebDriver:
+        status, *payload = self.__request("lease", self.__lease_timeout)
+        if status != "ok":
+            raise Exception(f"Can't lease a browser from broker {self.__address}. {payload[0]}")
+
+        command_executor, session_id, capabilities = payload
+        driver = _AttachedDriver(command_executor=command_executor, session_id=session_id, capabilities=capabilities)
+        driver.quit = lambda: self.release(driver)
+        logger.info(f"Leased browser with session id {session_id} from broker {self.__address}.")
+        return driver
+
+    def release(self, driver: WebDriver):
+        self.__request("release", driver.session_id)
+        logger.info(f"Released browser with session id {driver.session_id} back to broker {self.__address}.")
+
+    def close(self):
+        """Close the connection to the broker, which releases the browsers still leased."""
+        with self.__lock:
+            if self.__conn is not None:
+                self.__conn.close()
+                self.__conn = None
+
+    def __request(self, *request):
+        with self.__lock:
+            if self.__conn is None:
+                self.__conn = Client(address=_parse_address(self.__address), authkey=self.__authkey.encode())
+            self.__conn.send(request)
+            return self.__conn.recv()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Share warm browsers between test processes.")
+    parser.add_argument("--size", type=int, default=2, help="Maximum number of browsers.")
+    parser.add_argument("--max-reuse", type=int, default=25, help="Leases before a browser is replaced.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--ui", action="store_true", help="Run browsers in UI mode instead of headless.")
+    args = parser.parse_args()
+    BrowserBroker(size=args.size, max_reuse=args.max_reuse, headless=not args.ui, host=args.host,
+                  port=args.port).serve_forever()
@@ -0,0 +1,194 @@
+"""
+Pool of warm web drivers. Starting a browser is the slowest part of opening one, so drivers are launched ahead of
+time and returned to the pool when closed instead of being quit.
+"""
+import atexit
+import queue
+import threading
+import traceback
+from typing import Callable
+
+from robot.api import logger
+from selenium import webdriver
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from autocore.web.BroswerConfig import chrome_options
+
+_RESET_STORAGE_JS = "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+
+
+def _new_chrome(headless: bool = True) -> WebDriver:
+    return webdriver.Chrome(options=chrome_options(is_headless=headless))
+
+
+class BrowserPool:
+    """Keeps up to ``size`` launched drivers, idle ones are ready to be leased.
+
+    A leased driver is health checked and starts at about:blank. Quitting a leased driver (e.g. SeleniumLibrary
+    Close Browser / Close All Browsers) releases it back to the pool after clearing cookies and storage, unless it
+    was used ``max_reuse`` times already in which case it is quit and replaced. Leasing more than ``size`` drivers at
+    once launches extra drivers which are quit when released.
+
+    Example:
+        pool = BrowserPool(size=2) \n
+        driver = pool.lease() \n
+        driver.quit() -> returned to the pool \n
+        pool.close() -> quits all pooled drivers
+    """
+
+    def __init__(self, size: int = 2, max_reuse: int = 25, headless: bool = True,
+                 driver_factory: Callable[[], WebDriver] = None):
+        if size < 1:
+            raise Exception(f"Browser pool size should be at least 1 but got {size}.")
+
+        self.__size = size
+        self.__max_reuse = max_reuse
+        self.__driver_factory = driver_factory if driver_factory is not None else lambda: _new_chrome(headless)
+        self.__idle: queue.Queue = queue.Queue()
+        self.__uses: dict[WebDriver, int] = {}
+        self.__leased: set[WebDriver] = set()
+        self.__lock = threading.Lock()
+        self.__launching = 0
+        self.__closed = False
+        atexit.register(self.close)
+
+        for _ in range(size):
+            self.__launch_in_background()
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    @property
+    def idle(self) -> int:
+        return self.__idle.qsize()
+
+    def lease(self) -> WebDriver:
+        """Returns a healthy driver at about:blank. Launches a new one if none is ready."""
+        if self.__closed:
+            raise Exception("Browser pool is already closed.")
+
+        while True:
+            driver = self.__take_idle()
+            if driver is None:
+                driver = self.__launch()
+            if self.__is_healthy(driver):
+                break
+            logger.info("Discarding unhealthy pooled browser.")
+            self.__quit(driver)
+
+        with self.__lock:
+            self.__uses[driver] = self.__uses.get(driver, 0) + 1
+            self.__leased.add(driver)
+        # SeleniumLibrary closes browsers through quit, route it back to the pool
+        driver.quit = lambda: self.release(driver)
+        logger.info(f"Leased pooled browser with session id {driver.session_id}. "
+                    f"Use {self.__uses[driver]} of {self.__max_reuse}.")
+        return driver
+
+    def release(self, driver: WebDriver):
+        """Clean the driver and return it to the pool, quit it if it can't be reused anymore. Releasing a driver
+        that is not leased (e.g. quit twice) does nothing.
+        """
+        with self.__lock:
+            if driver not in self.__leased:
+                logger.debug(f"Browser with session id {driver.session_id} is already released.")
+                return
+            self.__leased.discard(driver)
+            excess = len(self.__uses) > self.__size
+        if self.__closed or excess or self.__uses.get(driver, 0) >= self.__max_reuse:
+            self.__quit(driver)
+            self.__top_up()
+            return
+
+        try:
+            self.__reset(driver)
+        except Exception:
+            logger.debug(traceback.format_exc())
+            self.__quit(driver)
+            self.__top_up()
+            return
+
+        logger.info(f"Released browser with session id {driver.session_id} back to the pool.")
+        self.__idle.put(driver)
+
+    def close(self):
+        """Quit all idle drivers. Leased drivers are quit once released."""
+        self.__closed = True
+        while True:
+            try:
+                self.__quit(self.__idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def __take_idle(self):
+        """Returns an idle driver, waits for drivers being launched. Returns None if there is nothing to wait for."""
+        while True:
+            with self.__lock:
+                launching = self.__launching > 0
+            try:
+                return self.__idle.get(timeout=0.1) if launching else self.__idle.get_nowait()
+            except queue.Empty:
+                if not launching:
+                    return None
+
+    def __launch(self) -> WebDriver:
+        driver = self.__driver_factory()
+        with self.__lock:
+            self.__uses[driver] = 0
+        return driver
+
+    def __launch_in_background(self):
+        with self.__lock:
+            self.__launching += 1
+
+        def launch():
+            driver = None
+            try:
+                driver = self.__driver_factory()
+            except Exception:
+                logger.debug(traceback.format_exc())
+            with self.__lock:
+                self.__launching -= 1
+                if driver is not None:
+                    self.__uses[driver] = 0
+                    self.__idle.put(driver)
+
+        threading.Thread(target=launch, daemon=True).start()
+
+    def __top_up(self):
+        with self.__lock:
+            missing = self.__size - len(self.__uses) - self.__launching
+        if not self.__closed and missing > 0:
+            self.__launch_in_background()
+
+    @staticmethod
+    def __is_healthy(driver: WebDriver) -> bool:
+        try:
+            return driver.current_url is not None
+        except Exception:
+            return False
+
+    @staticmethod
+    def __reset(driver: WebDriver):
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        # storage is per origin, clear it before leaving the page
+        driver.execute_script(_RESET_STORAGE_JS)
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        else:
+            driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def __quit(self, driver: WebDriver):
+        with self.__lock:
+            self.__uses.pop(driver, None)
+        try:
+            type(driver).quit(driver)
+        except Exception:
+            logger.debug(traceback.format_exc())
@@ -1,52 +1,122 @@
+import time
 from datetime import timedelta
 
 from SeleniumLibrary import SeleniumLibrary
+from robot.api import logger
+from selenium.common import StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
 
-from autocore.web.webactions import WebActions
+from autocore.web.webactions import WebActions, navigation_epoch
 
 
 class WebElementFactory:
 
-    def __init__(self, ctx: SeleniumLibrary, timeout: timedelta = timedelta(seconds=5), screenshot: bool = False):
+    def __init__(self, ctx: SeleniumLibrary, timeout: timedelta = timedelta(seconds=5), screenshot: bool = False,
+                 cache: bool = False):
         self.__ctx = ctx
         self.__timeout = timeout
         self.__screenshot = screenshot
+        self.__cache = cache
+        self.__elements: dict[str, _WebElement] = {}
 
     def with_locator(self, locator: str):
-        return _WebElement(locator=locator, ctx=self.__ctx, timeout=self.__timeout, screenshot=self.__screenshot)
+        if not self.__cache:
+            return _WebElement(locator=locator, ctx=self.__ctx, timeout=self.__timeout, screenshot=self.__screenshot)
+
+        # elements are reused so the resolved WebElement survives repeated page object property access
+        if locator not in self.__elements:
+            self.__elements[locator] = _WebElement(locator=locator, ctx=self.__ctx, timeout=self.__timeout,
+                                                   screenshot=self.__screenshot, cache=True)
+        return self.__elements[locator]
+
+
+class _ResolvedElement(WebElement):
+    """A WebElement that reads as the locator it was resolved from, to keep logs and error messages unchanged."""
+
+    def __init__(self, element: WebElement, locator: str):
+        super().__init__(element.parent, element.id)
+        self.__locator = locator
+
+    def __str__(self):
+        return self.__locator
+
+    def __repr__(self):
+        return self.__locator
+
+
+class _ElementCache:
+    """Holds the WebElement resolved from a locator until it goes stale or the browsing context changes."""
+
+    def __init__(self, locator: str, wa: WebActions):
+        self.__locator = locator
+        self.__wa = wa
+        self.__element: WebElement = None
+        self.__epoch: int = -1
+        self.__hits = 0
+        self.__misses = 0
+        self.__invalidations = 0
+
+    @property
+    def info(self) -> dict:
+        return {"hits": self.__hits, "misses": self.__misses, "invalidations": self.__invalidations}
+
+    def resolve(self) -> WebElement:
+        if self.__element is not None and self.__epoch == navigation_epoch():
+            self.__hits += 1
+            return self.__element
+
+        self.__misses += 1
+        self.__element = _ResolvedElement(self.__wa.find_element(locator=self.__locator), self.__locator)
+        self.__epoch = navigation_epoch()
+        return self.__element
+
+    def invalidate(self):
+        if self.__element is not None:
+            self.__invalidations += 1
+            logger.debug(f"Resolved element of locator '{self.__locator}' is stale, locating it again.")
+        self.__element = None
 
 
 class _WebElement:
 
     def __init__(self, locator: str, ctx: SeleniumLibrary, timeout: timedelta = timedelta(seconds=5),
-                 screenshot: bool = False):
+                 screenshot: bool = False, cache: bool = False):
+        self.__ctx = ctx
+        self.__timeout = timeout
+        self.__screenshot = screenshot
         self.__wa = WebActions(ctx=ctx, timeout=timeout, screenshot=screenshot)
         self.__locator = locator
+        self.__cache = _ElementCache(locator=locator, wa=self.__wa) if cache else None
 
     @property
     def locator(self):
         return self.__locator
 
+    @property
+    def cache_info(self) -> dict:
+        """Returns the hits, misses and invalidations of the resolved element cache, None if caching is off."""
+        return None if self.__cache is None else self.__cache.info
+
     def attribute_ends_with(self, attribute: str, exp_value: str) -> bool:
-        return self.__wa.attribute_ends_with(locator=self.__locator, attribute=attribute, exp_value=exp_value)
+        return self.__run(self.__wa.attribute_ends_with, attribute=attribute, exp_value=exp_value)
 
     def attribute_contains(self, attribute: str, exp_value: str) -> bool:
-        return self.__wa.attribute_contains(locator=self.__locator, attribute=attribute, exp_value=exp_value)
+        return self.__run(self.__wa.attribute_contains, attribute=attribute, exp_value=exp_value)
 
     def attribute_value_should_be(self, attribute: str, exp_value: str):
-        self.__wa.attribute_value_should_be(locator=self.__locator, attribute=attribute, exp_value=exp_value)
+        self.__run(self.__wa.attribute_value_should_be, attribute=attribute, exp_value=exp_value)
 
     def attribute_value_should_end_with(self, attribute: str, exp_value: str):
-        self.__wa.attribute_value_should_end_with(locator=self.__locator, attribute=attribute, exp_value=exp_value)
+        self.__run(self.__wa.attribute_value_should_end_with, attribute=attribute, exp_value=exp_value)
 
     def attribute_value_should_start_with(self, attribute: str, exp_value: str):
-        self.__wa.attribute_value_should_start_with(locator=self.__locator, attribute=attribute, exp_value=exp_value)
+        self.__run(self.__wa.attribute_value_should_start_with, attribute=attribute, exp_value=exp_value)
 
     def attribute_value_should_contain(self, attribute: str, exp_value: str):
-        self.__wa.attribute_value_should_contain(locator=self.__locator, attribute=attribute, exp_value=exp_value)
+        self.__run(self.__wa.attribute_value_should_contain, attribute=attribute, exp_value=exp_value)
 
     def click(self):
-        self.__wa.click(locator=self.__locator)
+        self.__run(self.__wa.click)
 
     def count(self) -> int:
         return self.__wa.count(locator=self.__locator)
@@ -55,41 +125,44 @@ class _WebElement:
         self.__wa.count_of_should_be(locator=self.__locator, exp_count=exp_count)
 
     def delete_text_via_keys(self):
-        self.__wa.delete_text_via_keys(locator=self.__locator)
+        self.__run(self.__wa.delete_text_via_keys)
 
     def double_click(self):
-        self.__wa.double_click(locator=self.__locator)
+        self.__run(self.__wa.double_click)
 
     def get_attribute(self, attribute: str) -> str:
-        return self.__wa.get_attribute(locator=self.__locator, attribute=attribute)
+        return self.__run(self.__wa.get_attribute, attribute=attribute)
 
     def get_text(self) -> str:
-        return self.__wa.get_text(locator=self.__locator)
+        return self.__run(self.__wa.get_text)
 
     def get_texts(self) -> list[str]:
         return self.__wa.get_texts(locator=self.__locator)
 
+    def read_elements(self, attributes: list[str] = None) -> list[dict]:
+        return self.__wa.read_elements(locator=self.__locator, attributes=attributes)
+
     def get_value(self) -> str:
-        return self.__wa.get_value(locator=self.__locator)
+        return self.__run(self.__wa.get_value)
 
     def get_values(self):
         return self.__wa.get_values(locator=self.__locator)
 
     def input_text(self, text: str, click: bool = True, press_enter: bool = False, clear: bool = True):
-        self.__wa.input_text(locator=self.__locator, text=text, click=click, press_enter=press_enter, clear=clear)
+        self.__run(self.__wa.input_text, text=text, click=click, press_enter=press_enter, clear=clear)
 
     def input_password(self, password: str, click: bool = True, press_enter: bool = False, clear: bool = True):
-        self.__wa.input_password(locator=self.__locator, password=password, click=click, press_enter=press_enter,
-                                 clear=clear)
+        self.__run(self.__wa.input_password, password=password, click=click, press_enter=press_enter,
+                   clear=clear)
 
     def is_text(self, exp_text: str, ignore_case: bool = False, ignore_space: bool = False,
                 timeout: timedelta = None) -> bool:
-        return self.__wa.is_text(locator=self.__locator, exp_text=exp_text, ignore_case=ignore_case,
-                                 ignore_space=ignore_space, timeout=timeout)
+        return self.__run(self.__wa.is_text, exp_text=exp_text, ignore_case=ignore_case,
+                          ignore_space=ignore_space, timeout=timeout)
 
     def is_value(self, exp_value: str, ignore_case: bool = False, ignore_space: bool = False) -> bool:
-        return self.__wa.is_value(locator=self.__locator, exp_value=exp_value, ignore_case=ignore_case,
-                                  ignore_space=ignore_space)
+        return self.__run(self.__wa.is_value, exp_value=exp_value, ignore_case=ignore_case,
+                          ignore_space=ignore_space)
 
     def is_visible(self, timeout: timedelta = None) -> bool:
         return self.__wa.is_visible(locator=self.__locator, timeout=timeout)
@@ -98,13 +171,13 @@ class _WebElement:
         return self.__wa.is_enabled(locator=self.__locator, timeout=timeout)
 
     def is_selected(self) -> bool:
-        return self.__wa.is_selected(locator=self.__locator)
+        return self.__run(self.__wa.is_selected)
 
     def press_enter(self):
-        self.__wa.press_enter(locator=self.__locator)
+        self.__run(self.__wa.press_enter)
 
     def scroll_into_view(self):
-        self.__wa.scroll_into_view(locator=self.__locator)
+        self.__run(self.__wa.scroll_into_view)
 
     def should_be_visible(self, timeout: timedelta = None):
         self.__wa.should_be_visible(locator=self.__locator, timeout=timeout)
@@ -116,90 +189,90 @@ class _WebElement:
         self.__wa.should_be_enabled(locator=self.__locator, timeout=timeout)
 
     def should_be_selected(self):
-        self.__wa.should_be_selected(locator=self.__locator)
+        self.__run(self.__wa.should_be_selected)
 
     def should_not_be_selected(self):
-        self.__wa.should_not_be_selected(locator=self.__locator)
+        self.__run(self.__wa.should_not_be_selected)
 
     def should_be_disabled(self):
         self.__wa.should_be_disabled(locator=self.__locator)
 
     def text_should_be(self, exp_text: str, ignore_case: bool = False, ignore_space: bool = False,
                        with_wait: bool = False, strip: bool = False):
-        self.__wa.text_should_be(locator=self.__locator, exp_text=exp_text, ignore_case=ignore_case,
-                                 ignore_space=ignore_space, with_wait=with_wait, strip=strip)
+        self.__run(self.__wa.text_should_be, exp_text=exp_text, ignore_case=ignore_case,
+                   ignore_space=ignore_space, with_wait=with_wait, strip=strip)
 
     def text_should_be_empty(self):
-        self.__wa.text_should_be_empty(locator=self.__locator)
+        self.__run(self.__wa.text_should_be_empty)
 
     def text_should_contain(self, exp_text: str, ignore_case: bool = False, ignore_space: bool = False):
-        self.__wa.text_should_contain(locator=self.__locator, exp_text=exp_text, ignore_case=ignore_case,
-                                      ignore_space=ignore_space)
+        self.__run(self.__wa.text_should_contain, exp_text=exp_text, ignore_case=ignore_case,
+                   ignore_space=ignore_space)
 
     def text_should_start_with(self, exp_text: str, ignore_case: bool = False, ignore_space: bool = False):
-        self.__wa.text_should_start_with(locator=self.__locator, exp_text=exp_text, ignore_case=ignore_case,
-                                         ignore_space=ignore_space)
+        self.__run(self.__wa.text_should_start_with, exp_text=exp_text, ignore_case=ignore_case,
+                   ignore_space=ignore_space)
 
     def text_should_end_with(self, exp_text: str, ignore_case: bool = False, ignore_space: bool = False):
-        self.__wa.text_should_end_with(locator=self.__locator, exp_text=exp_text, ignore_case=ignore_case,
-                                       ignore_space=ignore_space)
+        self.__run(self.__wa.text_should_end_with, exp_text=exp_text, ignore_case=ignore_case,
+                   ignore_space=ignore_space)
 
     def text_should_not_be_empty(self):
-        self.__wa.text_should_not_be_empty(locator=self.__locator)
+        self.__run(self.__wa.text_should_not_be_empty)
 
     def texts_should_contain(self, exp_text: str):
         self.__wa.texts_should_contain(locator=self.__locator, exp_text=exp_text)
 
     def type_number(self, number: str):
-        self.__wa.type_number(locator=self.__locator, number=number)
+        self.__run(self.__wa.type_number, number=number)
 
     def value_should_be(self, exp_value: str, ignore_case: bool = False, ignore_space: bool = False):
-        self.__wa.value_should_be(locator=self.__locator, exp_value=exp_value, ignore_case=ignore_case,
-                                  ignore_space=ignore_space)
+        self.__run(self.__wa.value_should_be, exp_value=exp_value, ignore_case=ignore_case,
+                   ignore_space=ignore_space)
 
     def value_should_be_empty(self):
-        self.__wa.value_should_be_empty(locator=self.__locator)
+        self.__run(self.__wa.value_should_be_empty)
 
     def value_should_not_be_empty(self):
-        self.__wa.value_should_not_be_empty(locator=self.__locator)
+        self.__run(self.__wa.value_should_not_be_empty)
 
     def value_should_contain(self, exp_text: str, ignore_case: bool = False, ignore_space: bool = False):
-        self.__wa.value_should_contain(locator=self.__locator, exp_text=exp_text, ignore_case=ignore_case,
-                                       ignore_space=ignore_space)
+        self.__run(self.__wa.value_should_contain, exp_text=exp_text, ignore_case=ignore_case,
+                   ignore_space=ignore_space)
 
     def value_should_start_with(self, exp_text: str, ignore_case: bool = False, ignore_space: bool = False):
-        self.__wa.value_should_start_with(locator=self.__locator, exp_text=exp_text, ignore_case=ignore_case,
-                                          ignore_space=ignore_space)
+        self.__run(self.__wa.value_should_start_with, exp_text=exp_text, ignore_case=ignore_case,
+                   ignore_space=ignore_space)
 
     def value_should_end_with(self, exp_text: str, ignore_case: bool = False, ignore_space: bool = False):
-        self.__wa.value_should_end_with(locator=self.__locator, exp_text=exp_text, ignore_case=ignore_case,
-                                        ignore_space=ignore_space)
+        self.__run(self.__wa.value_should_end_with, exp_text=exp_text, ignore_case=ignore_case,
+                   ignore_space=ignore_space)
 
     def wait_until_attribute_value_contains(self, attribute: str, exp_value: str, timeout: timedelta = None) -> str:
-        return self.__wa.wait_until_attribute_value_contains(locator=self.__locator, attribute=attribute,
-                                                             exp_value=exp_value, timeout=timeout)
+        return self.__run(self.__wa.wait_until_attribute_value_contains, attribute=attribute,
+                          exp_value=exp_value, timeout=timeout)
 
     def wait_until_count_is_greater_than(self, count: int, timeout: timedelta = None) -> int:
         return self.__wa.wait_until_count_is_greater_than(locator=self.__locator, count=count, timeout=timeout)
 
     def wait_until_text_is(self, exp_text: str, ignore_case: bool = False, ignore_space: bool = False,
                            timeout: timedelta = None) -> str:
-        return self.__wa.wait_until_text_is(locator=self.__locator, exp_text=exp_text, ignore_case=ignore_case,
-                                            ignore_space=ignore_space, timeout=timeout)
+        return self.__run(self.__wa.wait_until_text_is, exp_text=exp_text, ignore_case=ignore_case,
+                          ignore_space=ignore_space, timeout=timeout)
 
     def wait_until_text_is_not_empty(self, timeout: timedelta = None) -> str:
-        return self.__wa.wait_until_text_is_not_empty(locator=self.__locator, timeout=timeout)
+        return self.__run(self.__wa.wait_until_text_is_not_empty, timeout=timeout)
 
     def wait_until_found(self, timeout: timedelta = None):
         self.__wa.wait_until_found(locator=self.__locator, timeout=timeout)
 
     def wait_until_value_is_not_empty(self, timeout: timedelta = None):
-        self.__wa.wait_until_value_is_not_empty(locator=self.__locator, timeout=timeout)
+        self.__run(self.__wa.wait_until_value_is_not_empty, timeout=timeout)
 
     def wait_until_value_is(self, exp_value: str, ignore_case: bool = False, ignore_space: bool = False,
                             timeout: timedelta = None):
-        self.__wa.wait_until_value_is(locator=self.__locator, exp_value=exp_value, ignore_case=ignore_case,
-                                      ignore_space=ignore_space, timeout=timeout)
+        self.__run(self.__wa.wait_until_value_is, exp_value=exp_value, ignore_case=ignore_case,
+                   ignore_space=ignore_space, timeout=timeout)
 
     def wait_until_visible(self, timeout: timedelta = None):
         self.__wa.wait_until_visible(locator=self.__locator, timeout=timeout)
@@ -212,3 +285,22 @@ class _WebElement:
 
     def wait_until_enabled(self, timeout: timedelta = None):
         self.__wa.wait_until_enabled(locator=self.__locator, timeout=timeout)
+
+    def __run(self, func, **kwargs):
+        """Run the WebActions function against the resolved element when caching, otherwise against the locator."""
+        if self.__cache is None:
+            return func(locator=self.__locator, **kwargs)
+
+        timeout = kwargs.get("timeout") or self.__timeout
+        start = time.monotonic()
+        try:
+            return func(locator=self.__cache.resolve(), **kwargs)
+        except StaleElementReferenceException:
+            self.__cache.invalidate()
+
+        # the retry gets what is left of the timeout, not a new one
+        remaining = max(timeout - timedelta(seconds=time.monotonic() - start), timedelta(0))
+        if kwargs.get("timeout") is not None:
+            kwargs["timeout"] = remaining
+        wa = WebActions(ctx=self.__ctx, timeout=remaining, screenshot=self.__screenshot)
+        return getattr(wa, func.__name__)(locator=self.__locator, **kwargs)
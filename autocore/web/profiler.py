@@ -0,0 +1,182 @@
+"""
+Records where WebActions time goes: the latency of every WebDriver command and wait per method and per locator,
+the retries made by the exception handler and the time spent in sleep(). Timings are inclusive, a wait includes the
+reads it made. Disabled by default, the hot path then only checks a flag. Latencies are kept in fixed histogram
+buckets, p50 and p95 are interpolated within their bucket and are estimates.
+
+Profile a run with the listener, it writes the profile (.json or .csv) when the top level suite ends and adds a
+summary to the suite metadata:
+    robot --listener autocore.web.profiler.ProfilerListener:webactions_profile.json tests
+"""
+import csv
+import json
+import os
+import threading
+from bisect import bisect_left
+
+from robot.api import logger
+from robot.libraries.BuiltIn import BuiltIn
+
+# upper bounds of the latency histogram buckets in milliseconds, the last bucket is unbounded
+_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class _Histogram:
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * (len(_BUCKETS_MS) + 1)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.buckets[bisect_left(_BUCKETS_MS, seconds * 1000)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Estimate in seconds of the q-th percentile, interpolated linearly within the bucket that holds it and
+        kept between the recorded min and max.
+        """
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            if count > 0 and seen + count >= rank:
+                lower = _BUCKETS_MS[index - 1] / 1000 if index > 0 else 0.0
+                upper = _BUCKETS_MS[index] / 1000 if index < len(_BUCKETS_MS) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                return min(max(estimate, self.min), self.max)
+            seen += count
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "total_s": round(self.total, 6),
+                "mean_ms": round(self.total / self.count * 1000, 3), "min_ms": round(self.min * 1000, 3),
+                "max_ms": round(self.max * 1000, 3),
+                "p50_ms": round(self.percentile(0.5) * 1000, 3), "p95_ms": round(self.percentile(0.95) * 1000, 3),
+                "buckets_ms": {(f"<={bound}" if i < len(_BUCKETS_MS) else f">{_BUCKETS_MS[-1]}"): count
+                               for i, (bound, count) in enumerate(zip(_BUCKETS_MS + (None,), self.buckets))
+                               if count > 0}}
+
+
+class Profiler:
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.__lock = threading.Lock()
+        self.__methods: dict[str, _Histogram] = {}
+        self.__locators: dict[tuple[str, str], _Histogram] = {}
+        self.__retries: dict[tuple[str, str, str], int] = {}
+        self.__sleeps = 0
+        self.__slept = 0.0
+
+    def record(self, method: str, locator, seconds: float):
+        """Record the latency of a command or wait, ``locator`` is None for commands without one."""
+        with self.__lock:
+            self.__histogram(self.__methods, method).add(seconds)
+            if locator is not None:
+                self.__histogram(self.__locators, (method, str(locator))).add(seconds)
+
+    def retry(self, method: str, locator, reason: str):
+        key = (method, str(locator), reason)
+        with self.__lock:
+            self.__retries[key] = self.__retries.get(key, 0) + 1
+
+    def slept(self, seconds: float):
+        with self.__lock:
+            self.__sleeps += 1
+            self.__slept += seconds
+
+    def reset(self):
+        with self.__lock:
+            self.__methods.clear()
+            self.__locators.clear()
+            self.__retries.clear()
+            self.__sleeps = 0
+            self.__slept = 0.0
+
+    def summary(self) -> dict:
+        with self.__lock:
+            return {
+                "methods": {method: hist.to_dict() for method, hist in self.__methods.items()},
+                "locators": [{"method": method, "locator": locator, **hist.to_dict()}
+                             for (method, locator), hist in self.__locators.items()],
+                "retries": [{"method": method, "locator": locator, "reason": reason, "count": count}
+                            for (method, locator, reason), count in self.__retries.items()],
+                "sleep": {"count": self.__sleeps, "total_s": round(self.__slept, 6)},
+            }
+
+    def report(self, top: int = 10) -> str:
+        """Returns a short text summary, the methods and locators with the most time spent first."""
+        summary = self.summary()
+        methods = sorted(summary["methods"].items(), key=lambda item: item[1]["total_s"], reverse=True)[:top]
+        locators = sorted(summary["locators"], key=lambda item: item["total_s"], reverse=True)[:top]
+        lines = [f"{method}: {stats['count']} call/s, {stats['total_s']:.3f} s, p95 {stats['p95_ms']} ms"
+                 for method, stats in methods]
+        lines += [f"{item['method']} '{item['locator']}': {item['count']} call/s, {item['total_s']:.3f} s"
+                  for item in locators]
+        retries = sum(item["count"] for item in summary["retries"])
+        sleep = summary["sleep"]
+        lines.append(f"retries: {retries}, sleep: {sleep['count']} time/s {sleep['total_s']:.3f} s")
+        return "\n".join(lines)
+
+    def write(self, path: str):
+        """Write the profile as .json, or as .csv with a row per method and per method and locator."""
+        summary = self.summary()
+        if path.endswith(".csv"):
+            columns = ["method", "locator", "count", "total_s", "mean_ms", "min_ms", "max_ms", "p50_ms", "p95_ms"]
+            with open(path, "w", newline="", encoding="utf-8") as file:
+                writer = csv.DictWriter(file, fieldnames=columns, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows({"method": method, "locator": "", **stats}
+                                 for method, stats in summary["methods"].items())
+                writer.writerows(summary["locators"])
+        else:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(summary, file, indent=2)
+
+    @staticmethod
+    def __histogram(histograms: dict, key) -> _Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = _Histogram()
+        return histogram
+
+
+_profiler = Profiler()
+
+
+def profiler() -> Profiler:
+    """Returns the process wide profiler, e.g. to enable it outside of a robot run."""
+    return _profiler
+
+
+class ProfilerListener:
+    """Robot listener that profiles WebActions during the run. Writes the profile to ``output``, relative to the
+    robot output directory, and adds a summary to the metadata of the top level suite.
+    """
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, output: str = "webactions_profile.json"):
+        self.__output = output
+
+    def start_suite(self, data, result):
+        if data.parent is None:
+            _profiler.reset()
+            _profiler.enabled = True
+
+    def end_suite(self, data, result):
+        if data.parent is not None:
+            return
+
+        _profiler.enabled = False
+        path = self.__output
+        if not os.path.isabs(path):
+            path = os.path.join(BuiltIn().get_variable_value("${OUTPUT_DIR}", os.getcwd()), path)
+        _profiler.write(path)
+        result.metadata["WebActions Profile"] = _profiler.report()
+        logger.console(f"WebActions profile: {path}")
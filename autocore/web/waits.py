@@ -0,0 +1,279 @@
+"""
+Event driven waits. Conditions are evaluated inside the page by a single async script that re-checks the condition
+on every DOM mutation, so the wait resolves as soon as the condition is met instead of on the next poll.
+Falls back to polling when the script can not be executed, the delays between polls are chosen by the WaitScheduler
+from the time the condition took in earlier waits.
+"""
+import time
+import traceback
+from datetime import timedelta
+from typing import Any, Callable
+
+from SeleniumLibrary import SeleniumLibrary
+from robot.api import logger
+from selenium.common import StaleElementReferenceException, TimeoutException, WebDriverException
+from selenium.webdriver.remote.webelement import WebElement
+
+from autocore.web.profiler import profiler
+from autocore.web.waitscheduler import wait_scheduler
+
+TEXT = "text"
+VALUE = "value"
+ATTRIBUTE = "attribute"
+COUNT = "count"
+
+EQUALS = "equals"
+CONTAINS = "contains"
+NOT_EMPTY = "not_empty"
+GREATER_THAN = "greater_than"
+
+_SCRIPT_TIMEOUT_MARGIN = 0.5
+_MIN_SCRIPT_CHUNK = 0.25
+
+_profiler = profiler()
+_scheduler = wait_scheduler()
+
+_WAIT_FOR_CONDITION_JS = """
+var done = arguments[arguments.length - 1];
+var el = arguments[0], cond = arguments[1], timeoutMs = arguments[2];
+var finished = false, observer = null, ticker = null, timer = null, last = null;
+
+function norm(s) {
+    s = (s === null || s === undefined) ? '' : String(s);
+    if (cond.ignore_case) { s = s.toLowerCase(); }
+    if (cond.ignore_space) { s = s.split(' ').join('').trim(); }
+    return s;
+}
+
+function count() {
+    if (cond.strategy === 'xpath') {
+        return document.evaluate(cond.query, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null)
+            .snapshotLength;
+    }
+    return document.querySelectorAll(cond.query).length;
+}
+
+function read() {
+    if (cond.kind === 'count') { return count(); }
+    if (cond.kind === 'text') { return (el.innerText || '').trim(); }
+    if (cond.kind === 'value') { return el.value === undefined ? el.getAttribute('value') : el.value; }
+    // the property first and then the attribute, like selenium get_attribute
+    if (cond.name in el) {
+        var p = el[cond.name];
+        if (p !== null && p !== undefined && typeof p !== 'object' && typeof p !== 'function') { return p; }
+    }
+    return el.getAttribute(cond.name);
+}
+
+function met(v) {
+    if (cond.op === 'equals') { return norm(v) === cond.expected; }
+    if (cond.op === 'contains') { return v !== null && String(v).indexOf(cond.expected) !== -1; }
+    if (cond.op === 'not_empty') { return v !== null && String(v).length > 0; }
+    return v > cond.expected;
+}
+
+function finish(result) {
+    if (finished) { return; }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    if (el) {
+        el.removeEventListener('input', check);
+        el.removeEventListener('change', check);
+    }
+    clearInterval(ticker);
+    clearTimeout(timer);
+    done(result);
+}
+
+function check() {
+    if (el && !el.isConnected) { return finish({met: false, stale: true, value: last}); }
+    try {
+        last = read();
+        if (met(last)) { finish({met: true, stale: false, value: last}); }
+    } catch (e) {
+        finish({met: false, stale: true, value: last});
+    }
+}
+
+check();
+if (!finished) {
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement,
+        {subtree: true, childList: true, characterData: true, attributes: true});
+    if (el) {
+        // typing and programmatic value changes are not DOM mutations
+        el.addEventListener('input', check);
+        el.addEventListener('change', check);
+    }
+    ticker = setInterval(check, 100);
+    timer = setTimeout(function () { finish({met: false, stale: false, value: last}); }, timeoutMs);
+}
+"""
+
+
+def sleep(seconds: float = 0):
+    """Pause execution in seconds."""
+    if seconds < 0:
+        seconds = 0
+    if _profiler.enabled:
+        _profiler.slept(seconds)
+
+    # time.sleep can't be stopped in windows
+    # to ensure that we can signal stop (with timeout)
+    # split sleeping to small pieces
+    # reference: robot BuiltIn().sleep()
+    end_time = time.time() + seconds
+    while True:
+        remaining = end_time - time.time()
+        if remaining <= 0:
+            break
+        time.sleep(min(remaining, 0.01))
+
+
+def _js_locator(locator: str):
+    """Returns the (strategy, query) pair of locators that can be evaluated in the page, otherwise None."""
+    if locator.startswith("//") or locator.startswith("(//"):
+        return "xpath", locator
+
+    for separator in (":", "="):
+        strategy, sep, query = locator.partition(separator)
+        if not sep:
+            continue
+        strategy = strategy.strip().lower()
+        query = query.strip()
+        if strategy == "xpath":
+            return "xpath", query
+        if strategy == "css":
+            return "css", query
+        if strategy == "id":
+            return "css", f"[id=\"{query}\"]"
+        if strategy == "name":
+            return "css", f"[name=\"{query}\"]"
+        if strategy == "class":
+            return "css", f"[class~=\"{query}\"]"
+    return None
+
+
+class WaitEngine:
+    """Waits for a condition of an element to be met.
+
+    The condition is checked in the page through a MutationObserver so the wait returns the moment the condition
+    becomes true. If the in-page wait is not possible (script execution not allowed, element went stale, locator
+    strategy not supported in the page) it polls ``read`` for the remaining time. The time the condition took is
+    recorded per condition, expected value and locator, see WaitScheduler.
+    """
+
+    def __init__(self, ctx: SeleniumLibrary, event_driven: bool = True):
+        self.__ctx = ctx
+        self.__event_driven = event_driven
+
+    @property
+    def event_driven(self) -> bool:
+        return self.__event_driven
+
+    @event_driven.setter
+    def event_driven(self, value: bool):
+        self.__event_driven = value
+
+    def until(self, kind: str, op: str, expected: Any, read: Callable[[], Any], check: Callable[[Any], bool],
+              timeout: timedelta, max_delay: float, element: Callable[[], WebElement] = None, locator: str = None,
+              **params) -> tuple[bool, Any]:
+        """Wait until the condition is met. Returns a tuple of (met, actual value).
+
+        ``read`` and ``check`` are used when polling and for the final authoritative check, these should behave the
+        same as the in-page condition described by ``kind``, ``op`` and ``expected``.
+        """
+        if not _profiler.enabled:
+            return self.__until(kind, op, expected, read, check, timeout, max_delay, element, locator, **params)
+
+        start = time.perf_counter()
+        try:
+            return self.__until(kind, op, expected, read, check, timeout, max_delay, element, locator, **params)
+        finally:
+            _profiler.record(f"wait_until_{kind}_{op}", locator, time.perf_counter() - start)
+
+    def __until(self, kind: str, op: str, expected: Any, read: Callable[[], Any], check: Callable[[Any], bool],
+                timeout: timedelta, max_delay: float, element: Callable[[], WebElement], locator: str,
+                **params) -> tuple[bool, Any]:
+        started = time.monotonic()
+        deadline = started + timeout.total_seconds()
+        key = None
+        if locator is not None:
+            key = f"{kind}_{op} {locator}" if expected is None else f"{kind}_{op} {expected!r} {locator}"
+
+        if self.__event_driven:
+            cond = dict(kind=kind, op=op, expected=expected, **params)
+            if kind != COUNT:
+                return self.__in_page(element(), cond, read, check, deadline, max_delay, key, started)
+
+            js_locator = _js_locator(locator)
+            if js_locator is not None:
+                cond["strategy"], cond["query"] = js_locator
+                return self.__in_page(None, cond, read, check, deadline, max_delay, key, started)
+
+        return self.poll(read=read, check=check, deadline=deadline, max_delay=max_delay, key=key, started=started)
+
+    def poll(self, read: Callable[[], Any], check: Callable[[Any], bool], deadline: float, max_delay: float,
+             key: str = None, started: float = None) -> tuple[bool, Any]:
+        """Poll ``read`` until ``check`` passes or ``deadline`` (time.monotonic) is reached.
+        The delays come from the history of ``key`` (condition and locator), backing off up to ``max_delay``. When the
+        condition is met the wait time since ``started``, by default the first poll, is recorded for the key.
+        """
+        if started is None:
+            started = time.monotonic()
+        delays = _scheduler.delays(key, max_delay)
+        value = read()
+
+        while not check(value):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False, value
+            sleep(min(next(delays), remaining))
+            value = read()
+
+        _scheduler.record(key, started)
+        return True, value
+
+    def __in_page(self, el: WebElement, cond: dict, read: Callable[[], Any], check: Callable[[Any], bool],
+                  deadline: float, max_delay: float, key: str, started: float) -> tuple[bool, Any]:
+        # the async script is bounded by the driver script timeout, wait in chunks below it
+        chunk = max(float(self.__ctx.timeout) - _SCRIPT_TIMEOUT_MARGIN, _MIN_SCRIPT_CHUNK)
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            try:
+                result = self.__ctx.driver.execute_async_script(_WAIT_FOR_CONDITION_JS, el, cond,
+                                                                int(min(remaining, chunk) * 1000))
+            except TimeoutException:
+                continue
+            except StaleElementReferenceException:
+                return self.poll(read=read, check=check, deadline=deadline, max_delay=max_delay, key=key,
+                                 started=started)
+            except WebDriverException:
+                logger.debug("In-page wait is not available, falling back to polling.")
+                logger.debug(traceback.format_exc())
+                return self.poll(read=read, check=check, deadline=deadline, max_delay=max_delay, key=key,
+                                 started=started)
+
+            if result["met"]:
+                # in-page reads can differ slightly from webdriver reads (e.g. innerText and the rendered text),
+                # return what webdriver reads and keep waiting if it does not agree
+                value = read()
+                if check(value):
+                    _scheduler.record(key, started)
+                    return True, value
+                return self.poll(read=read, check=check, deadline=deadline, max_delay=max_delay, key=key,
+                                 started=started)
+            if result["stale"]:
+                return self.poll(read=read, check=check, deadline=deadline, max_delay=max_delay, key=key,
+                                 started=started)
+
+        # in-page reads can differ slightly from webdriver reads, let webdriver have the final say.
+        value = read()
+        met = check(value)
+        if met:
+            _scheduler.record(key, started)
+        return met, value
@@ -0,0 +1,212 @@
+"""
+Schedules the polls of waits from the time each condition took to be met in earlier waits. A condition that is
+usually met within 50 ms is polled early and often, one that takes seconds is first polled shortly before it is
+usually met instead of on every step of the backoff. Without history the polls start at 50 ms and back off by 1.5x.
+
+The history is kept per condition, expected value and locator in a small JSON file, shared by runs and parallel
+workers:
+    AUTOCORE_WAIT_HISTORY=wait_history.json robot tests \n
+    robot --listener autocore.web.waitscheduler.WaitHistoryListener:wait_history.json tests
+
+Waits that time out are not recorded, probes such as is_text time out routinely and their wait time says nothing
+about when the condition is met. No delay exceeds the max delay of the wait, so a history that is out of date costs
+at most one late poll. Keys not recorded for ``max_age_days`` are dropped, and only the ``max_keys`` most recent are
+kept.
+"""
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+from robot.api import logger
+
+from autocore.stats import percentile
+
+_MIN_DELAY = 0.01
+_MIN_SAMPLES = 3
+# the first poll is made at this fraction of the usual earliest time, so a condition that got faster is still seen
+# early and its history catches up
+_FIRST_POLL_FACTOR = 0.5
+# polls between the usual earliest and latest times
+_POLLS_IN_SPREAD = 4
+
+
+class LatencyHistory:
+    """The last ``max_samples`` times to condition in seconds per key, loaded from and saved to ``path``."""
+
+    def __init__(self, path: str = None, max_samples: int = 50, max_keys: int = 2000, max_age_days: float = 30):
+        self.__max_samples = max_samples
+        self.__max_keys = max_keys
+        self.__max_age = max_age_days * 24 * 3600
+        self.__lock = threading.Lock()
+        self.__samples: dict[str, list[float]] = {}
+        # time.time of the last sample per key
+        self.__updated: dict[str, float] = {}
+        self.__new: dict[str, list[float]] = {}
+        self.__path = None
+        if path is not None:
+            self.load(path)
+
+    @property
+    def path(self) -> str | None:
+        return self.__path
+
+    def samples(self, key: str) -> list[float]:
+        with self.__lock:
+            return list(self.__samples.get(key, ()))
+
+    def record(self, key: str, seconds: float):
+        seconds = round(seconds, 3)
+        with self.__lock:
+            self.__samples[key] = (self.__samples.get(key, []) + [seconds])[-self.__max_samples:]
+            self.__updated[key] = time.time()
+            self.__new.setdefault(key, []).append(seconds)
+
+    def load(self, path: str):
+        """Use the history at ``path``, the samples recorded so far are kept and saved there."""
+        samples, updated = _read(path)
+        with self.__lock:
+            self.__path = path
+            self.__merge(samples, updated)
+
+    def save(self):
+        """Add the samples recorded since the last load or save to the file, keeping those saved by other workers."""
+        if self.__path is None:
+            return
+        with self.__lock:
+            if len(self.__new) == 0:
+                return
+            directory = os.path.dirname(os.path.abspath(self.__path))
+            os.makedirs(directory, exist_ok=True)
+            # read, merge and replace under a lock file, workers saving at the same time would drop each other's samples
+            with _file_lock(f"{self.__path}.lock"):
+                samples, updated = _read(self.__path)
+                self.__merge(samples, updated)
+                self.__new = {}
+                fd, temp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as file:
+                    json.dump({"samples": self.__samples, "updated": self.__updated}, file)
+                os.replace(temp, self.__path)
+
+    def clear(self):
+        with self.__lock:
+            self.__samples.clear()
+            self.__updated.clear()
+            self.__new.clear()
+
+    def __merge(self, samples: dict[str, list[float]], updated: dict[str, float]):
+        now = time.time()
+        for key, new in self.__new.items():
+            samples[key] = (samples.get(key, []) + new)[-self.__max_samples:]
+            updated[key] = self.__updated.get(key, now)
+
+        # histories written before the keys were dated are aged from now
+        keys = [key for key in samples if now - updated.get(key, now) <= self.__max_age]
+        keys.sort(key=lambda key: updated.get(key, now), reverse=True)
+        keys = keys[:self.__max_keys]
+        self.__samples = {key: samples[key] for key in keys}
+        self.__updated = {key: updated.get(key, now) for key in keys}
+
+
+def _read(path: str) -> tuple[dict[str, list[float]], dict[str, float]]:
+    try:
+        with open(path, encoding="utf-8") as file:
+            history = json.load(file)
+        return history["samples"], history.get("updated", {})
+    except FileNotFoundError:
+        return {}, {}
+    except (ValueError, KeyError, AttributeError):
+        logger.warn(f"Wait history {path} is not readable, starting a new one.")
+        return {}, {}
+
+
+@contextmanager
+def _file_lock(path: str):
+    with open(path, "a+b") as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class WaitScheduler:
+    """Chooses the delays between the polls of a wait from the history of its key. With ``adaptive`` off the polls
+    always start at ``min_delay`` and back off by ``backoff``.
+    """
+
+    def __init__(self, history: LatencyHistory = None, min_delay: float = 0.05, backoff: float = 1.5,
+                 adaptive: bool = True):
+        self.history = history if history is not None else LatencyHistory()
+        self.adaptive = adaptive
+        self.__min_delay = min_delay
+        self.__backoff = backoff
+
+    def delays(self, key: str | None, max_delay: float) -> Iterator[float]:
+        """Yields the delays before each poll, none exceeds ``max_delay``. For conditions that are usually met late
+        the first delay skips the early polls, the following ones back off up to ``max_delay``.
+        """
+        samples = sorted(self.history.samples(key)) if self.adaptive and key is not None else []
+        if len(samples) < _MIN_SAMPLES:
+            delay = min(self.__min_delay, max_delay)
+        else:
+            earliest, latest = percentile(samples, 0.1), percentile(samples, 0.9)
+            yield min(max(earliest * _FIRST_POLL_FACTOR, _MIN_DELAY), max_delay)
+            delay = min(max((latest - earliest) / _POLLS_IN_SPREAD, _MIN_DELAY), max_delay)
+
+        while True:
+            yield delay
+            delay = min(delay * self.__backoff, max_delay)
+
+    def record(self, key: str | None, started: float):
+        """Record the time the wait of the key took until the condition was met. ``started`` is the time.monotonic
+        the wait started. Do not record waits that timed out.
+        """
+        if key is not None:
+            self.history.record(key, time.monotonic() - started)
+
+
+_scheduler = WaitScheduler(LatencyHistory(os.environ.get("AUTOCORE_WAIT_HISTORY")))
+atexit.register(_scheduler.history.save)
+
+
+def wait_scheduler() -> WaitScheduler:
+    """Returns the process wide scheduler used by WebActions waits."""
+    return _scheduler
+
+
+class WaitHistoryListener:
+    """Robot listener that loads the wait history from ``path`` when the run starts and saves it when it ends."""
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, path: str = "wait_history.json"):
+        self.__path = os.path.abspath(path)
+
+    def start_suite(self, data, result):
+        if data.parent is None:
+            _scheduler.history.load(self.__path)
+
+    def end_suite(self, data, result):
+        if data.parent is None:
+            _scheduler.history.save()
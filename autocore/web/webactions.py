@@ -15,23 +15,48 @@ from selenium.webdriver.support.select import Select
 from autocore.asserts import assert_equal, assert_that_text_ends_with, assert_that_text_starts_with, \
     assert_that_text_contains, assert_that_text_is_not_empty, assert_that_list_contains_all, assert_true, assert_false, \
     assert_that_list_has_item
-
-
-def sleep(seconds: float = 0):
-    """Pause execution in seconds."""
-    if seconds < 0:
-        seconds = 0
-
-    # time.sleep can't be stopped in windows
-    # to ensure that we can signal stop (with timeout)
-    # split sleeping to small pieces
-    # reference: robot BuiltIn().sleep()
-    end_time = time.time() + seconds
-    while True:
-        remaining = end_time - time.time()
-        if remaining <= 0:
-            break
-        time.sleep(min(remaining, 0.01))
+from autocore.web.browserbroker import BrowserBrokerClient
+from autocore.web.browserpool import BrowserPool
+from autocore.web.profiler import profiler
+from autocore.web.waits import WaitEngine, TEXT, VALUE, ATTRIBUTE, COUNT, EQUALS, CONTAINS, NOT_EMPTY, \
+    GREATER_THAN
+
+_profiler = profiler()
+
+_READ_ELEMENTS_JS = """
+var elements = arguments[0], attributes = arguments[1] || [];
+
+// like webdriver, elements that are not rendered, not visible or fully transparent have no text
+function shown(el) {
+    if (el.getClientRects().length === 0) { return false; }
+    if (window.getComputedStyle(el).visibility !== 'visible') { return false; }
+    for (var e = el; e; e = e.parentElement) {
+        if (Number(window.getComputedStyle(e).opacity) === 0) { return false; }
+    }
+    return true;
+}
+
+// like webdriver, spaces are collapsed and the lines trimmed, non breaking spaces are kept as spaces
+function visibleText(el) {
+    return (el.innerText || '').split('\\n').map(function (line) {
+        return line.replace(/[ \\t\\r\\f\\v]+/g, ' ').replace(/^ | $/g, '');
+    }).join('\\n').replace(/^\\n+|\\n+$/g, '').replace(/\\u00a0/g, ' ');
+}
+
+return elements.map(function (el) {
+    var item = {
+        text: shown(el) ? visibleText(el) : '',
+        value: el.value === undefined ? el.getAttribute('value') : el.value,
+        attributes: {}
+    };
+    attributes.forEach(function (name) {
+        var v = el.getAttribute(name);
+        if (v === null && name in el) { v = el[name]; }
+        item.attributes[name] = v;
+    });
+    return item;
+});
+"""
 
 
 def _transform(text: str, remove_case: bool = False, remove_spaces: bool = False, strip: bool = False) -> str:
@@ -46,7 +71,9 @@ def _transform(text: str, remove_case: bool = False, remove_spaces: bool = False
 
 
 def _get_retry_count(timeout: timedelta) -> int:
-    """Return the retry count based on the timeout provided."""
+    """Return the retry count based on the timeout provided. The timeout divided by it is the longest delay between
+    the polls of a wait, the first polls are scheduled from the history of the condition, see WaitScheduler.
+    """
     if timeout is None:
         raise Exception("Timeout can not be None.")
 
@@ -106,6 +133,20 @@ def _random_item(lst, except_for=None):
 
         return rule
 
+_navigations = 0
+
+
+def navigation_epoch() -> int:
+    """Returns a counter that changes whenever the browsing context changes (navigation, reload, frame switch).
+    Resolved WebElements from an older epoch should be considered stale.
+    """
+    return _navigations
+
+
+def _navigated():
+    global _navigations
+    _navigations += 1
+
 
 class WebActions:
 
@@ -113,6 +154,7 @@ class WebActions:
         self.__ctx = ctx
         self.__timeout = timeout
         self.__screenshot = screenshot
+        self.__waits = WaitEngine(ctx=ctx)
 
     def attribute_ends_with(self, locator: str, attribute: str, exp_value: str) -> bool:
         """Returns True if attribute of the element ends with the exp value, otherwise false."""
@@ -167,10 +209,12 @@ class WebActions:
 
     def close_browser(self):
         """Close browser."""
+        _navigated()
         self.__ctx.close_browser()
 
     def close_all_browsers(self):
         """Close all browsers."""
+        _navigated()
         self.__ctx.close_all_browsers()
 
     def count(self, locator: str) -> int:
@@ -209,6 +253,10 @@ class WebActions:
     def double_click(self, locator: str):
         self.__exception_handler(func=self.__ctx.double_click_element, locator=locator)
 
+    def find_element(self, locator: str) -> WebElement:
+        """Returns the element, waits until the element is found if it is not yet present."""
+        return self.__exception_handler(func=self.__ctx.find_element, locator=locator)
+
     def find_elements(self, locator: str):
         return self.__ctx.find_elements(locator)
 
@@ -233,9 +281,11 @@ class WebActions:
         return self.__exception_handler(func=self.__ctx.get_text, locator=locator)
 
     def get_texts(self, locator: str) -> list[str]:
-        """Returns a list of texts of the element/s."""
-        elements = self.__ctx.find_elements(locator=locator)
-        return [self.__exception_handler(func=self.__ctx.get_text, locator=element) for element in elements]
+        """Returns a list of the visible texts of the element/s, read in one script. Hidden elements (not rendered,
+        visibility or opacity 0) have no text and spaces are collapsed like in get_text, but text that webdriver
+        also hides (e.g. clipped by overflow) is returned.
+        """
+        return [item["text"] for item in self.read_elements(locator=locator)]
 
     def get_value(self, locator: str) -> str:
         """Returns the value of the element. When using this, make sure that the locator is unique."""
@@ -243,14 +293,25 @@ class WebActions:
         return self.__exception_handler(func=self.__ctx.get_value, locator=locator)
 
     def get_values(self, locator: str):
-        """Returns a list of values of the element/s."""
-        elements = self.__ctx.find_elements(locator=locator)
-        return [self.__exception_handler(func=self.__ctx.get_value, locator=element) for element in elements]
+        """Returns a list of values of the element/s, the value property or else the value attribute like
+        get_value.
+        """
+        return [item["value"] for item in self.read_elements(locator=locator)]
 
     def go_to(self, url: str):
         """Open the url on the current browser window."""
+        _navigated()
         self.__ctx.go_to(url=url)
 
+    def read_elements(self, locator: str, attributes: list[str] = None) -> list[dict]:
+        """Returns the text, value and the given attributes of every element located by the locator.
+        All elements are read in a single script call instead of one webdriver command per element.
+
+        Example:
+            read_elements('css:.item', ['class']) -> [{'text': 'Item', 'value': None, 'attributes': {'class': 'item'}}]
+        """
+        return self.__exception_handler(func=self.__read_elements, locator=locator, attributes=attributes)
+
     def highlight(self, locator: str):
         pass
         # try:
@@ -334,9 +395,20 @@ class WebActions:
         """Returns True if the element is selected, otherwise False."""
         return self.__exception_handler(func=self.__ctx.find_element, locator=locator).is_selected()
 
-    def open_browser(self, url, browser, options, alias):
-        """Creates a new web driver and then open the url on the specified browser."""
-        self.__ctx.open_browser(url=url, browser=browser, options=options, alias=alias)
+    def open_browser(self, url, browser, options, alias, pool: BrowserPool | BrowserBrokerClient = None):
+        """Creates a new web driver and then open the url on the specified browser.
+        If a ``pool`` is provided, a warm driver is leased from it instead and closing the browser returns it.
+        """
+        _navigated()
+        if pool is None:
+            self.__ctx.open_browser(url=url, browser=browser, options=options, alias=alias)
+            return
+
+        driver = pool.lease()
+        driver.set_script_timeout(self.__ctx.timeout)
+        driver.implicitly_wait(self.__ctx.implicit_wait)
+        self.__ctx.register_driver(driver, alias)
+        self.__ctx.go_to(url=url)
 
     def press_enter(self, locator: str):
         """Press enter."""
@@ -346,6 +418,7 @@ class WebActions:
 
     def reload_browser(self):
         """Reload the browser."""
+        _navigated()
         self.__ctx.reload_page()
 
     def scroll_into_view(self, locator):
@@ -361,6 +434,7 @@ class WebActions:
 
     def select_frame(self, locator: str):
         """Select the frame/iFrame."""
+        _navigated()
         self.__exception_handler(func=self.__ctx.select_frame, locator=locator)
 
     def select_options_should_contain_text(self, locator: str, exp_text: str):
@@ -379,6 +453,7 @@ class WebActions:
 
     def switch_to_default_content(self):
         """Switch to default content."""
+        _navigated()
         self.__ctx.driver.switch_to.default_content()
 
     def should_be_visible(self, locator: str, timeout: timedelta = None):
@@ -538,6 +613,7 @@ class WebActions:
     def unselect_frame(self):
         """Unselect the current selected frame/iFrame."""
         logger.info("Unselecting Frame")
+        _navigated()
         self.__ctx.unselect_frame()
 
     def value_should_be(self, locator: str, exp_value: str, ignore_case: bool = False, ignore_space: bool = False):
@@ -604,20 +680,11 @@ class WebActions:
         if timeout is None:
             timeout = self.__timeout
 
-        retries = _get_retry_count(timeout=timeout)
-        delay = timeout.total_seconds() / retries
-        act_value = self.get_attribute(locator=locator, attribute=attribute)
-        present = False
-
-        while not present:
-            if retries == 0:
-                break
-            if exp_value in act_value:
-                present = True
-                break
-            sleep(seconds=delay)
-            act_value = self.get_attribute(locator=locator, attribute=attribute)
-            retries -= 1
+        present, act_value = self.__waits.until(kind=ATTRIBUTE, op=CONTAINS, expected=exp_value, name=attribute,
+                                                read=lambda: self.get_attribute(locator=locator, attribute=attribute),
+                                                check=lambda act: act is not None and exp_value in act,
+                                                timeout=timeout, max_delay=self.__max_poll_delay(timeout),
+                                                element=lambda: self.find_element(locator=locator), locator=locator)
 
         if not present:
             raise TimeoutException(
@@ -633,18 +700,13 @@ class WebActions:
         if timeout is None:
             timeout = self.__timeout
 
-        retries = _get_retry_count(timeout=timeout)
-        delay = timeout.total_seconds() / retries
-        act_count = self.count(locator=locator)
-        while act_count <= count:
-            if retries == 0:
-                break
-
-            sleep(seconds=delay)
-            act_count = self.count(locator=locator)
-            retries -= 1
+        greater, act_count = self.__waits.until(kind=COUNT, op=GREATER_THAN, expected=count,
+                                                read=lambda: self.count(locator=locator),
+                                                check=lambda act: act > count,
+                                                timeout=timeout, max_delay=self.__max_poll_delay(timeout),
+                                                locator=locator)
 
-        if act_count <= count:
+        if not greater:
             raise TimeoutException(
                 f"Cannot wait until count of element located by '{locator}' to be greater than {count}. Actual count: {act_count}.")
 
@@ -659,23 +721,17 @@ class WebActions:
         if timeout is None:
             timeout = self.__timeout
 
-        retries = _get_retry_count(timeout=timeout)
-        delay = timeout.total_seconds() / retries
-
         exp_text_transformed = _transform(exp_text, ignore_case, ignore_space)
 
-        act_text = self.get_text(locator=locator)
-        act_text_transformed = _transform(act_text, ignore_case, ignore_space)
-
-        while exp_text_transformed != act_text_transformed:
-            if retries == 0:
-                break
-            sleep(seconds=delay)
-            act_text = self.get_text(locator=locator)
-            act_text_transformed = _transform(act_text, ignore_case, ignore_space)
-            retries -= 1
+        present, act_text = self.__waits.until(kind=TEXT, op=EQUALS, expected=exp_text_transformed,
+                                               ignore_case=ignore_case, ignore_space=ignore_space,
+                                               read=lambda: self.get_text(locator=locator),
+                                               check=lambda act: _transform(act, ignore_case,
+                                                                            ignore_space) == exp_text_transformed,
+                                               timeout=timeout, max_delay=self.__max_poll_delay(timeout),
+                                               element=lambda: self.find_element(locator=locator), locator=locator)
 
-        if exp_text_transformed != act_text_transformed:
+        if not present:
             raise TimeoutException(
                 f"Cannot for the text of element located by '{locator}' to be {exp_text}. Actual text: {act_text}")
 
@@ -689,18 +745,13 @@ class WebActions:
         if timeout is None:
             timeout = self.__timeout
 
-        retries = _get_retry_count(timeout=timeout)
-        delay = timeout.total_seconds() / retries
-        text = self.get_text(locator=locator)
-
-        while (text is None) or (len(text) == 0):
-            if retries == 0:
-                break
-            sleep(delay)
-            text = self.get_text(locator=locator)
-            retries -= 1
+        present, text = self.__waits.until(kind=TEXT, op=NOT_EMPTY, expected=None,
+                                           read=lambda: self.get_text(locator=locator),
+                                           check=lambda act: (act is not None) and (len(act) > 0),
+                                           timeout=timeout, max_delay=self.__max_poll_delay(timeout),
+                                           element=lambda: self.find_element(locator=locator), locator=locator)
 
-        if (text is None) or (len(text) == 0):
+        if not present:
             raise Exception(f"Can't wait for the text of element located by '{locator}' to appear.")
 
         return text
@@ -717,17 +768,13 @@ class WebActions:
         if timeout is None:
             timeout = self.__timeout
 
-        retries = _get_retry_count(timeout=timeout)
-        delay = timeout.total_seconds() / retries
-        value = self.get_value(locator=locator)
-        while (value is None) or (len(value) == 0):
-            if retries == 0:
-                break
-            sleep(delay)
-            value = self.get_value(locator=locator)
-            retries -= 1
-
-        if (value is None) or (len(value) == 0):
+        present, value = self.__waits.until(kind=VALUE, op=NOT_EMPTY, expected=None,
+                                            read=lambda: self.get_value(locator=locator),
+                                            check=lambda act: (act is not None) and (len(act) > 0),
+                                            timeout=timeout, max_delay=self.__max_poll_delay(timeout),
+                                            element=lambda: self.find_element(locator=locator), locator=locator)
+
+        if not present:
             raise Exception(f"Can't for the value of element located by '{locator}' to appear.")
 
         return value
@@ -741,23 +788,17 @@ class WebActions:
         if timeout is None:
             timeout = self.__timeout
 
-        retries = _get_retry_count(timeout=timeout)
-        delay = timeout.total_seconds() / retries
-
         exp_value_transformed = _transform(exp_value, ignore_case, ignore_space)
 
-        act_value = self.get_value(locator=locator)
-        act_value_transformed = _transform(act_value, ignore_case, ignore_space)
-
-        while exp_value_transformed != act_value_transformed:
-            if retries == 0:
-                break
-            sleep(seconds=delay)
-            act_value = self.get_value(locator=locator)
-            act_value_transformed = _transform(act_value, ignore_case, ignore_space)
-            retries -= 1
+        present, act_value = self.__waits.until(kind=VALUE, op=EQUALS, expected=exp_value_transformed,
+                                                ignore_case=ignore_case, ignore_space=ignore_space,
+                                                read=lambda: self.get_value(locator=locator),
+                                                check=lambda act: _transform(act, ignore_case,
+                                                                             ignore_space) == exp_value_transformed,
+                                                timeout=timeout, max_delay=self.__max_poll_delay(timeout),
+                                                element=lambda: self.find_element(locator=locator), locator=locator)
 
-        if exp_value_transformed != act_value_transformed:
+        if not present:
             raise TimeoutException(
                 f"Cannot wait for the value of element located by '{locator}' to be {exp_value}. Actual value: {act_value}.")
 
@@ -791,62 +832,70 @@ class WebActions:
             timeout = self.__timeout
         self.__exception_handler(func=self.__ctx.wait_until_element_is_enabled, locator=locator, timeout=timeout)
 
+    @staticmethod
+    def __max_poll_delay(timeout: timedelta) -> float:
+        """The longest delay between polls, this is the fixed delay used before waits backed off adaptively."""
+        return timeout.total_seconds() / _get_retry_count(timeout=timeout)
+
     def __get_select_element(self, locator: str) -> Select:
         self.__exception_handler(func=self.highlight, locator=locator)
         element = self.__exception_handler(func=self.__ctx.find_element, locator=locator)
         return Select(webelement=element)
 
     def __exception_handler(self, func, *args, **kwargs):
+        if not _profiler.enabled:
+            return self.__handle(func, *args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return self.__handle(func, *args, **kwargs)
+        finally:
+            _profiler.record(func.__name__, kwargs.get("locator"), time.perf_counter() - start)
+
+    def __handle(self, func, *args, **kwargs):
         try:
             return func(*args, **kwargs)
         except ElementNotFound:
+            self.__retried(func, kwargs, "not found")
             self.__wait_until_element_is_found(locator=kwargs.get("locator"), timeout=kwargs.get("timeout"))
             return func(*args, **kwargs)
         except ElementNotInteractableException:
+            self.__retried(func, kwargs, "not interactable")
             self.__wait_until_element_is_interactible(locator=kwargs.get("locator"), timeout=kwargs.get("timeout"))
             return func(*args, **kwargs)
         except StaleElementReferenceException:
+            if isinstance(kwargs.get("locator"), WebElement):
+                # a resolved element can not recover, let the owner re-resolve its locator
+                raise
+            self.__retried(func, kwargs, "stale")
             self.__wait_until_element_is_not_stale(locator=kwargs.get("locator"), timeout=kwargs.get("timeout"))
             return func(*args, **kwargs)
 
+    @staticmethod
+    def __retried(func, kwargs: dict, reason: str):
+        if _profiler.enabled:
+            _profiler.retry(func.__name__, kwargs.get("locator"), reason)
+
     def __wait_until_element_is_found(self, locator: str, timeout: timedelta = None):
         if timeout is None:
             timeout = self.__timeout
 
-        retries = _get_retry_count(timeout=timeout)
-        delay = timeout.total_seconds() / retries
-        elements = self.__ctx.find_elements(locator=locator)
+        found, _ = self.__waits.poll(read=lambda: len(self.__ctx.find_elements(locator=locator)),
+                                     check=lambda count: count > 0,
+                                     deadline=time.monotonic() + timeout.total_seconds(),
+                                     max_delay=self.__max_poll_delay(timeout), key=f"found {locator}")
 
-        while len(elements) == 0:
-            sleep(delay)
-            elements = self.__ctx.find_elements(locator=locator)
-
-            if retries == 0:
-                break
-            retries -= 1
-
-        if len(elements) == 0:
+        if not found:
             raise ElementNotFound(f"Element with locator '{locator}' not found.")
 
     def __wait_until_element_is_interactible(self, locator: str, timeout: timedelta = None):
         if timeout is None:
             timeout = self.__timeout
 
-        retries = _get_retry_count(timeout=timeout)
-        delay = timeout.total_seconds() / retries
-        interactible = False
-
-        while retries > 0:
-            try:
-                self.__ctx.get_text(locator=locator)
-                self.__ctx.get_value(locator=locator)
-                interactible = True
-                break
-            except ElementNotInteractableException:
-                sleep(delay)
-            except ElementClickInterceptedException:
-                sleep(delay)
-            retries -= 1
+        interactible, _ = self.__waits.poll(read=lambda: self.__can_read(locator, ElementNotInteractableException,
+                                                                         ElementClickInterceptedException),
+                                            check=bool, deadline=time.monotonic() + timeout.total_seconds(),
+                                            max_delay=self.__max_poll_delay(timeout), key=f"interactible {locator}")
 
         if not interactible:
             raise ElementNotInteractableException(f"Element located by '{locator}' is not interactible.")
@@ -855,23 +904,28 @@ class WebActions:
         if timeout is None:
             timeout = self.__timeout
 
-        retries = _get_retry_count(timeout=timeout)
-        delay = timeout.total_seconds() / retries
-        stale = True
+        readable, _ = self.__waits.poll(read=lambda: self.__can_read(locator, StaleElementReferenceException),
+                                        check=bool, deadline=time.monotonic() + timeout.total_seconds(),
+                                        max_delay=self.__max_poll_delay(timeout), key=f"not_stale {locator}")
 
-        while retries > 0:
-            try:
-                self.__ctx.get_text(locator)
-                self.__ctx.get_value(locator)
-                stale = False
-                break
-            except StaleElementReferenceException:
-                sleep(delay)
-            retries -= 1
-
-        if stale:
+        if not readable:
             raise StaleElementReferenceException(f"Element located by '{locator}' is stale.")
 
+    def __can_read(self, locator: str, *errors: type[Exception]) -> bool:
+        """Returns True if the text and value of the element can be read, False if reading raised one of ``errors``."""
+        try:
+            self.__ctx.get_text(locator)
+            self.__ctx.get_value(locator)
+            return True
+        except errors:
+            return False
+
+    def __read_elements(self, locator: str, attributes: list[str] = None) -> list[dict]:
+        elements = self.__ctx.find_elements(locator=locator)
+        if len(elements) == 0:
+            return []
+        return self.__ctx.execute_javascript(_READ_ELEMENTS_JS, "ARGUMENTS", elements, attributes or [])
+
     def __force_click_element_via_js_executor(self, locator: str):
         try:
             self.__ctx.execute_javascript("arguments[0].click()", "ARGUMENTS", self.__ctx.find_element(locator=locator))
@@ -1,13 +1,15 @@
 from SeleniumLibrary import SeleniumLibrary
 from robot.api.deco import keyword
 
+from autocore.web.browserbroker import BrowserBrokerClient
+from autocore.web.browserpool import BrowserPool
 from sauce_demo_ui.page_objects import SauceDemoApp
 
 
 class BrowserKeywords:
 
-    def __init__(self, se_lib: SeleniumLibrary, headless: bool = True):
-        self.app = SauceDemoApp(se_lib=se_lib)
+    def __init__(self, se_lib: SeleniumLibrary, headless: bool = True, pool: BrowserPool | BrowserBrokerClient = None):
+        self.app = SauceDemoApp(se_lib=se_lib, pool=pool)
         self.is_headless = headless
 
     @keyword
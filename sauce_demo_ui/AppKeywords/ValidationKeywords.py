@@ -1,10 +1,14 @@
 from SeleniumLibrary import SeleniumLibrary
 from robot.api.deco import keyword
 
-from autocore.asserts import assert_true
+from autocore.asserts import assert_that_list_is_sorted
 from sauce_demo_ui.page_objects import SauceDemoApp
 
 
+def _price(text: str) -> float:
+    return float(text.replace("$", ""))
+
+
 class ValidationKeywords:
 
     def __init__(self, se_lib: SeleniumLibrary):
@@ -29,21 +33,19 @@ class ValidationKeywords:
     @keyword
     def user_should_see_that_products_are_sorted_by_name_a_to_z(self):
         items: list = self.app.products.ITEM_NAMES.get_texts()
-        assert_true(items == sorted(items, reverse=False))  # Checks if items are sorted in ascending order
+        assert_that_list_is_sorted(items)
 
     @keyword
     def user_should_see_that_products_are_sorted_by_name_z_to_a(self):
         items: list = self.app.products.ITEM_NAMES.get_texts()
-        assert_true(items == sorted(items, reverse=True))  # Checks if items are sorted in descending order
+        assert_that_list_is_sorted(items, reverse=True)
 
     @keyword
     def user_should_see_that_products_are_sorted_by_price_low_to_high(self):
         items: list[str] = self.app.products.ITEM_PRICES.get_texts()
-        prices: list = [float(i.replace("$", "")) for i in items]
-        assert_true(prices == sorted(prices, reverse=False))  # Checks if items are sorted in ascending order
+        assert_that_list_is_sorted(items, key=_price)
 
     @keyword
     def user_should_see_that_products_are_sorted_by_price_high_to_low(self):
         items: list = self.app.products.ITEM_PRICES.get_texts()
-        prices: list = [float(i.replace("$", "")) for i in items]
-        assert_true(prices == sorted(prices, reverse=True))  # Checks if items are sorted in descending order
+        assert_that_list_is_sorted(items, key=_price, reverse=True)
@@ -1,7 +1,11 @@
+import os
+
 from SeleniumLibrary import SeleniumLibrary
 from robot.api.deco import library
 from robotlibcore import DynamicCore
 
+from autocore.web.browserbroker import BROKER_ADDRESS_ENV, BrowserBrokerClient
+from autocore.web.browserpool import BrowserPool
 from sauce_demo_ui.AppKeywords.ActionKeywords import ActionKeywords
 from sauce_demo_ui.AppKeywords.BrowserKeywords import BrowserKeywords
 from sauce_demo_ui.AppKeywords.ValidationKeywords import ValidationKeywords
@@ -10,11 +14,17 @@ from sauce_demo_ui.AppKeywords.ValidationKeywords import ValidationKeywords
 @library(scope='GLOBAL')
 class AppKeywords(DynamicCore):
 
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, browser_pool_size: int = 0, browser_max_reuse: int = 25):
         se_lib = SeleniumLibrary()
+        pool = None
+        if os.environ.get(BROKER_ADDRESS_ENV):
+            # pabot workers share the browsers of the broker process
+            pool = BrowserBrokerClient()
+        elif browser_pool_size > 0:
+            pool = BrowserPool(size=browser_pool_size, max_reuse=browser_max_reuse, headless=headless)
         keywords = [
             ActionKeywords(se_lib=se_lib),
-            BrowserKeywords(se_lib=se_lib, headless=headless),
+            BrowserKeywords(se_lib=se_lib, headless=headless, pool=pool),
             ValidationKeywords(se_lib=se_lib)
         ]
 
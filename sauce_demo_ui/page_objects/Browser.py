@@ -1,17 +1,21 @@
 from SeleniumLibrary import SeleniumLibrary
 
 from autocore.web.BroswerConfig import chrome_options
+from autocore.web.browserbroker import BrowserBrokerClient
+from autocore.web.browserpool import BrowserPool
 from autocore.web.webactions import WebActions
 
 
 class Browser:
 
-    def __init__(self, se_lib: SeleniumLibrary):
+    def __init__(self, se_lib: SeleniumLibrary, pool: BrowserPool | BrowserBrokerClient = None):
         self.__wa = WebActions(ctx=se_lib)
+        self.__pool = pool
 
     def open_sauce_demo_app(self, headless: bool):
         options = chrome_options(is_headless=headless)
-        self.__wa.open_browser(url='https://www.saucedemo.com/', browser='chrome', options=options, alias=None)
+        self.__wa.open_browser(url='https://www.saucedemo.com/', browser='chrome', options=options, alias=None,
+                               pool=self.__pool)
 
     def close_sauce_demo_app(self):
         self.__wa.close_all_browsers()
@@ -1,5 +1,7 @@
 from SeleniumLibrary import SeleniumLibrary
 
+from autocore.web.browserbroker import BrowserBrokerClient
+from autocore.web.browserpool import BrowserPool
 from sauce_demo_ui.page_objects.Browser import Browser
 from sauce_demo_ui.page_objects.Login import LoginPage
 from sauce_demo_ui.page_objects.Menu import Menu
@@ -8,9 +10,9 @@ from sauce_demo_ui.page_objects.Products import Products
 
 class SauceDemoApp:
 
-    def __init__(self, se_lib: SeleniumLibrary):
+    def __init__(self, se_lib: SeleniumLibrary, pool: BrowserPool | BrowserBrokerClient = None):
         self.__se_lib = se_lib
-        self.__browser = Browser(se_lib=se_lib)
+        self.__browser = Browser(se_lib=se_lib, pool=pool)
         self.__login = LoginPage(se_lib=se_lib)
         self.__products = Products(se_lib=se_lib)
         self.__menu = Menu(se_lib=se_lib)